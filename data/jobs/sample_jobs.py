@@ -196,7 +196,28 @@ SAMPLE_JOBS = [
     frontend_job
 ]
 
+
+def precompute_embeddings(model_name: str = 'paraphrase-multilingual-MiniLM-L12-v2') -> int:
+    """
+    Encode SAMPLE_JOBS once into the Sentence-BERT embedding cache.
+
+    Run before test_real_resume.py (python data/jobs/sample_jobs.py --precompute)
+    so matching a resume needs no model call for the job side.
+
+    Returns:
+        Number of jobs that had to be encoded
+    """
+    from matching import SemanticMatcher
+
+    return SemanticMatcher(model_name).warm_up(SAMPLE_JOBS)
+
+
 if __name__ == "__main__":
+    if "--precompute" in sys.argv:
+        encoded = precompute_embeddings()
+        print(f"Encoded {encoded} of {len(SAMPLE_JOBS)} sample jobs into the embedding cache")
+        sys.exit(0)
+
     print("Sample Jobs for Testing")
     print("=" * 60)
     for job in SAMPLE_JOBS:
@@ -3,6 +3,7 @@ FastAPI REST API for AI Recruiting Agent
 
 Endpoints:
 - POST /resumes/upload - Upload resume file
+- POST /resumes/upload_batch - Upload several resume files at once
 - GET /jobs - List all jobs
 - POST /jobs - Create new job
 - GET /jobs/{job_id} - Get job details
@@ -21,6 +22,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from fastapi import FastAPI, File, UploadFile, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 
 from api.models import (
     JobCreate,
@@ -29,6 +31,7 @@ from api.models import (
     RecommendationsResponse,
     CandidateMatch,
     UploadResponse,
+    BatchUploadResponse,
     HealthResponse,
     ErrorResponse,
 )
@@ -180,6 +183,65 @@ async def upload_resume(file: UploadFile = File(...), language: str = Query("en"
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/resumes/upload_batch", response_model=BatchUploadResponse, tags=["Resumes"])
+async def upload_resumes_batch(
+    files: List[UploadFile] = File(...), language: str = Query("en", regex="^(en|ru)$")
+):
+    """
+    Upload and parse several resume files in one request
+
+    Files are parsed concurrently; unsupported or unparsable files are listed in `failed`.
+    """
+    allowed_extensions = [".pdf", ".docx", ".txt"]
+    failed: List[str] = []
+    names: List[str] = []
+    tmp_paths: List[str] = []
+
+    try:
+        for file in files:
+            file_ext = Path(file.filename).suffix.lower()
+            if file_ext not in allowed_extensions:
+                failed.append(file.filename)
+                continue
+            with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
+                tmp_file.write(await file.read())
+                tmp_paths.append(tmp_file.name)
+            names.append(file.filename)
+
+        # Parse off the event loop
+        resumes = await run_in_threadpool(text_extractor.parse_resumes_bulk, tmp_paths)
+
+        results = []
+        for name, resume in zip(names, resumes):
+            if not resume:
+                failed.append(name)
+                continue
+            resume_id = resume_storage.add_resume(resume)
+            results.append({
+                "success": True,
+                "resume_id": resume_id,
+                "candidate_name": resume.contact_info.name,
+                "message": translate("upload_success", language),
+                "extracted_skills": resume.skills[:20],
+                "extracted_keywords": resume.keywords[:20],
+            })
+
+        return {
+            "total": len(files),
+            "uploaded": len(results),
+            "results": results,
+            "failed": failed,
+        }
+
+    except Exception as e:
+        logger.error(f"Error uploading resumes: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    finally:
+        for tmp_path in tmp_paths:
+            Path(tmp_path).unlink(missing_ok=True)
+
+
 @app.get("/resumes", tags=["Resumes"])
 async def list_resumes():
     """List all uploaded resumes"""
@@ -80,6 +80,14 @@ class UploadResponse(BaseModel):
     extracted_keywords: List[str]
 
 
+class BatchUploadResponse(BaseModel):
+    """Batch file upload response"""
+    total: int
+    uploaded: int
+    results: List[UploadResponse]
+    failed: List[str] = Field(default_factory=list, description="Names of files that could not be parsed")
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str
@@ -3,10 +3,14 @@ Handler for processing email attachments (resumes)
 """
 import logging
 import json
+import os
+import sqlite3
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import hashlib
+import tempfile
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,47 +24,129 @@ class AttachmentHandler:
     # Supported resume file extensions
     SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt', '.rtf'}
 
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS processed (
+            email_id TEXT PRIMARY KEY,
+            from_addr TEXT,
+            subject TEXT,
+            date TEXT,
+            processed_date TEXT
+        );
+        CREATE TABLE IF NOT EXISTS attachments (
+            email_id TEXT NOT NULL REFERENCES processed(email_id),
+            file_hash TEXT,
+            saved_path TEXT,
+            info TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS attachments_email ON attachments(email_id);
+        CREATE INDEX IF NOT EXISTS attachments_hash ON attachments(file_hash);
+    """
+
     def __init__(self, storage_path: Path, processed_db_path: Path):
         """
         Initialize attachment handler
 
         Args:
             storage_path: Directory to save attachments
-            processed_db_path: Path to JSON file tracking processed emails
+            processed_db_path: Path to the SQLite DB tracking processed emails.
+                A ``.json`` path (the old flat-file format) is mapped to a
+                ``.sqlite3`` file next to it, and its contents are imported
+                once when that DB is created.
         """
         self.storage_path = Path(storage_path)
         self.processed_db_path = Path(processed_db_path)
+        legacy_json = None
+        if self.processed_db_path.suffix == '.json':
+            legacy_json = self.processed_db_path
+            self.processed_db_path = self.processed_db_path.with_suffix('.sqlite3')
 
         # Create storage directory
         self.storage_path.mkdir(parents=True, exist_ok=True)
 
-        # Load processed emails database
-        self.processed_emails = self._load_processed_db()
+        # Open processed emails database; the IMAP prefetch thread checks
+        # is_email_processed while the main thread records new emails
+        self._lock = threading.Lock()
+        self._db = self._open_processed_db()
+        if legacy_json is not None:
+            self._import_legacy_json(legacy_json)
 
-    def _load_processed_db(self) -> Dict[str, Any]:
+    def _open_processed_db(self) -> sqlite3.Connection:
         """
-        Load database of processed emails
+        Open (and create if needed) the processed emails database
 
         Returns:
-            Dictionary of processed email data
+            SQLite connection in autocommit mode with WAL journaling
         """
-        if self.processed_db_path.exists():
-            try:
-                with open(self.processed_db_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading processed emails DB: {e}")
-                return {}
-        return {}
-
-    def _save_processed_db(self):
-        """Save processed emails database to file"""
+        self.processed_db_path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.processed_db_path, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(self._SCHEMA)
+        return db
+
+    def _import_legacy_json(self, json_path: Path):
+        """
+        Import a processed_emails.json written by older versions (once, into an empty DB)
+
+        Args:
+            json_path: Path to the legacy JSON database
+        """
+        if not json_path.exists():
+            return
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM processed LIMIT 1").fetchone():
+                return
         try:
-            self.processed_db_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.processed_db_path, 'w', encoding='utf-8') as f:
-                json.dump(self.processed_emails, f, indent=2, ensure_ascii=False)
+            with open(json_path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
         except Exception as e:
-            logger.error(f"Error saving processed emails DB: {e}")
+            logger.error(f"Error loading legacy processed emails DB {json_path}: {e}")
+            return
+
+        for email_id, email_info in legacy.items():
+            self._insert_processed(
+                email_id,
+                email_info.get('from'),
+                email_info.get('subject'),
+                email_info.get('date'),
+                email_info.get('processed_date'),
+                email_info.get('attachments', [])
+            )
+        logger.info(f"Imported {len(legacy)} processed emails from {json_path} into {self.processed_db_path}")
+
+    def _insert_processed(
+        self,
+        email_id: Any,
+        from_addr: Optional[str],
+        subject: Optional[str],
+        date: Optional[str],
+        processed_date: Optional[str],
+        attachments: List[Dict[str, Any]]
+    ):
+        """Record one processed email and its attachments in a single transaction"""
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO processed VALUES (?, ?, ?, ?, ?)",
+                    (str(email_id), from_addr, subject, date, processed_date)
+                )
+                self._db.execute("DELETE FROM attachments WHERE email_id = ?", (str(email_id),))
+                self._db.executemany(
+                    "INSERT INTO attachments VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            str(email_id),
+                            attachment.get('file_hash'),
+                            attachment.get('saved_path'),
+                            json.dumps(attachment, ensure_ascii=False)
+                        )
+                        for attachment in attachments
+                    ]
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
 
     def is_email_processed(self, email_id: int) -> bool:
         """
@@ -72,7 +158,16 @@ class AttachmentHandler:
         Returns:
             True if email was already processed
         """
-        return str(email_id) in self.processed_emails
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM processed WHERE email_id = ? LIMIT 1", (str(email_id),)
+            ).fetchone()
+        return row is not None
+
+    def close(self):
+        """Close the processed emails database"""
+        with self._lock:
+            self._db.close()
 
     def process_attachments(
         self,
@@ -120,14 +215,16 @@ class AttachmentHandler:
             }
 
             if save_attachments:
+                file_hash = self._get_file_hash(attachment['data'])
                 saved_path = self._save_attachment(
                     attachment['data'],
                     filename,
-                    email_id
+                    email_id,
+                    file_hash
                 )
                 if saved_path:
                     attachment_info['saved_path'] = str(saved_path)
-                    attachment_info['file_hash'] = self._get_file_hash(attachment['data'])
+                    attachment_info['file_hash'] = file_hash
 
             processed_attachments.append(attachment_info)
             logger.info(f"Processed attachment: {filename} from email {email_id}")
@@ -142,19 +239,33 @@ class AttachmentHandler:
         self,
         data: bytes,
         filename: str,
-        email_id: int
+        email_id: int,
+        file_hash: Optional[str] = None
     ) -> Optional[Path]:
         """
         Save attachment to storage
 
+        The file is written to a temporary file in the storage directory and
+        renamed into place, so a partially written resume is never visible.
+        A file whose SHA-256 matches an already stored resume is not written
+        again; the existing path is returned instead.
+
         Args:
             data: File binary data
             filename: Original filename
             email_id: Email message ID
+            file_hash: SHA-256 of data, if already computed
 
         Returns:
             Path to saved file or None if error
         """
+        file_hash = file_hash or self._get_file_hash(data)
+        existing = self._find_stored(file_hash)
+        if existing and Path(existing).exists():
+            logger.info(f"Identical attachment already stored: {existing}")
+            return Path(existing)
+
+        tmp_name = None
         try:
             # Create unique filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -162,10 +273,13 @@ class AttachmentHandler:
             safe_filename = self._sanitize_filename(Path(filename).stem)
             new_filename = f"{timestamp}_{email_id}_{safe_filename}{file_ext}"
 
-            # Save file
+            # Save file (same filesystem, so os.replace is an atomic rename)
             file_path = self.storage_path / new_filename
-            with open(file_path, 'wb') as f:
-                f.write(data)
+            with tempfile.NamedTemporaryFile(dir=self.storage_path, suffix='.part', delete=False) as tmp:
+                tmp_name = tmp.name
+                tmp.write(data)
+            os.replace(tmp_name, file_path)
+            tmp_name = None
 
             logger.info(f"Saved attachment to: {file_path}")
             return file_path
@@ -173,6 +287,29 @@ class AttachmentHandler:
         except Exception as e:
             logger.error(f"Error saving attachment {filename}: {e}")
             return None
+        finally:
+            if tmp_name:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def _find_stored(self, file_hash: str) -> Optional[str]:
+        """
+        Path of an already stored resume with this SHA-256
+
+        Args:
+            file_hash: Hex digest of file contents
+
+        Returns:
+            Saved path or None
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT saved_path FROM attachments WHERE file_hash = ? AND saved_path IS NOT NULL LIMIT 1",
+                (file_hash,)
+            ).fetchone()
+        return row[0] if row else None
 
     def _sanitize_filename(self, filename: str) -> str:
         """
@@ -222,14 +359,14 @@ class AttachmentHandler:
             email_data: Email data dictionary
             attachments: List of processed attachment info
         """
-        self.processed_emails[str(email_id)] = {
-            'from': email_data['from'],
-            'subject': email_data['subject'],
-            'date': email_data['date'],
-            'processed_date': datetime.now().isoformat(),
-            'attachments': attachments
-        }
-        self._save_processed_db()
+        self._insert_processed(
+            email_id,
+            email_data['from'],
+            email_data['subject'],
+            email_data['date'],
+            datetime.now().isoformat(),
+            attachments
+        )
         logger.info(f"Marked email {email_id} as processed")
 
     def get_processed_stats(self) -> Dict[str, Any]:
@@ -239,11 +376,9 @@ class AttachmentHandler:
         Returns:
             Dictionary with processing statistics
         """
-        total_emails = len(self.processed_emails)
-        total_attachments = sum(
-            len(email['attachments'])
-            for email in self.processed_emails.values()
-        )
+        with self._lock:
+            total_emails = self._db.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
+            total_attachments = self._db.execute("SELECT COUNT(*) FROM attachments").fetchone()[0]
 
         return {
             'total_emails_processed': total_emails,
@@ -259,15 +394,24 @@ class AttachmentHandler:
         Returns:
             List of resume information dictionaries
         """
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT a.email_id, a.saved_path, a.info, p.from_addr, p.date
+                FROM attachments a JOIN processed p ON p.email_id = a.email_id
+                ORDER BY p.rowid, a.rowid
+                """
+            ).fetchall()
+
         resumes = []
-        for email_id, email_info in self.processed_emails.items():
-            for attachment in email_info['attachments']:
-                resumes.append({
-                    'email_id': email_id,
-                    'filename': attachment['original_filename'],
-                    'saved_path': attachment.get('saved_path'),
-                    'from': email_info['from'],
-                    'date': email_info['date'],
-                    'processed_date': attachment['processed_date']
-                })
+        for email_id, saved_path, info, from_addr, date in rows:
+            attachment = json.loads(info)
+            resumes.append({
+                'email_id': email_id,
+                'filename': attachment['original_filename'],
+                'saved_path': saved_path,
+                'from': from_addr,
+                'date': date,
+                'processed_date': attachment['processed_date']
+            })
         return resumes
@@ -2,7 +2,7 @@
 Email client for fetching resumes from IMAP server
 """
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Callable
 from datetime import datetime
 import email
 from email.message import Message
@@ -93,22 +93,20 @@ class EmailClient:
             logger.error(f"Failed to select folder {folder}: {e}")
             return False
 
-    def fetch_unread_emails(
+    def fetch_unread_ids(
         self,
         folder: str = "INBOX",
-        subject_filter: Optional[str] = None,
-        limit: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+        subject_filter: Optional[str] = None
+    ) -> List[int]:
         """
-        Fetch unread emails from specified folder
+        Get UIDs of unread emails without downloading any message data
 
         Args:
             folder: Email folder to search
             subject_filter: Optional subject filter
-            limit: Maximum number of emails to fetch
 
         Returns:
-            List of email data dictionaries
+            List of message UIDs in search order
         """
         if not self.client:
             logger.error("Not connected to server")
@@ -122,30 +120,96 @@ class EmailClient:
             if subject_filter:
                 search_criteria.append(f'SUBJECT "{subject_filter}"')
 
-            message_ids = self.client.search(search_criteria)
+            return list(self.client.search(search_criteria))
+        except Exception as e:
+            logger.error(f"Error searching emails: {e}")
+            return []
+
+    def fetch_unread_emails(
+        self,
+        folder: str = "INBOX",
+        subject_filter: Optional[str] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 100,
+        skip: Optional[Callable[[int], bool]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch unread emails from specified folder
+
+        Args:
+            folder: Email folder to search
+            subject_filter: Optional subject filter
+            limit: Maximum number of emails to fetch
+            batch_size: UIDs per FETCH command (see iter_unread_emails)
+            skip: Predicate on message ID; matching emails are not downloaded
+
+        Returns:
+            List of email data dictionaries
+        """
+        return list(self.iter_unread_emails(folder, subject_filter, limit, batch_size, skip))
+
+    def iter_unread_emails(
+        self,
+        folder: str = "INBOX",
+        subject_filter: Optional[str] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 100,
+        skip: Optional[Callable[[int], bool]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield unread emails, fetching them with one UID FETCH per batch of UIDs
+
+        Batching keeps the round-trips at len(uids) / batch_size while staying
+        under the servers' maximum request size for a single sequence set.
+        Messages are parsed and yielded as each batch arrives.
+
+        UIDs accepted by ``skip`` (e.g. AttachmentHandler.is_email_processed)
+        are dropped right after the search, so their bodies and attachments
+        are never downloaded; ``limit`` counts the remaining emails.
+
+        Args:
+            folder: Email folder to search
+            subject_filter: Optional subject filter
+            limit: Maximum number of emails to fetch
+            batch_size: UIDs per FETCH command
+            skip: Predicate on message ID; matching emails are not downloaded
+
+        Yields:
+            Email data dictionaries
+        """
+        if not self.client:
+            logger.error("Not connected to server")
+            return
 
-            if limit:
-                message_ids = message_ids[:limit]
+        message_ids = self.fetch_unread_ids(folder, subject_filter)
 
-            logger.info(f"Found {len(message_ids)} unread emails")
+        if skip:
+            found = len(message_ids)
+            message_ids = [msg_id for msg_id in message_ids if not skip(msg_id)]
+            if found != len(message_ids):
+                logger.info(f"Skipping {found - len(message_ids)} already processed emails")
 
-            if not message_ids:
-                return []
+        if limit:
+            message_ids = message_ids[:limit]
 
-            # Fetch email data
-            emails = []
-            response = self.client.fetch(message_ids, ['RFC822', 'FLAGS'])
+        logger.info(f"Found {len(message_ids)} unread emails")
 
-            for msg_id, data in response.items():
+        for start in range(0, len(message_ids), batch_size):
+            batch = message_ids[start:start + batch_size]
+            try:
+                response = self.client.fetch(batch, ['RFC822', 'FLAGS'])
+            except Exception as e:
+                logger.error(f"Error fetching emails {batch[0]}..{batch[-1]}: {e}")
+                continue
+
+            # Keep the search order regardless of how the server orders responses
+            for msg_id in batch:
+                data = response.get(msg_id)
+                if data is None:
+                    continue
                 email_data = self._parse_email(msg_id, data)
                 if email_data:
-                    emails.append(email_data)
-
-            return emails
-
-        except Exception as e:
-            logger.error(f"Error fetching emails: {e}")
-            return []
+                    yield email_data
 
     def _parse_email(self, msg_id: int, data: Dict[bytes, Any]) -> Optional[Dict[str, Any]]:
         """
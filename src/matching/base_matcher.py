@@ -2,7 +2,8 @@
 Base Matcher - базовый класс для всех matching подходов
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AbstractSet, Dict, List, Union
 from .job_model import Job, MatchResult
 import sys
 from pathlib import Path
@@ -69,10 +70,30 @@ class BaseMatcher(ABC):
 
         return results[:top_n]
 
+    def match_jobs(self, resume: Resume, jobs: List[Job], max_workers: int = 1) -> List[MatchResult]:
+        """
+        Сопоставление одного резюме со списком вакансий
+
+        Args:
+            resume: Резюме
+            jobs: Вакансии
+            max_workers: Число потоков; при > 1 вакансии сопоставляются параллельно
+                (выгодно для матчеров, ждущих сеть или отпускающих GIL)
+
+        Returns:
+            MatchResult для каждой вакансии, в порядке jobs
+        """
+        if max_workers <= 1 or len(jobs) <= 1:
+            return [self.match(resume, job) for job in jobs]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            return list(executor.map(lambda job: self.match(resume, job), jobs))
+
     def calculate_skills_match(
         self,
-        resume_skills: List[str],
-        required_skills: List[str]
+        resume_skills: Union[List[str], AbstractSet[str]],
+        required_skills: List[str],
+        normalized: bool = False
     ) -> tuple[float, List[str], List[str]]:
         """
         Вычисление соответствия навыков
@@ -80,6 +101,8 @@ class BaseMatcher(ABC):
         Args:
             resume_skills: Навыки из резюме
             required_skills: Требуемые навыки
+            normalized: resume_skills уже приведены к нижнему регистру
+                (Resume.skills_lower()), повторно не преобразуются
 
         Returns:
             (score, matched_skills, missing_skills)
@@ -88,19 +111,22 @@ class BaseMatcher(ABC):
             return 1.0, [], []
 
         # Приводим к нижнему регистру для сравнения
-        resume_skills_lower = {s.lower() for s in resume_skills}
-        required_skills_lower = {s.lower() for s in required_skills}
+        if normalized:
+            resume_skills_lower = resume_skills
+        else:
+            resume_skills_lower = {s.lower() for s in resume_skills}
+        required_pairs = [(s, s.lower()) for s in required_skills]
+        required_skills_lower = {low for _, low in required_pairs}
 
         # Находим пересечение
-        matched = resume_skills_lower.intersection(required_skills_lower)
-        missing = required_skills_lower - resume_skills_lower
+        matched = required_skills_lower.intersection(resume_skills_lower)
 
         # Вычисляем score
         score = len(matched) / len(required_skills_lower) if required_skills_lower else 0.0
 
         # Возвращаем оригинальные названия навыков
-        matched_skills = [s for s in required_skills if s.lower() in matched]
-        missing_skills = [s for s in required_skills if s.lower() in missing]
+        matched_skills = [s for s, low in required_pairs if low in matched]
+        missing_skills = [s for s, low in required_pairs if low not in matched]
 
         return score, matched_skills, missing_skills
 
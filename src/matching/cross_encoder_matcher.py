@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from .base_matcher import BaseMatcher
 from .job_model import Job, MatchResult
@@ -29,6 +29,19 @@ except ImportError:
     ST_AVAILABLE = False
     logger.warning("sentence-transformers not installed. Cross-encoder matcher will fallback.")
 
+# Loaded cross-encoders shared by all matcher instances: model name -> model
+_MODELS: Dict[str, Any] = {}
+
+
+def _load_model(model_name: str):
+    """Load a CrossEncoder once per process and reuse it afterwards."""
+    model = _MODELS.get(model_name)
+    if model is None:
+        logger.info(f"Loading cross-encoder model: {model_name}")
+        model = CrossEncoder(model_name)
+        _MODELS[model_name] = model
+    return model
+
 
 class CrossEncoderMatcher(BaseMatcher):
     """
@@ -46,8 +59,7 @@ class CrossEncoderMatcher(BaseMatcher):
 
         if ST_AVAILABLE:
             try:
-                logger.info(f"Loading cross-encoder model: {model_name}")
-                self.model = CrossEncoder(model_name)
+                self.model = _load_model(model_name)
             except Exception as exc:
                 logger.error(f"Failed to load cross-encoder model: {exc}")
                 self.model = None
@@ -55,7 +67,7 @@ class CrossEncoderMatcher(BaseMatcher):
     def match(self, resume: Resume, job: Job) -> MatchResult:
         """Compute match score via cross-encoder (or fallback)."""
         skills_score, matched_skills, missing_skills = self.calculate_skills_match(
-            resume.skills, job.required_skills
+            resume.skills_lower(), job.required_skills, normalized=True
         )
 
         ce_score = self._cross_encoder_score(resume, job)
@@ -2,57 +2,145 @@
 Lightweight embedding store with optional on-disk persistence.
 
 Used to cache resume/job embeddings to avoid repeated encoding.
+Vectors are stored int8-quantized with a per-vector max-abs scale (~4x
+smaller than float32) and reconstructed on read; freshly computed embeddings
+are returned as the encoder produced them.
 """
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
 import pickle
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+QuantizedEmbedding = Tuple[np.ndarray, np.float32]
+
+# On-disk layout version; version 1 (bare dict) stored an L2 norm instead of a max-abs scale
+STORE_FORMAT_VERSION = 2
+
+
+@lru_cache(maxsize=4096)
+def content_hash(text: str) -> str:
+    """
+    Stable hash of text for cache keys.
+
+    Unlike builtin hash(), the value does not change between processes,
+    so keys survive a reload of the on-disk cache.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def quantize_embedding(embedding: np.ndarray) -> QuantizedEmbedding:
+    """
+    Store as int8 plus a per-vector scale (max |component| / 127).
+
+    Scaling by the largest component uses the full int8 range; scaling by
+    the L2 norm would leave most levels unused on high-dimensional vectors.
+    """
+    vec = np.asarray(embedding, dtype=np.float32)
+    scale = np.float32(np.max(np.abs(vec)) / np.float32(127)) if vec.size else np.float32(0)
+    if scale == 0:
+        return np.zeros(vec.shape, dtype=np.int8), scale
+    q = np.round(vec / scale).astype(np.int8)
+    return q, scale
+
+
+def dequantize_embedding(entry: QuantizedEmbedding) -> np.ndarray:
+    """Reconstruct a float32 vector from its int8 form."""
+    q, scale = entry
+    return q.astype(np.float32) * np.float32(scale)
+
+
+def _upgrade_v1_entry(value) -> QuantizedEmbedding:
+    """Re-quantize an entry of a version 1 cache (raw float vector or int8 + L2 norm)."""
+    if isinstance(value, np.ndarray):
+        return quantize_embedding(value)
+    q, norm = value
+    return quantize_embedding(q.astype(np.float32) * np.float32(norm / np.float32(127)))
+
+
 class EmbeddingStore:
     """
     Minimal embedding cache.
 
-    - In-memory dict for fast lookup
-    - Optional disk persistence (pickle)
+    - In-memory dict for fast lookup (int8 vectors + float32 scales)
+    - Optional disk persistence (pickle); save() is a no-op when nothing changed
     - Thread-safety not handled here (assume single worker or wrap externally)
     """
 
     def __init__(self, cache_path: Optional[Path | str] = None):
-        self.cache: Dict[str, np.ndarray] = {}
+        self.cache: Dict[str, QuantizedEmbedding] = {}
         self.cache_path = Path(cache_path) if cache_path else None
+        self._dirty = False
         if self.cache_path:
             self._load()
 
     def get(self, key: str) -> Optional[np.ndarray]:
-        return self.cache.get(key)
+        entry = self.cache.get(key)
+        return dequantize_embedding(entry) if entry is not None else None
 
     def set(self, key: str, embedding: np.ndarray):
-        self.cache[key] = embedding
+        self.cache[key] = quantize_embedding(embedding)
+        self._dirty = True
 
     def get_or_compute(self, key: str, text: str, encoder) -> np.ndarray:
         """
         Get embedding from cache or compute with encoder.encode([text]).
         """
         if key in self.cache:
-            return self.cache[key]
-        emb = encoder.encode([text])[0]
-        self.cache[key] = emb
+            return dequantize_embedding(self.cache[key])
+        emb = np.asarray(encoder.encode([text], convert_to_numpy=True)[0], dtype=np.float32)
+        self.set(key, emb)
         return emb
 
+    def get_or_compute_many(
+        self, items: Sequence[Tuple[str, str]], encoder, batch_size: int = 64
+    ) -> List[np.ndarray]:
+        """
+        Batch variant of get_or_compute for (key, text) pairs.
+
+        All cache misses go through a single encoder.encode call, so e.g. a
+        resume/job pair costs one forward pass instead of two. Cache misses
+        are returned unquantized.
+        """
+        missing = {}
+        for key, text in items:
+            if key not in self.cache and key not in missing:
+                missing[key] = text
+        fresh: Dict[str, np.ndarray] = {}
+        if missing:
+            embeddings = encoder.encode(
+                list(missing.values()), batch_size=batch_size, convert_to_numpy=True
+            )
+            for key, emb in zip(missing, embeddings):
+                fresh[key] = np.asarray(emb, dtype=np.float32)
+                self.set(key, emb)
+        return [
+            fresh[key] if key in fresh else dequantize_embedding(self.cache[key])
+            for key, _ in items
+        ]
+
     def save(self):
-        if not self.cache_path:
+        if not self.cache_path or not self._dirty:
             return
         try:
             self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_path, "wb") as f:
-                pickle.dump(self.cache, f)
+            # Write to a temp file first so an interrupted save keeps the old cache
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=self.cache_path.parent, suffix=".tmp", delete=False
+            ) as f:
+                pickle.dump({"format": STORE_FORMAT_VERSION, "vectors": self.cache}, f)
+            os.replace(f.name, self.cache_path)
+            self._dirty = False
             logger.info(f"Saved embeddings cache to {self.cache_path}")
         except Exception as exc:
             logger.error(f"Failed to save embeddings cache: {exc}")
@@ -62,7 +150,13 @@ class EmbeddingStore:
             return
         try:
             with open(self.cache_path, "rb") as f:
-                self.cache = pickle.load(f)
+                cache = pickle.load(f)
+            if cache.get("format") == STORE_FORMAT_VERSION:
+                self.cache = cache["vectors"]
+            else:
+                # Version 1: a bare dict of float vectors or int8 + L2 norm entries
+                self.cache = {key: _upgrade_v1_entry(value) for key, value in cache.items()}
+                self._dirty = True
             logger.info(f"Loaded embeddings cache from {self.cache_path}")
         except Exception as exc:
             logger.error(f"Failed to load embeddings cache: {exc}")
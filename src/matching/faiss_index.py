@@ -1,6 +1,8 @@
 """
 FAISS index helper for storing and querying resume embeddings.
-Uses Inner Product (cosine-ready if embeddings are normalized).
+Uses Inner Product (cosine-ready if embeddings are normalized). Small indexes
+stay exact (flat); once they reach SQ8_MIN_VECTORS the vectors are moved to an
+8-bit scalar-quantized index (SQ8), trained on all of them, to cut memory 4x.
 """
 from __future__ import annotations
 
@@ -22,10 +24,14 @@ logger = logging.getLogger(__name__)
 
 class FaissIndex:
     """
-    Lightweight FAISS index wrapper (Flat IP).
+    Lightweight FAISS index wrapper (flat, then SQ8; inner product).
     Stores mapping from FAISS ids to resume ids for retrieval.
     """
 
+    # SQ8 learns per-dimension ranges from its training set; below this size
+    # the ranges would come from too few vectors, and a flat index is small anyway
+    SQ8_MIN_VECTORS = 4096
+
     def __init__(self, dim: int, index_path: Path | str = Path("./data/cache/faiss.index")):
         if not FAISS_AVAILABLE:
             raise RuntimeError("faiss is not available. Install faiss-cpu to use FaissIndex.")
@@ -37,7 +43,22 @@ class FaissIndex:
         if self.index_path.exists():
             self._load()
         else:
-            self.index = faiss.IndexFlatIP(dim)
+            self.index = self._new_index()
+
+    def _new_index(self):
+        return faiss.IndexFlatIP(self.dim)
+
+    def _quantize(self, embeddings: np.ndarray):
+        """Replace the flat index with SQ8 trained on all stored plus new vectors"""
+        stored = self.index.reconstruct_n(0, self.index.ntotal) if self.index.ntotal else None
+        vectors = embeddings if stored is None else np.vstack([stored, embeddings])
+        index = faiss.IndexScalarQuantizer(
+            self.dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(vectors)
+        index.add(vectors)
+        self.index = index
+        logger.info(f"Converted FAISS index to SQ8 with {index.ntotal} vectors")
 
     def add_embeddings(self, embeddings: np.ndarray, resume_ids: List[str]):
         """
@@ -51,7 +72,13 @@ class FaissIndex:
 
         # Normalize for cosine-ready IP
         faiss.normalize_L2(embeddings)
-        self.index.add(embeddings)
+        if (
+            isinstance(self.index, faiss.IndexFlat)
+            and self.index.ntotal + embeddings.shape[0] >= self.SQ8_MIN_VECTORS
+        ):
+            self._quantize(embeddings)
+        else:
+            self.index.add(embeddings)
         for faiss_id, resume_id in zip(ids, resume_ids):
             self.id_map[int(faiss_id)] = resume_id
 
@@ -94,6 +121,6 @@ class FaissIndex:
             logger.info(f"Loaded FAISS index from {self.index_path} with {len(self.id_map)} entries")
         except Exception as exc:
             logger.error(f"Failed to load FAISS index: {exc}")
-            self.index = faiss.IndexFlatIP(self.dim)
+            self.index = self._new_index()
             self.id_map = {}
 
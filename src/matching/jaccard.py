@@ -0,0 +1,89 @@
+"""
+Jaccard similarity over skill/keyword sets, used by the matchers' fallback paths.
+
+With Numba installed, words are mapped to ids from a process-wide vocabulary
+and compared with a JIT-compiled two-pointer merge over sorted uint32 arrays.
+The vocabulary is guarded by a lock and reset once it exceeds MAX_VOCAB_SIZE.
+Without it, plain Python set operations are used.
+"""
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Below this many words the set-based path is faster than the array lookup + JIT call
+MIN_WORDS_FOR_JIT = 64
+
+# Ids are only comparable within one vocabulary, so on overflow the vocabulary
+# and the cached id arrays are dropped together
+MAX_VOCAB_SIZE = 100_000
+
+_SKILL_VOCAB: Dict[str, int] = {}
+_VOCAB_LOCK = threading.Lock()
+
+
+def _vocab_id(word: str) -> int:
+    # Caller holds _VOCAB_LOCK
+    return _SKILL_VOCAB.setdefault(word, len(_SKILL_VOCAB))
+
+
+@lru_cache(maxsize=8192)
+def _skill_ids(words: Tuple[str, ...]) -> np.ndarray:
+    """Sorted, de-duplicated uint32 vocabulary ids for a tuple of words (caller holds _VOCAB_LOCK)."""
+    ids = np.fromiter((_vocab_id(w) for w in set(words)), dtype=np.uint32)
+    ids.sort()
+    ids.flags.writeable = False
+    return ids
+
+
+def _skill_id_pair(left: Tuple[str, ...], right: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Id arrays for two word tuples, taken from the same vocabulary."""
+    with _VOCAB_LOCK:
+        if len(_SKILL_VOCAB) > MAX_VOCAB_SIZE:
+            _SKILL_VOCAB.clear()
+            _skill_ids.cache_clear()
+        return _skill_ids(left), _skill_ids(right)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _jaccard_sorted(a, b):
+        i = 0
+        j = 0
+        inter = 0
+        while i < a.shape[0] and j < b.shape[0]:
+            if a[i] == b[j]:
+                inter += 1
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        union = a.shape[0] + b.shape[0] - inter
+        return inter / union if union > 0 else 0.0
+
+
+def jaccard_similarity(left: Iterable[str], right: Iterable[str]) -> float:
+    """Jaccard index of two word collections; 0.0 if either is empty."""
+    left = tuple(left)
+    right = tuple(right)
+    if not left or not right:
+        return 0.0
+
+    if NUMBA_AVAILABLE and len(left) + len(right) >= MIN_WORDS_FOR_JIT:
+        return float(_jaccard_sorted(*_skill_id_pair(left, right)))
+
+    left_set, right_set = set(left), set(right)
+    union = len(left_set | right_set)
+    return len(left_set & right_set) / union if union > 0 else 0.0
@@ -6,6 +6,7 @@ LLM Matcher hardened for reliability:
 """
 import logging
 import json
+import re
 import time
 from typing import Optional, Tuple
 from pathlib import Path
@@ -36,6 +37,20 @@ try:
 except Exception:
     LANGCHAIN_AVAILABLE = False
 
+# Token counting for prompt budgets (installed with langchain-openai)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Rough token size used when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+# Markdown code fence around a JSON answer, and a bare score for unparseable answers
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*\n?(.*?)\n?```', re.DOTALL)
+_SCORE_RE = re.compile(r'"score":\s*([\d.]+)')
+
 
 class LLMMatcher(BaseMatcher):
     """
@@ -49,6 +64,8 @@ class LLMMatcher(BaseMatcher):
         timeout: int = 15,
         max_retries: int = 2,
         use_langchain: bool = True,
+        max_resume_tokens: int = 600,
+        max_job_tokens: int = 800,
     ):
         super().__init__()
         self.name = "LLM Matcher (GPT)"
@@ -57,6 +74,10 @@ class LLMMatcher(BaseMatcher):
         self.max_retries = max_retries
         self.cache = {}
         self.use_langchain = use_langchain and LANGCHAIN_AVAILABLE
+        # Prompt budgets: every input token adds latency and cost
+        self.max_resume_tokens = max_resume_tokens
+        self.max_job_tokens = max_job_tokens
+        self._encoding = None
 
         if OPENAI_AVAILABLE:
             try:
@@ -96,8 +117,9 @@ class LLMMatcher(BaseMatcher):
     def match(self, resume: Resume, job: Job) -> MatchResult:
         """Compute match using LLM, with fallback to skills."""
         skills_score, matched_skills, missing_skills = self.calculate_skills_match(
-            resume.skills,
+            resume.skills_lower(),
             job.required_skills,
+            normalized=True,
         )
 
         if not OPENAI_AVAILABLE or not self.client:
@@ -130,14 +152,13 @@ class LLMMatcher(BaseMatcher):
         if cache_key in self.cache:
             return self.cache[cache_key]
 
-        resume_text = self._prepare_resume_text(resume)
-        job_text = job.full_text
-        prompt = self._create_prompt(resume, job)
         last_exc = None
 
         # LangChain path
         if self.use_langchain and self.lc_model and self.lc_prompt:
             try:
+                resume_text = self._truncate_tokens(self._prepare_resume_text(resume), self.max_resume_tokens)
+                job_text = self._truncate_tokens(job.full_text, self.max_job_tokens)
                 chain = self.lc_prompt | self.lc_model
                 resp = chain.invoke({"job_text": job_text, "resume_text": resume_text})
                 parsed = self._parse_llm_response(resp.content)
@@ -147,6 +168,7 @@ class LLMMatcher(BaseMatcher):
                 logger.warning(f"LangChain LLM failed, falling back to raw client: {exc}")
 
         # Raw client path
+        prompt = self._create_prompt(resume, job)
         for attempt in range(self.max_retries + 1):
             try:
                 response = self.client.chat.completions.create(
@@ -180,6 +202,24 @@ class LLMMatcher(BaseMatcher):
         logger.error(f"LLM matching failed after retries: {last_exc}")
         return {"score": 0.0, "explanation": "LLM failed; no score."}
 
+    def _truncate_tokens(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens tokens of the model's tokenizer."""
+        if not TIKTOKEN_AVAILABLE:
+            return text[:max_tokens * CHARS_PER_TOKEN]
+        # Byte-level BPE: every token covers at least one UTF-8 byte, while one
+        # character (CJK, emoji, some Cyrillic) can take several tokens
+        if len(text.encode("utf-8")) <= max_tokens:
+            return text
+        if self._encoding is None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(self.model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+        tokens = self._encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return self._encoding.decode(tokens[:max_tokens])
+
     def _prepare_resume_text(self, resume: Resume) -> str:
         """Prepare resume text for LLM matching."""
         parts = []
@@ -231,13 +271,12 @@ Description: {job.description[:400]}
             return {"score": 0.0, "explanation": "Empty response from LLM"}
 
         # Remove markdown code blocks if present
-        import re
         content_cleaned = content.strip()
 
         # Remove ```json and ``` markers
         if content_cleaned.startswith('```'):
             # Extract content between ``` markers
-            match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', content_cleaned, re.DOTALL)
+            match = _JSON_FENCE_RE.search(content_cleaned)
             if match:
                 content_cleaned = match.group(1).strip()
 
@@ -252,7 +291,7 @@ Description: {job.description[:400]}
             logger.error(f"Error parsing LLM response: {e}")
             logger.error(f"Full content: {repr(content)}")
 
-            score_match = re.search(r'"score":\s*([\d.]+)', content)
+            score_match = _SCORE_RE.search(content)
             score = float(score_match.group(1)) if score_match else 0.0
             return {"score": max(0.0, min(1.0, score)), "explanation": content[:200]}
 
@@ -4,10 +4,15 @@ Matcher Comparison Utility
 Позволяет сравнить результаты всех трех подходов к matching
 """
 import logging
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, replace
+from itertools import combinations
 import statistics
 
+import numpy as np
+
+from .embedding_store import content_hash
 from .job_model import Job, MatchResult
 from .semantic_matcher import SemanticMatcher
 from .tfidf_matcher import TFIDFMatcher
@@ -38,9 +43,14 @@ class ComparisonResult:
     median_score: float = 0.0
     score_variance: float = 0.0
     agreement_level: str = "unknown"  # high, medium, low
+    early_exit: bool = False  # остальные матчеры пропущены по порогу уверенности
 
     def __post_init__(self):
         """Вычисляем статистику после инициализации"""
+        self.update_stats()
+
+    def update_stats(self):
+        """Пересчитать сводную статистику по заполненным результатам"""
         scores = []
 
         if self.semantic_result:
@@ -76,7 +86,11 @@ class MatcherComparison:
         use_semantic: bool = True,
         use_tfidf: bool = True,
         use_llm: bool = False,
-        openai_api_key: Optional[str] = None
+        openai_api_key: Optional[str] = None,
+        cache_threshold: Optional[float] = None,
+        cache_size: int = 1024,
+        early_exit_high: Optional[float] = None,
+        early_exit_low: Optional[float] = None
     ):
         """
         Args:
@@ -84,8 +98,22 @@ class MatcherComparison:
             use_tfidf: Использовать TF-IDF Matcher
             use_llm: Использовать LLM Matcher
             openai_api_key: API ключ для OpenAI (если use_llm=True)
+            cache_threshold: Косинусная близость резюме к уже сравненному с той же вакансией,
+                начиная с которой переиспользуется его результат (None - кэш выключен);
+                навыки при этом пересчитываются для текущего резюме
+            cache_size: Максимальное число пар в кэше
+            early_exit_high: Если semantic score >= порога, TF-IDF и LLM не запускаются
+            early_exit_low: Если semantic score <= порога, TF-IDF и LLM не запускаются;
+                также LLM пропускается, если все дешевые матчеры дали score ниже порога
         """
         self.matchers = {}
+        self.cache_threshold = cache_threshold
+        self.cache_size = cache_size
+        # вакансия -> (эмбеддинги резюме, результаты); порядок - для вытеснения старых
+        self._cache: "OrderedDict[str, Tuple[List[np.ndarray], List[ComparisonResult]]]" = OrderedDict()
+        self._cache_len = 0
+        self.early_exit_high = early_exit_high
+        self.early_exit_low = early_exit_low
 
         if use_semantic:
             try:
@@ -122,6 +150,13 @@ class MatcherComparison:
         Returns:
             ComparisonResult с результатами от всех матчеров
         """
+        query = self._cache_query(resume, job)
+        if query is not None:
+            cached = self._cache_lookup(*query)
+            if cached is not None:
+                logger.debug(f"Comparison cache hit for {resume.file_name} vs {job.job_id}")
+                return self._reuse_result(cached, resume, job)
+
         result = ComparisonResult(
             resume_id=resume.file_name,
             job_id=job.job_id
@@ -135,6 +170,13 @@ class MatcherComparison:
             except Exception as e:
                 logger.error(f"Semantic matching failed: {e}")
 
+        if result.semantic_result and self._is_confident(result.semantic_result.overall_score):
+            logger.debug(
+                f"Early exit for {resume.file_name} vs {job.job_id}: "
+                f"semantic score {result.semantic_result.overall_score:.3f}, skipping TF-IDF/LLM"
+            )
+            return self._finish_early(result, query)
+
         if 'tfidf' in self.matchers:
             try:
                 result.tfidf_result = self.matchers['tfidf'].match(resume, job)
@@ -142,16 +184,132 @@ class MatcherComparison:
             except Exception as e:
                 logger.error(f"TF-IDF matching failed: {e}")
 
-        if 'llm' in self.matchers:
+        cheap_scores = [r.overall_score for r in (result.semantic_result, result.tfidf_result) if r]
+        skip_llm = (
+            self.early_exit_low is not None
+            and cheap_scores
+            and max(cheap_scores) < self.early_exit_low
+        )
+        if skip_llm and 'llm' in self.matchers:
+            logger.debug(
+                f"Skipping LLM for {resume.file_name} vs {job.job_id}: "
+                f"best cheap score {max(cheap_scores):.3f} < {self.early_exit_low}"
+            )
+
+        if 'llm' in self.matchers and not skip_llm:
             try:
                 result.llm_result = self.matchers['llm'].match(resume, job)
                 logger.info(f"LLM match: {result.llm_result.overall_score:.1%}")
             except Exception as e:
                 logger.error(f"LLM matching failed: {e}")
 
-        # Статистика вычисляется в __post_init__
+        # Результаты заполнены после __post_init__, пересчитываем статистику
+        result.update_stats()
+        if query is not None:
+            self._cache_insert(*query, result)
         return result
 
+    def _is_confident(self, score: float) -> bool:
+        """Попадает ли semantic score в "уверенную" зону, где остальные матчеры не нужны"""
+        if self.early_exit_high is not None and score >= self.early_exit_high:
+            return True
+        if self.early_exit_low is not None and score <= self.early_exit_low:
+            return True
+        return False
+
+    def _finish_early(
+        self, result: ComparisonResult, query: Optional[Tuple[str, np.ndarray]]
+    ) -> ComparisonResult:
+        """Заполнить статистику по одному semantic score и сохранить результат в кэш"""
+        score = result.semantic_result.overall_score
+        result.average_score = score
+        result.median_score = score
+        result.score_variance = 0.0
+        result.agreement_level = "high"
+        result.early_exit = True
+        if query is not None:
+            self._cache_insert(*query, result)
+        return result
+
+    def _cache_query(self, resume: Resume, job: Job) -> Optional[Tuple[str, np.ndarray]]:
+        """
+        Ключ семантического кэша: (вакансия, нормированный эмбеддинг резюме).
+
+        Результаты переиспользуются только внутри одной вакансии (job_id и ее текста),
+        похожесть считается по резюме. None, если кэш выключен или Sentence-BERT недоступен.
+        """
+        semantic = self.matchers.get('semantic')
+        if self.cache_threshold is None or semantic is None or not semantic.model:
+            return None
+
+        try:
+            resume_text = semantic._prepare_resume_text(resume)
+            resume_emb = semantic.store.get_or_compute(
+                semantic.embedding_key(resume_text), resume_text, semantic.model
+            )
+        except Exception as e:
+            logger.warning(f"Comparison cache disabled for this pair: {e}")
+            return None
+
+        job_key = f"{job.job_id}::{content_hash(job.full_text)}"
+        return job_key, (resume_emb / (np.linalg.norm(resume_emb) or 1.0)).astype(np.float32)
+
+    def _cache_lookup(self, job_key: str, query: np.ndarray) -> Optional[ComparisonResult]:
+        """Результат самого близкого резюме для этой вакансии, если близость >= cache_threshold"""
+        entry = self._cache.get(job_key)
+        if not entry:
+            return None
+        keys, results = entry
+        scores = np.vstack(keys) @ query
+        best = int(np.argmax(scores))
+        if scores[best] >= self.cache_threshold:
+            return results[best]
+        return None
+
+    def _cache_insert(self, job_key: str, query: np.ndarray, result: ComparisonResult):
+        if self._cache_len >= self.cache_size:
+            # Вытесняем самую старую запись самой давно добавленной вакансии
+            oldest_key = next(iter(self._cache))
+            keys, results = self._cache[oldest_key]
+            keys.pop(0)
+            results.pop(0)
+            if not keys:
+                del self._cache[oldest_key]
+            self._cache_len -= 1
+        keys, results = self._cache.setdefault(job_key, ([], []))
+        keys.append(query)
+        results.append(result)
+        self._cache_len += 1
+
+    def _reuse_result(self, cached: ComparisonResult, resume: Resume, job: Job) -> ComparisonResult:
+        """
+        Копия кэшированного результата для текущей пары
+
+        Оценки матчеров берутся из кэша, а навыки (совпавшие, недостающие, skills_match)
+        пересчитываются по навыкам текущего резюме.
+        """
+        ids = {'resume_id': resume.file_name, 'job_id': job.job_id}
+        skills_score, matched_skills, missing_skills = next(iter(self.matchers.values())).calculate_skills_match(
+            resume.skills_lower(), job.required_skills, normalized=True
+        )
+        update = dict(
+            ids,
+            skills_match=skills_score,
+            matched_skills=matched_skills,
+            missing_skills=missing_skills,
+        )
+
+        def copy_match(match: Optional[MatchResult]) -> Optional[MatchResult]:
+            return match.model_copy(update=update, deep=True) if match else None
+
+        return replace(
+            cached,
+            semantic_result=copy_match(cached.semantic_result),
+            tfidf_result=copy_match(cached.tfidf_result),
+            llm_result=copy_match(cached.llm_result),
+            **ids
+        )
+
     def compare_many(
         self,
         resumes: List[Resume],
@@ -268,40 +426,32 @@ class MatcherComparison:
         Returns:
             Словарь с корреляциями между парами матчеров
         """
-        semantic_scores = []
-        tfidf_scores = []
-        llm_scores = []
+        scores = {'semantic': [], 'tfidf': [], 'llm': []}
 
         for comp in comparisons:
             if comp.semantic_result:
-                semantic_scores.append(comp.semantic_result.overall_score)
+                scores['semantic'].append(comp.semantic_result.overall_score)
             if comp.tfidf_result:
-                tfidf_scores.append(comp.tfidf_result.overall_score)
+                scores['tfidf'].append(comp.tfidf_result.overall_score)
             if comp.llm_result:
-                llm_scores.append(comp.llm_result.overall_score)
+                scores['llm'].append(comp.llm_result.overall_score)
 
         correlations = {}
 
-        # Простая корреляция Пирсона
-        if len(semantic_scores) == len(tfidf_scores) and len(semantic_scores) > 1:
-            try:
-                corr = statistics.correlation(semantic_scores, tfidf_scores)
-                correlations['semantic_vs_tfidf'] = corr
-            except:
-                pass
-
-        if len(semantic_scores) == len(llm_scores) and len(semantic_scores) > 1:
-            try:
-                corr = statistics.correlation(semantic_scores, llm_scores)
-                correlations['semantic_vs_llm'] = corr
-            except:
-                pass
-
-        if len(tfidf_scores) == len(llm_scores) and len(tfidf_scores) > 1:
-            try:
-                corr = statistics.correlation(tfidf_scores, llm_scores)
-                correlations['tfidf_vs_llm'] = corr
-            except:
-                pass
+        # Корреляция Пирсона: один np.corrcoef на группу векторов одинаковой длины
+        by_length: Dict[int, List[str]] = {}
+        for name, values in scores.items():
+            if len(values) > 1:
+                by_length.setdefault(len(values), []).append(name)
+
+        for names in by_length.values():
+            if len(names) < 2:
+                continue
+            with np.errstate(divide='ignore', invalid='ignore'):
+                matrix = np.corrcoef(np.array([scores[name] for name in names], dtype=np.float64))
+            for (i, a), (j, b) in combinations(enumerate(names), 2):
+                # NaN означает постоянный вектор - корреляция не определена
+                if not np.isnan(matrix[i, j]):
+                    correlations[f'{a}_vs_{b}'] = float(matrix[i, j])
 
         return correlations
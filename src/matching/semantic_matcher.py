@@ -5,8 +5,11 @@ Semantic Matcher using Sentence-BERT with optional FAISS acceleration.
 - Caches embeddings for reuse
 - Optionally builds/loads a FAISS index for fast top-K retrieval
 """
+import atexit
+import copy
 import logging
-from typing import List, Optional
+import os
+from typing import Any, Dict, List, Optional, Tuple
 import sys
 from pathlib import Path
 
@@ -21,7 +24,8 @@ from resume_parser.models import Resume  # noqa: E402
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-from .embedding_store import EmbeddingStore
+from .embedding_store import EmbeddingStore, content_hash
+from .jaccard import jaccard_similarity
 try:
     from .faiss_index import FaissIndex
     FAISS_HELPERS_AVAILABLE = True
@@ -29,31 +33,116 @@ except Exception:
     FAISS_HELPERS_AVAILABLE = False
 
 try:
-    from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
+    from sentence_transformers import SentenceTransformer, util
     SENTENCE_TRANSFORMERS_AVAILABLE = True
 except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     logger.warning("sentence-transformers not available. Semantic matching will use fallback.")
 
+# Loaded Sentence-BERT models shared by all matcher instances: (model name, int8) -> model
+_MODELS: Dict[Tuple[str, bool], Any] = {}
+
+EMBEDDINGS_CACHE_PATH = Path("./data/cache/semantic_embeddings.pkl")
+# Embedding stores shared by all matcher instances: cache path -> store
+_STORES: Dict[Path, EmbeddingStore] = {}
+
+
+def int8_enabled() -> bool:
+    """INT8 inference is opt-in via SBERT_INT8=1 (it trades a little accuracy for speed)."""
+    return os.environ.get("SBERT_INT8", "0").lower() in ("1", "true", "yes")
+
+
+def _quantize_module(module):
+    """int8 dynamic quantization of Linear layers via torchao, or torch.ao on older setups."""
+    import torch
+
+    try:
+        from torchao.quantization import Int8DynamicActivationInt8WeightConfig, quantize_
+    except ImportError:
+        # torch.ao.quantization is deprecated in favour of torchao but still works
+        return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+    module = copy.deepcopy(module)
+    quantize_(module, Int8DynamicActivationInt8WeightConfig())
+    return module
+
+
+def _quantize_int8(model):
+    """
+    Dynamically quantize the transformer's Linear layers to int8 (CPU only).
+
+    Any failure keeps the FP32 model, so SBERT_INT8=1 never disables semantic matching.
+    Sets model.int8_quantized to tell which weights are actually in use.
+    """
+    model.int8_quantized = False
+    if model.device.type != "cpu":
+        logger.warning("INT8 quantization is only applied on CPU; keeping FP32 weights")
+        return model
+    transformer = model[0]
+    try:
+        transformer.auto_model = _quantize_module(transformer.auto_model)
+    except Exception as exc:
+        logger.warning(f"INT8 quantization failed, keeping FP32 weights: {exc}")
+        return model
+    model.int8_quantized = True
+    return model
+
+
+def _get_store(cache_path: Path = EMBEDDINGS_CACHE_PATH) -> EmbeddingStore:
+    """
+    Open the on-disk embedding cache once per process; it is saved at exit.
+
+    Entries are keyed by model and text content (see SemanticMatcher.embedding_key),
+    so later runs reuse every vector whose input has not changed.
+    """
+    store = _STORES.get(cache_path)
+    if store is None:
+        store = EmbeddingStore(cache_path=cache_path)
+        _STORES[cache_path] = store
+        atexit.register(store.save)
+    return store
+
+
+def _load_model(model_name: str, int8: bool = False):
+    """Load a SentenceTransformer once per process and reuse it afterwards."""
+    key = (model_name, int8)
+    model = _MODELS.get(key)
+    if model is None:
+        logger.info(f"Loading Sentence-BERT model: {model_name}{' (int8)' if int8 else ''}")
+        model = SentenceTransformer(model_name)
+        if int8:
+            model = _quantize_int8(model)
+        _MODELS[key] = model
+    return model
+
 
 class SemanticMatcher(BaseMatcher):
     """
     Sentence-BERT matcher with optional FAISS index for retrieval.
     """
 
-    def __init__(self, model_name: str = 'paraphrase-multilingual-MiniLM-L12-v2'):
+    def __init__(
+        self,
+        model_name: str = 'paraphrase-multilingual-MiniLM-L12-v2',
+        int8: Optional[bool] = None
+    ):
         super().__init__()
         self.name = "Semantic Matcher (Sentence-BERT)"
         self.model_name = model_name
+        # None -> follow the SBERT_INT8 environment variable
+        self.int8 = int8_enabled() if int8 is None else int8
         self.model: Optional[SentenceTransformer] = None  # type: ignore
-        self.store = EmbeddingStore(cache_path=Path("./data/cache/semantic_embeddings.pkl"))
+        self.store = _get_store()
         self.faiss_index: Optional[FaissIndex] = None
+        # (id(resumes), len(resumes)) -> (resumes, file_name -> position, normalized corpus embeddings,
+        # fingerprint of the file names and prepared texts)
+        self._corpus_cache: Dict[Tuple[int, int], Tuple[List[Resume], Dict[str, int], Any, Tuple]] = {}
+        self.corpus_cache_size = 4
 
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
-                logger.info(f"Loading Sentence-BERT model: {model_name}")
-                self.model = SentenceTransformer(model_name)
+                self.model = _load_model(model_name, self.int8)
+                # Embedding keys must name the weights actually used
+                self.int8 = self.int8 and getattr(self.model, "int8_quantized", False)
                 if FAISS_HELPERS_AVAILABLE:
                     dim = self.model.get_sentence_embedding_dimension()
                     try:
@@ -70,8 +159,9 @@ class SemanticMatcher(BaseMatcher):
     def match(self, resume: Resume, job: Job) -> MatchResult:
         # Skills overlap
         skills_score, matched_skills, missing_skills = self.calculate_skills_match(
-            resume.skills,
-            job.required_skills
+            resume.skills_lower(),
+            job.required_skills,
+            normalized=True,
         )
 
         semantic_score = self._calculate_semantic_similarity(resume, job)
@@ -96,6 +186,78 @@ class SemanticMatcher(BaseMatcher):
             )
         )
 
+    def match_jobs(self, resume: Resume, jobs: List[Job], max_workers: int = 1) -> List[MatchResult]:
+        """
+        Match one resume against many jobs with a single encode call.
+
+        The resume and all uncached job texts go through the model in one
+        batch; similarities are one matrix-vector product. Scores are the
+        same as calling match() per job. max_workers only applies to the
+        per-job fallback used when the model is unavailable.
+        """
+        if not SENTENCE_TRANSFORMERS_AVAILABLE or not self.model or not jobs:
+            return super().match_jobs(resume, jobs, max_workers)
+
+        try:
+            texts = [self._prepare_resume_text(resume)] + [job.full_text for job in jobs]
+            items = [(self.embedding_key(text), text) for text in texts]
+            embeddings = self.store.get_or_compute_many(items, self.model)
+        except Exception as e:
+            logger.error(f"Error encoding jobs in batch: {e}")
+            return super().match_jobs(resume, jobs, max_workers)
+
+        resume_vec = embeddings[0].astype(np.float32, copy=False)
+        job_mat = np.asarray(embeddings[1:], dtype=np.float32)
+        denom = np.linalg.norm(job_mat, axis=1) * np.linalg.norm(resume_vec)
+        dots = job_mat @ resume_vec
+        similarities = np.divide(dots, denom, out=np.zeros_like(dots), where=denom != 0)
+
+        results = []
+        for job, similarity in zip(jobs, similarities):
+            skills_score, matched_skills, missing_skills = self.calculate_skills_match(
+                resume.skills_lower(),
+                job.required_skills,
+                normalized=True,
+            )
+            semantic_score = float((float(similarity) + 1) / 2)
+            overall_score = (semantic_score * 0.6) + (skills_score * 0.4)
+            results.append(MatchResult(
+                resume_id=resume.file_name,
+                job_id=job.job_id,
+                overall_score=overall_score,
+                skills_match=skills_score,
+                semantic_similarity=semantic_score,
+                matched_skills=matched_skills,
+                missing_skills=missing_skills,
+                matching_method="semantic",
+                explanation=self._generate_explanation(
+                    overall_score,
+                    semantic_score,
+                    skills_score,
+                    matched_skills,
+                    missing_skills
+                )
+            ))
+        return results
+
+    def warm_up(self, jobs: List[Job]) -> int:
+        """
+        Pre-encode job texts into the embedding cache and save it to disk.
+
+        Later match()/match_jobs() calls for these jobs, in this or any
+        later process, skip the model for the job side.
+
+        Returns:
+            Number of jobs encoded now (0 when all were cached)
+        """
+        if not SENTENCE_TRANSFORMERS_AVAILABLE or not self.model:
+            return 0
+        items = [(self.embedding_key(job.full_text), job.full_text) for job in jobs]
+        missing = len({key for key, _ in items if key not in self.store.cache})
+        self.store.get_or_compute_many(items, self.model)
+        self.store.save()
+        return missing
+
     def _calculate_semantic_similarity(self, resume: Resume, job: Job) -> float:
         if not SENTENCE_TRANSFORMERS_AVAILABLE or not self.model:
             return self._fallback_similarity(resume, job)
@@ -104,17 +266,39 @@ class SemanticMatcher(BaseMatcher):
             resume_text = self._prepare_resume_text(resume)
             job_text = job.full_text
 
-            resume_embedding = self.store.get_or_compute(resume.file_name, resume_text, self.model)
-            job_key = f"job::{job.job_id}::{hash(job_text)}"
-            job_embedding = self.store.get_or_compute(job_key, job_text, self.model)
+            # Both texts share one encode call when neither is cached
+            resume_embedding, job_embedding = self.store.get_or_compute_many(
+                [(self.embedding_key(resume_text), resume_text), (self.embedding_key(job_text), job_text)],
+                self.model
+            )
 
-            similarity = cosine_similarity([resume_embedding], [job_embedding])[0][0]
+            similarity = self._cosine(resume_embedding, job_embedding)
             normalized_similarity = (similarity + 1) / 2
             return float(normalized_similarity)
         except Exception as e:
             logger.error(f"Error calculating semantic similarity: {e}")
             return self._fallback_similarity(resume, job)
 
+    def embedding_key(self, text: str) -> str:
+        """
+        Embedding cache key: model (and INT8 mode) plus a hash of the text.
+
+        Identical texts share one entry across runs, edited texts get a new
+        one, and switching models never returns vectors from another model.
+        """
+        model_tag = f"{self.model_name}+int8" if self.int8 else self.model_name
+        return f"{model_tag}::{content_hash(text)}"
+
+    @staticmethod
+    def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+        """Cosine similarity computed in float32 (sklearn upcasts to float64)."""
+        a = np.asarray(a, dtype=np.float32)
+        b = np.asarray(b, dtype=np.float32)
+        denom = np.linalg.norm(a) * np.linalg.norm(b)
+        if denom == 0:
+            return 0.0
+        return float(np.dot(a, b) / denom)
+
     def _prepare_resume_text(self, resume: Resume) -> str:
         parts = []
         if resume.contact_info.name:
@@ -128,13 +312,9 @@ class SemanticMatcher(BaseMatcher):
         return "\n\n".join(parts)
 
     def _fallback_similarity(self, resume: Resume, job: Job) -> float:
-        resume_words = set(resume.keywords[:20]) | set(resume.skills)
-        job_words = set(job.required_skills) | set(job.nice_to_have_skills)
-        if not resume_words or not job_words:
-            return 0.0
-        intersection = len(resume_words.intersection(job_words))
-        union = len(resume_words.union(job_words))
-        return intersection / union if union > 0 else 0.0
+        resume_words = resume.keywords[:20] + resume.skills
+        job_words = job.required_skills + job.nice_to_have_skills
+        return jaccard_similarity(resume_words, job_words)
 
     def _generate_explanation(
         self,
@@ -173,32 +353,49 @@ class SemanticMatcher(BaseMatcher):
             if self.faiss_index and self.faiss_index.index.ntotal == 0:
                 self._build_faiss_index(resumes)
 
-            candidate_resumes = resumes
+            _, id_to_index, corpus_embeddings, _ = self._get_corpus(resumes)
+
+            candidate_idx = list(range(len(resumes)))
             # Preselect via FAISS if index present
             if self.faiss_index and self.faiss_index.index.ntotal > 0:
-                job_emb = self.model.encode([job.full_text])[0].astype(np.float32)
+                job_emb = self.model.encode(
+                    [job.full_text], convert_to_numpy=True, show_progress_bar=False
+                )[0].astype(np.float32, copy=False)
                 top_hits = self.faiss_index.search(np.array([job_emb]), top_k=max(top_n * 3, 10))
-                id_to_resume = {r.file_name: r for r in resumes}
-                filtered = [id_to_resume[rid] for rid, _ in top_hits if rid in id_to_resume]
+                filtered = [id_to_index[rid] for rid, _ in top_hits if rid in id_to_index]
                 if filtered:
-                    candidate_resumes = filtered
-
-            resume_texts = [self._prepare_resume_text(r) for r in candidate_resumes]
-            logger.info(f"Encoding {len(resume_texts)} resumes (optimized)...")
-            resume_embeddings = self.model.encode(resume_texts, show_progress_bar=False)
-            job_embedding = self.model.encode([job.full_text])[0]
+                    candidate_idx = filtered
+
+            candidate_resumes = [resumes[i] for i in candidate_idx]
+            resume_embeddings = corpus_embeddings[candidate_idx]
+            job_embedding = self.model.encode(
+                [job.full_text],
+                convert_to_tensor=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
 
-            similarities = cosine_similarity(resume_embeddings, [job_embedding])
+            # Score every candidate: final ranking also weighs skills overlap
+            hits = util.semantic_search(job_embedding, resume_embeddings, top_k=len(candidate_resumes))[0]
+
+            # Score every hit, but build MatchResult objects only for the top_n
+            scored = []
+            for hit in hits:
+                resume = candidate_resumes[hit["corpus_id"]]
+                semantic_score = (float(hit["score"]) + 1) / 2
+                skills = self.calculate_skills_match(
+                    resume.skills_lower(),
+                    job.required_skills,
+                    normalized=True,
+                )
+                overall_score = (semantic_score * 0.6) + (skills[0] * 0.4)
+                scored.append((resume, semantic_score, skills, overall_score))
 
+            overall = np.fromiter((item[3] for item in scored), dtype=np.float64, count=len(scored))
             results = []
-            for resume, similarity in zip(candidate_resumes, similarities):
-                semantic_score = (similarity[0] + 1) / 2
-                skills_score, matched_skills, missing_skills = self.calculate_skills_match(
-                    resume.skills,
-                    job.required_skills
-                )
-                overall_score = (semantic_score * 0.6) + (skills_score * 0.4)
-                result = MatchResult(
+            for i in self._top_indices(overall, top_n):
+                resume, semantic_score, (skills_score, matched_skills, missing_skills), overall_score = scored[i]
+                results.append(MatchResult(
                     resume_id=resume.file_name,
                     job_id=job.job_id,
                     overall_score=overall_score,
@@ -214,24 +411,89 @@ class SemanticMatcher(BaseMatcher):
                         matched_skills,
                         missing_skills
                     )
-                )
-                results.append(result)
-
-            results.sort(key=lambda x: x.overall_score, reverse=True)
-            return results[:top_n]
+                ))
+            return results
 
         except Exception as e:
             logger.error(f"Error in optimized matching: {e}")
             return self.match_many(resumes, job, top_n)
 
+    @staticmethod
+    def _top_indices(scores: np.ndarray, top_n: int) -> np.ndarray:
+        """
+        Indices of the top_n highest scores, best first.
+
+        O(n) selection with argpartition instead of sorting every candidate.
+        Ties keep input order, exactly like a stable sort followed by [:top_n].
+        """
+        if top_n <= 0 or len(scores) == 0:
+            return np.empty(0, dtype=np.intp)
+        if len(scores) > top_n:
+            kth = scores[np.argpartition(-scores, top_n - 1)[top_n - 1]]
+            above = np.flatnonzero(scores > kth)
+            tied = np.flatnonzero(scores == kth)[:top_n - len(above)]
+            candidates = np.sort(np.concatenate([above, tied]))
+        else:
+            candidates = np.arange(len(scores))
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def _get_corpus(self, resumes: List[Resume]):
+        """
+        Return cached lookup table and normalized embeddings for a resume corpus.
+
+        Keyed by list identity and length, so scoring the same corpus against
+        many jobs encodes it only once. The list itself is kept in the entry
+        to stop its id from being reused while cached, and a fingerprint of
+        the file names and prepared texts catches in-place edits of the list.
+        """
+        resume_texts = [self._prepare_resume_text(r) for r in resumes]
+        fingerprint = tuple((r.file_name, content_hash(text)) for r, text in zip(resumes, resume_texts))
+        key = (id(resumes), len(resumes))
+        entry = self._corpus_cache.get(key)
+        if entry is not None and entry[0] is resumes and entry[3] == fingerprint:
+            return entry
+
+        id_to_index = {r.file_name: i for i, r in enumerate(resumes)}
+        logger.info(f"Encoding {len(resume_texts)} resumes (optimized)...")
+        # Keep embeddings as normalized tensors so scoring stays on the model's device
+        embeddings = self._encode_unique(
+            resume_texts,
+            batch_size=64,
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+        )
+
+        self._corpus_cache.pop(key, None)
+        if len(self._corpus_cache) >= self.corpus_cache_size:
+            self._corpus_cache.pop(next(iter(self._corpus_cache)))
+        entry = (resumes, id_to_index, embeddings, fingerprint)
+        self._corpus_cache[key] = entry
+        return entry
+
+    def _encode_unique(self, texts: List[str], **encode_kwargs):
+        """
+        Encode texts, running each distinct text through the model only once.
+
+        Duplicate resumes (same CV uploaded twice, re-sent by email, ...)
+        get a copy of the first occurrence's embedding, in input order.
+        """
+        positions: Dict[str, int] = {}
+        inverse = [positions.setdefault(text, len(positions)) for text in texts]
+        embeddings = self.model.encode(list(positions), show_progress_bar=False, **encode_kwargs)
+        if len(positions) == len(texts):
+            return embeddings
+        logger.info(f"Encoded {len(positions)} unique texts for {len(texts)} resumes")
+        return embeddings[inverse]
+
     def _build_faiss_index(self, resumes: List[Resume]):
         if not self.faiss_index or not self.model:
             return
         try:
             texts = [self._prepare_resume_text(r) for r in resumes]
             logger.info(f"Building FAISS index for {len(texts)} resumes...")
-            embeddings = self.model.encode(texts, show_progress_bar=False)
-            embeddings = np.array(embeddings, dtype=np.float32)
+            embeddings = self._encode_unique(
+                texts, convert_to_numpy=True
+            ).astype(np.float32, copy=False)
             self.faiss_index.add_embeddings(embeddings, [r.file_name for r in resumes])
             self.faiss_index.save()
         except Exception as exc:
@@ -8,6 +8,7 @@ import numpy as np
 from typing import List
 from .base_matcher import BaseMatcher
 from .job_model import Job, MatchResult
+from .jaccard import jaccard_similarity
 import sys
 from pathlib import Path
 
@@ -18,30 +19,38 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
     from sklearn.metrics.pairwise import cosine_similarity
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
     logger.warning("scikit-learn not available. TF-IDF matching will use fallback.")
 
+_CYRILLIC_RE = re.compile(r'[А-Яа-яЁё]')
+
 
 class TFIDFMatcher(BaseMatcher):
     """
     TF-IDF + cosine similarity matcher (no training).
     """
 
+    # Hash space for terms; large enough that collisions are negligible
+    HASH_FEATURES = 2 ** 20
+
     def __init__(self, max_features: int = 500):
         super().__init__()
         self.name = "TF-IDF Matcher"
         self.max_features = max_features
+        # language -> stateless HashingVectorizer, built once and reused for every pair
+        self._vectorizers = {}
         if not SKLEARN_AVAILABLE:
             logger.warning("Using fallback mode without sklearn")
 
     def match(self, resume: Resume, job: Job) -> MatchResult:
         skills_score, matched_skills, missing_skills = self.calculate_skills_match(
-            resume.skills,
-            job.required_skills
+            resume.skills_lower(),
+            job.required_skills,
+            normalized=True,
         )
 
         tfidf_score = self._calculate_tfidf_similarity(resume, job)
@@ -67,13 +76,17 @@ class TFIDFMatcher(BaseMatcher):
             return self._fallback_similarity(resume, job)
 
         try:
-            resume_text = resume.raw_text if resume.raw_text else " ".join(resume.skills)
-            job_text = job.full_text
+            # Lowercased once per resume and shared with other matchers
+            resume_text = resume.lowered_text() if resume.raw_text else " ".join(resume.skills).lower()
+            job_text = job.full_text.lower()
 
             lang = self._detect_language(resume_text + job_text)
             vectorizer = self._build_vectorizer(lang)
 
-            vectors = vectorizer.fit_transform([resume_text, job_text])
+            # Hashing replaces the per-pair vocabulary fit; IDF is still fit on the pair
+            counts = vectorizer.transform([resume_text, job_text]).tocsc()
+            counts = counts[:, self._top_terms(counts)]
+            vectors = TfidfTransformer().fit_transform(counts)
             similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
 
             return float(max(0.0, min(1.0, similarity)))
@@ -83,28 +96,40 @@ class TFIDFMatcher(BaseMatcher):
             return self._fallback_similarity(resume, job)
 
     def _fallback_similarity(self, resume: Resume, job: Job) -> float:
-        resume_words = set(resume.keywords[:30]) | set(resume.skills)
-        job_words = set(job.required_skills) | set(job.nice_to_have_skills)
-
-        if not resume_words or not job_words:
-            return 0.0
-
-        intersection = len(resume_words.intersection(job_words))
-        union = len(resume_words.union(job_words))
-
-        return intersection / union if union > 0 else 0.0
+        resume_words = resume.keywords[:30] + resume.skills
+        job_words = job.required_skills + job.nice_to_have_skills
+        return jaccard_similarity(resume_words, job_words)
 
     def _build_vectorizer(self, language: str):
-        stop_words = 'english' if language == 'en' else None
-        return TfidfVectorizer(
-            max_features=self.max_features,
-            stop_words=stop_words,
-            ngram_range=(1, 2),
-            min_df=1
-        )
+        vectorizer = self._vectorizers.get(language)
+        if vectorizer is None:
+            stop_words = 'english' if language == 'en' else None
+            vectorizer = HashingVectorizer(
+                n_features=self.HASH_FEATURES,
+                stop_words=stop_words,
+                # Inputs arrive already lowercased (see _calculate_tfidf_similarity)
+                lowercase=False,
+                ngram_range=(1, 2),
+                alternate_sign=False,
+                norm=None
+            )
+            self._vectorizers[language] = vectorizer
+        return vectorizer
+
+    def _top_terms(self, counts) -> np.ndarray:
+        """
+        Columns of the terms present in the pair, limited to the max_features
+        most frequent ones (what TfidfVectorizer(max_features=...) keeps).
+        """
+        term_freq = np.asarray(counts.sum(axis=0)).ravel()
+        present = term_freq.nonzero()[0]
+        if self.max_features and len(present) > self.max_features:
+            top = np.argpartition(-term_freq[present], self.max_features - 1)[:self.max_features]
+            present = np.sort(present[top])
+        return present
 
     def _detect_language(self, text: str) -> str:
-        if re.search(r'[А-Яа-яЁё]', text):
+        if _CYRILLIC_RE.search(text):
             return "ru"
         return "en"
 
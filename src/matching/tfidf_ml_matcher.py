@@ -4,6 +4,11 @@ TF-IDF + ML Matcher
 Combines TF-IDF features of (resume, job) pairs with a lightweight
 classifier (Logistic Regression) to predict match probability.
 
+Resumes and jobs are vectorized by separate hashing TF-IDF pipelines and the
+classifier sees ``hstack([resume_vec, job_vec])``. Per-document vectors are
+independent of the pair, so they are cached and each resume/job is
+transformed once no matter how many pairs it appears in.
+
 Features:
 - Train on labeled pairs and optionally persist model to disk
 - Predict probability for a resume/job pair
@@ -12,8 +17,14 @@ Features:
 from __future__ import annotations
 
 import logging
+import math
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
 
 from .base_matcher import BaseMatcher
 from .job_model import Job, MatchResult
@@ -27,48 +38,107 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+    from sklearn.pipeline import Pipeline
     from sklearn.linear_model import LogisticRegression
+    from scipy import sparse
+    from scipy.special import expit
     import joblib
+    from joblib import Parallel, delayed
 
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
     logger.warning("scikit-learn not available. TF-IDF ML matcher will be disabled.")
 
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _csr_logistic(data, indices, indptr, q_coef, scale, intercept):
+        """sigmoid(row . q_coef * scale + intercept) for each CSR row, reading int8 weights directly."""
+        n_rows = indptr.size - 1
+        out = np.empty(n_rows, dtype=np.float64)
+        for row in prange(n_rows):
+            acc = 0.0
+            for k in range(indptr[row], indptr[row + 1]):
+                acc += data[k] * q_coef[indices[k]]
+            out[row] = 1.0 / (1.0 + math.exp(-(acc * scale + intercept)))
+        return out
+
 
 class TfidfMLMatcher(BaseMatcher):
     """
     Matcher using TF-IDF features + ML classifier.
     """
 
+    # Bump when the saved payload layout changes; other versions are rejected on load
+    MODEL_FORMAT_VERSION = 2
+
     def __init__(
         self,
         model_path: Path | str = Path("./data/models/tfidf_ml_model.joblib"),
-        max_features: int = 5000,
+        n_features: int = 2 ** 14,
+        n_jobs: Optional[int] = None,
     ):
         super().__init__()
         self.name = "TF-IDF + ML Matcher"
         self.model_path = Path(model_path)
-        self.max_features = max_features
-        self.vectorizer: Optional[TfidfVectorizer] = None
+        self.n_features = n_features
+        # Workers for hashing training texts (joblib semantics: -1 = all cores)
+        self.n_jobs = n_jobs
+        self.resume_vectorizer: Optional[Pipeline] = None
+        self.job_vectorizer: Optional[Pipeline] = None
         self.classifier: Optional[LogisticRegression] = None
         self.is_trained: bool = False
+        # (int8 coef, scale, intercept) of a binary LogisticRegression, see _quantize_classifier
+        self.quantized: Optional[Tuple[np.ndarray, float, float]] = None
+        # file_name -> (weakref to Resume, text); LRU bounded by resume_text_cache_size
+        self._resume_text_cache: "OrderedDict[str, Tuple[weakref.ref, str]]" = OrderedDict()
+        self.resume_text_cache_size = 1024
+
+        self._reset_vector_cache()
 
         if SKLEARN_AVAILABLE:
-            self.vectorizer = TfidfVectorizer(
-                max_features=self.max_features,
-                ngram_range=(1, 2),
-                stop_words="english",
-                min_df=1,
-            )
+            self.resume_vectorizer = self._new_vectorizer()
+            self.job_vectorizer = self._new_vectorizer()
             self.classifier = LogisticRegression(
                 max_iter=1000,
-                n_jobs=None,
+                n_jobs=self.n_jobs,
                 class_weight="balanced",
             )
             self._maybe_load_model()
 
+    def _new_vectorizer(self) -> Pipeline:
+        """Hashed (vocabulary-free) n-gram counts re-weighted by IDF."""
+        return Pipeline([
+            ("hv", HashingVectorizer(
+                n_features=self.n_features,
+                ngram_range=(1, 2),
+                stop_words="english",
+                alternate_sign=False,
+                norm=None,
+            )),
+            ("tfidf", TfidfTransformer()),
+        ])
+
+    def _reset_vector_cache(self, maxsize: int = 4096):
+        """(Re)create per-document vector caches; called whenever the vectorizers change."""
+        self._vectorize_resume = lru_cache(maxsize=maxsize)(self._transform_resume)
+        self._vectorize_job = lru_cache(maxsize=maxsize)(self._transform_job)
+
+    def _transform_resume(self, resume_id: str, text: str):
+        return self.resume_vectorizer.transform([text])
+
+    def _transform_job(self, job_id: str, text: str):
+        return self.job_vectorizer.transform([text])
+
     def _maybe_load_model(self):
         """Load model from disk if present."""
         if not self.model_path.exists():
@@ -76,8 +146,24 @@ class TfidfMLMatcher(BaseMatcher):
 
         try:
             payload = joblib.load(self.model_path)
-            self.vectorizer = payload["vectorizer"]
-            self.classifier = payload["classifier"]
+            version = payload.get("format_version") if isinstance(payload, dict) else None
+            if version != self.MODEL_FORMAT_VERSION:
+                logger.warning(
+                    f"{self.model_path} has model format {version}, expected "
+                    f"{self.MODEL_FORMAT_VERSION}; retrain the TF-IDF ML model"
+                )
+                return
+            self.resume_vectorizer = payload["resume_vectorizer"]
+            self.job_vectorizer = payload["job_vectorizer"]
+            self._reset_vector_cache()
+            if "q_coef" in payload:
+                self.quantized = (
+                    payload["q_coef"],
+                    float(payload["scale"]),
+                    float(payload["intercept"]),
+                )
+            else:
+                self.classifier = payload["classifier"]
             self.is_trained = True
             logger.info(f"Loaded TF-IDF ML model from {self.model_path}")
         except Exception as exc:
@@ -95,26 +181,27 @@ class TfidfMLMatcher(BaseMatcher):
         - {"resume": Resume, "job": Job, "label": int}
         - {"resume_text": str, "job_text": str, "label": int}
         """
-        if not SKLEARN_AVAILABLE or not self.vectorizer or not self.classifier:
+        if not SKLEARN_AVAILABLE or not self.resume_vectorizer or not self.classifier:
             raise RuntimeError("scikit-learn not available; cannot train TF-IDF ML model.")
 
-        texts = []
-        labels = []
-
-        for sample in samples:
-            label = int(sample["label"])
-            resume_text = self._extract_resume_text(sample)
-            job_text = self._extract_job_text(sample)
-
-            combined = self._combine_text(resume_text, job_text)
-            texts.append(combined)
-            labels.append(label)
+        labels = [int(sample["label"]) for sample in samples]
 
         try:
-            logger.info(f"Training TF-IDF vectorizer on {len(texts)} samples...")
-            matrix = self.vectorizer.fit_transform(texts)
+            logger.info(f"Training TF-IDF vectorizers on {len(labels)} samples...")
+            resume_texts = (self._extract_resume_text(sample) for sample in samples)
+            job_texts = (self._extract_job_text(sample) for sample in samples)
+            matrix = sparse.hstack(
+                [
+                    self._fit_transform(self.resume_vectorizer, resume_texts),
+                    self._fit_transform(self.job_vectorizer, job_texts),
+                ],
+                format="csr",
+            )
+            self._reset_vector_cache()
             logger.info("Fitting classifier...")
             self.classifier.fit(matrix, labels)
+            # Serve the int8 weights right away, so predictions do not depend on save
+            self.quantized = self._quantize_classifier()
             self.is_trained = True
 
             if save:
@@ -123,9 +210,82 @@ class TfidfMLMatcher(BaseMatcher):
             logger.error(f"Error training TF-IDF ML model: {exc}")
             raise
 
+    def _fit_transform(self, pipeline: Pipeline, texts, chunk_size: int = 2000):
+        """
+        Fit a hashing TF-IDF pipeline on training texts.
+
+        Serially, texts are streamed into fit_transform. With n_jobs set, the
+        stateless hashing step runs on chunks in parallel worker processes and
+        only the IDF weighting is fitted in the parent.
+        """
+        if self.n_jobs in (None, 1):
+            return pipeline.fit_transform(texts)
+
+        texts = list(texts)
+        hasher = pipeline.named_steps["hv"]
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        counts = Parallel(n_jobs=self.n_jobs)(delayed(hasher.transform)(chunk) for chunk in chunks)
+        counts = sparse.vstack(counts, format="csr") if counts else hasher.transform([])
+        return pipeline.named_steps["tfidf"].fit_transform(counts)
+
     def match(self, resume: Resume, job: Job) -> MatchResult:
         """Predict match probability and combine with skills overlap."""
-        if not SKLEARN_AVAILABLE or not self.vectorizer or not self.classifier:
+        return self.match_batch([resume], [job])[0]
+
+    def match_batch(self, resumes: List[Resume], jobs: List[Job]) -> List[MatchResult]:
+        """
+        Score aligned (resume, job) pairs with one predict_proba call.
+
+        Each distinct resume/job is transformed at most once (vectors are cached).
+
+        ``resumes[i]`` is matched against ``jobs[i]``; both lists must have the same length.
+        """
+        if len(resumes) != len(jobs):
+            raise ValueError("resumes and jobs must have the same length")
+        self._check_ready()
+        if not resumes:
+            return []
+
+        matrix = sparse.vstack(
+            [self._pair_vector(resume, job) for resume, job in zip(resumes, jobs)],
+            format="csr",
+        )
+        probs = self._predict_probabilities(matrix)
+        return [
+            self._build_result(resume, job, prob)
+            for resume, job, prob in zip(resumes, jobs, probs)
+        ]
+
+    def match_resume_against_jobs(self, resume: Resume, jobs: List[Job]) -> List[MatchResult]:
+        """Score one resume against many jobs, vectorizing the resume once."""
+        self._check_ready()
+        if not jobs:
+            return []
+
+        resume_vec = self._vectorize_resume(resume.file_name, self._get_resume_text(resume))
+        job_matrix = sparse.vstack(
+            [self._vectorize_job(job.job_id, job.full_text) for job in jobs], format="csr"
+        )
+        matrix = sparse.hstack(
+            [sparse.vstack([resume_vec] * len(jobs), format="csr"), job_matrix], format="csr"
+        )
+        probs = self._predict_probabilities(matrix)
+        return [self._build_result(resume, job, prob) for job, prob in zip(jobs, probs)]
+
+    def _pair_vector(self, resume: Resume, job: Job):
+        """Feature row for a pair, built from cached per-document vectors."""
+        return sparse.hstack(
+            [
+                self._vectorize_resume(resume.file_name, self._get_resume_text(resume)),
+                self._vectorize_job(job.job_id, job.full_text),
+            ],
+            format="csr",
+        )
+
+    def _check_ready(self):
+        if not SKLEARN_AVAILABLE or not self.resume_vectorizer or (
+            not self.classifier and self.quantized is None
+        ):
             raise RuntimeError("scikit-learn not available; cannot run TF-IDF ML matcher.")
 
         if not self.is_trained:
@@ -133,10 +293,11 @@ class TfidfMLMatcher(BaseMatcher):
                 "TF-IDF ML model is not trained. Call train() or provide a saved model."
             )
 
-        prob = self._predict_probability(resume, job)
+    def _build_result(self, resume: Resume, job: Job, prob: float) -> MatchResult:
         skills_score, matched_skills, missing_skills = self.calculate_skills_match(
-            resume.skills,
+            resume.skills_lower(),
             job.required_skills,
+            normalized=True,
         )
 
         # Blend model probability with skills overlap
@@ -156,24 +317,40 @@ class TfidfMLMatcher(BaseMatcher):
 
     def _predict_probability(self, resume: Resume, job: Job) -> float:
         """Predict probability for a single resume/job pair."""
-        combined = self._combine_text(
-            self._get_resume_text(resume),
-            job.full_text,
-        )
-        matrix = self.vectorizer.transform([combined])
+        return self._predict_probabilities(self._pair_vector(resume, job))[0]
+
+    def _predict_probabilities(self, matrix) -> List[float]:
+        """Predict probabilities for the rows of a pair feature matrix."""
+        if self.quantized is not None:
+            probas = self._predict_proba_quantized(matrix)
+            return [float(max(0.0, min(1.0, p))) for p in probas]
 
         try:
-            proba = self.classifier.predict_proba(matrix)[0][1]
+            probas = self.classifier.predict_proba(matrix)[:, 1]
         except Exception:
             # Fall back to decision_function if predict_proba not available
-            decision = self.classifier.decision_function(matrix)[0]
-            proba = 1 / (1 + pow(2.718281828, -decision))
-
-        return float(max(0.0, min(1.0, proba)))
-
-    def _combine_text(self, resume_text: str, job_text: str) -> str:
-        """Create a combined text representation for TF-IDF."""
-        return f"{resume_text}\n [SEP] \n{job_text}"
+            probas = expit(self.classifier.decision_function(matrix))
+
+        return [float(max(0.0, min(1.0, p))) for p in probas]
+
+    def _predict_proba_quantized(self, matrix) -> np.ndarray:
+        """Positive-class probability from int8 coefficients; the scale is applied once per row."""
+        q_coef, scale, intercept = self.quantized
+        if NUMBA_AVAILABLE:
+            matrix = sparse.csr_matrix(matrix)
+            return _csr_logistic(matrix.data, matrix.indices, matrix.indptr, q_coef, scale, intercept)
+        logits = (matrix @ q_coef.astype(np.float32)) * scale + intercept
+        return expit(np.asarray(logits).ravel())
+
+    def _quantize_classifier(self) -> Optional[Tuple[np.ndarray, float, float]]:
+        """Symmetric per-model int8 quantization of binary LogisticRegression weights."""
+        coef = getattr(self.classifier, "coef_", None)
+        if coef is None or coef.shape[0] != 1:
+            return None
+        coef = coef[0]
+        scale = float(np.max(np.abs(coef))) / 127.0 or 1.0
+        q_coef = np.round(coef / scale).astype(np.int8)
+        return q_coef, scale, float(self.classifier.intercept_[0])
 
     def _extract_resume_text(self, sample: Dict[str, Any]) -> str:
         if "resume_text" in sample:
@@ -188,6 +365,25 @@ class TfidfMLMatcher(BaseMatcher):
         return job.full_text
 
     def _get_resume_text(self, resume: Resume) -> str:
+        """
+        Text used to vectorize a resume, memoized per file_name.
+
+        An entry is only reused for the same Resume object (checked through a
+        weak reference), so different resumes sharing a file name never
+        collide and the cache does not keep resumes alive.
+        """
+        entry = self._resume_text_cache.get(resume.file_name)
+        if entry is not None and entry[0]() is resume:
+            self._resume_text_cache.move_to_end(resume.file_name)
+            return entry[1]
+
+        text = self._compute_resume_text(resume)
+        self._resume_text_cache[resume.file_name] = (weakref.ref(resume), text)
+        if len(self._resume_text_cache) > self.resume_text_cache_size:
+            self._resume_text_cache.popitem(last=False)
+        return text
+
+    def _compute_resume_text(self, resume: Resume) -> str:
         if resume.raw_text:
             return resume.raw_text
         if resume.summary:
@@ -216,13 +412,21 @@ class TfidfMLMatcher(BaseMatcher):
         return "\n".join(lines)
 
     def _save_model(self):
-        """Persist vectorizer + classifier."""
+        """Persist vectorizers + int8-quantized classifier weights."""
         try:
             self.model_path.parent.mkdir(parents=True, exist_ok=True)
-            joblib.dump(
-                {"vectorizer": self.vectorizer, "classifier": self.classifier},
-                self.model_path,
-            )
+            payload = {
+                "format_version": self.MODEL_FORMAT_VERSION,
+                "resume_vectorizer": self.resume_vectorizer,
+                "job_vectorizer": self.job_vectorizer,
+            }
+            if self.quantized is not None:
+                q_coef, scale, intercept = self.quantized
+                payload.update(q_coef=q_coef, scale=scale, intercept=intercept)
+            else:
+                # Not a binary LogisticRegression - keep the float classifier
+                payload["classifier"] = self.classifier
+            joblib.dump(payload, self.model_path)
             logger.info(f"Saved TF-IDF ML model to {self.model_path}")
         except Exception as exc:
             logger.error(f"Failed to save TF-IDF ML model: {exc}")
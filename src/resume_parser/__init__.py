@@ -7,7 +7,7 @@ from .pdf_parser import PDFParser
 from .docx_parser import DOCXParser
 from .text_extractor import TextExtractor
 from .nlp_processor import NLPProcessor
-from .models import Resume, WorkExperience, Education, ContactInfo
+from .models import Resume, WorkExperience, Education, ContactInfo, validate_contact_info
 
 __all__ = [
     'PDFParser',
@@ -17,5 +17,6 @@ __all__ = [
     'Resume',
     'WorkExperience',
     'Education',
-    'ContactInfo'
+    'ContactInfo',
+    'validate_contact_info'
 ]
@@ -2,20 +2,50 @@
 DOCX Parser для извлечения текста из Word документов
 """
 import logging
+import zipfile
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
-from docx import Document
+from typing import Optional, List, Dict, Any
+from lxml import etree
+from .text_cache import cached_extraction
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+W_NS = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
+# Текст параграфа: узлы w:t, табуляции и переносы строк (как paragraph.text в python-docx)
+_RUN_CONTENT = etree.XPath(".//w:r/w:t | .//w:r/w:tab | .//w:r/w:br | .//w:r/w:cr", namespaces=W_NS)
+_BODY_PARAGRAPHS = etree.XPath("/w:document/w:body/w:p", namespaces=W_NS)
+_BODY_TABLES = etree.XPath("/w:document/w:body/w:tbl", namespaces=W_NS)
+_TABLE_ROWS = etree.XPath("./w:tr", namespaces=W_NS)
+_ROW_CELLS = etree.XPath("./w:tc", namespaces=W_NS)
+_CELL_PARAGRAPHS = etree.XPath("./w:p", namespaces=W_NS)
+
+_W_T = f"{{{W_NS['w']}}}t"
+_W_TAB = f"{{{W_NS['w']}}}tab"
+
+CORE_NS = {
+    "cp": "http://schemas.openxmlformats.org/package/2006/metadata/core-properties",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "dcterms": "http://purl.org/dc/terms/",
+}
+# Ключ метаданных -> элемент docProps/core.xml
+_CORE_TEXT_PROPS = {'author': 'dc:creator', 'title': 'dc:title', 'subject': 'dc:subject'}
+_CORE_DATE_PROPS = {'created': 'dcterms:created', 'modified': 'dcterms:modified'}
+
 
 class DOCXParser:
     """Парсер для DOCX файлов"""
 
-    def __init__(self):
-        """Инициализация DOCX парсера"""
+    def __init__(self, cache_size: int = 128):
+        """
+        Инициализация DOCX парсера
+
+        Args:
+            cache_size: Сколько разобранных документов хранить (ключ - путь и mtime)
+        """
         self.supported_extensions = ['.docx', '.doc']
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse_file)
 
     def can_parse(self, file_path: str) -> bool:
         """
@@ -31,6 +61,7 @@ class DOCXParser:
         # .doc требует дополнительных библиотек, пока поддерживаем только .docx
         return ext == '.docx'
 
+    @cached_extraction("docx-text")
     def extract_text(self, file_path: str) -> Optional[str]:
         """
         Извлечение текста из DOCX файла
@@ -51,25 +82,7 @@ class DOCXParser:
                 logger.error(f"File not found: {file_path}")
                 return None
 
-            # Открываем документ
-            doc = Document(path)
-
-            # Извлекаем текст из параграфов
-            text_parts = []
-
-            # Параграфы
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
-
-            # Таблицы
-            for table in doc.tables:
-                table_text = self._extract_table_text(table)
-                if table_text:
-                    text_parts.append(table_text)
-
-            # Объединяем весь текст
-            full_text = "\n".join(text_parts)
+            full_text = self.parse(path)['text']
 
             if not full_text.strip():
                 logger.warning(f"No text extracted from {file_path}")
@@ -82,22 +95,102 @@ class DOCXParser:
             logger.error(f"Error parsing DOCX {file_path}: {e}")
             return None
 
+    def parse(self, file_path) -> Dict[str, Any]:
+        """
+        Разбор DOCX за одно открытие архива
+
+        Результат кэшируется по (путь, mtime), поэтому extract_text,
+        extract_paragraphs и get_metadata для одного файла читают его один раз.
+        Возвращаемый словарь общий для всех вызовов - не изменяйте его.
+
+        Args:
+            file_path: Путь к DOCX файлу
+
+        Returns:
+            Словарь с ключами text, paragraphs, tables, metadata
+        """
+        path = Path(file_path)
+        return self._parse_cached(str(path.resolve()), path.stat().st_mtime_ns)
+
+    def _parse_file(self, file_path: str, mtime_ns: int) -> Dict[str, Any]:
+        with zipfile.ZipFile(file_path) as archive:
+            with archive.open("word/document.xml") as xml_file:
+                root = etree.parse(xml_file).getroot()
+            core = None
+            if "docProps/core.xml" in archive.namelist():
+                with archive.open("docProps/core.xml") as xml_file:
+                    core = etree.parse(xml_file).getroot()
+
+        body_paragraphs = [self._paragraph_text(p) for p in _BODY_PARAGRAPHS(root)]
+        tables = [self._extract_table_text(t) for t in _BODY_TABLES(root)]
+
+        text_parts = [text for text in body_paragraphs if text.strip()]
+        text_parts.extend(text for text in tables if text)
+
+        metadata = {
+            'num_paragraphs': len(body_paragraphs),
+            'num_tables': len(tables),
+        }
+        metadata.update(self._core_properties(core))
+
+        return {
+            'text': "\n".join(text_parts),
+            'paragraphs': [text.strip() for text in body_paragraphs if text.strip()],
+            'tables': tables,
+            'metadata': metadata,
+        }
+
+    @staticmethod
+    def _core_properties(core) -> Dict[str, Any]:
+        """author/title/subject/created/modified из docProps/core.xml"""
+        props = {key: None for key in (*_CORE_TEXT_PROPS, *_CORE_DATE_PROPS)}
+        if core is None:
+            return props
+
+        for key, tag in _CORE_TEXT_PROPS.items():
+            element = core.find(tag, namespaces=CORE_NS)
+            props[key] = (element.text or '') if element is not None else ''
+
+        for key, tag in _CORE_DATE_PROPS.items():
+            element = core.find(tag, namespaces=CORE_NS)
+            if element is not None and element.text:
+                try:
+                    props[key] = datetime.fromisoformat(element.text.strip())
+                except ValueError:
+                    logger.debug(f"Unparsable {tag}: {element.text}")
+
+        return props
+
+    @staticmethod
+    def _paragraph_text(paragraph) -> str:
+        """Текст параграфа <w:p>"""
+        parts = []
+        for node in _RUN_CONTENT(paragraph):
+            if node.tag == _W_T:
+                parts.append(node.text or "")
+            elif node.tag == _W_TAB:
+                parts.append("\t")
+            else:
+                parts.append("\n")
+        return "".join(parts)
+
     def _extract_table_text(self, table) -> str:
         """
         Извлечение текста из таблицы
 
         Args:
-            table: Объект таблицы python-docx
+            table: Элемент <w:tbl>
 
         Returns:
             Текст из таблицы
         """
         table_text = []
-        for row in table.rows:
+        for row in _TABLE_ROWS(table):
             row_text = []
-            for cell in row.cells:
-                if cell.text.strip():
-                    row_text.append(cell.text.strip())
+            for cell in _ROW_CELLS(row):
+                cell_text = "\n".join(self._paragraph_text(p) for p in _CELL_PARAGRAPHS(cell)).strip()
+                if cell_text:
+                    row_text.append(cell_text)
             if row_text:
                 table_text.append(" | ".join(row_text))
 
@@ -113,18 +206,11 @@ class DOCXParser:
         Returns:
             Список параграфов
         """
-        paragraphs = []
-
         try:
-            doc = Document(file_path)
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    paragraphs.append(paragraph.text.strip())
-
+            return list(self.parse(file_path)['paragraphs'])
         except Exception as e:
             logger.error(f"Error extracting paragraphs: {e}")
-
-        return paragraphs
+            return []
 
     def get_metadata(self, file_path: str) -> dict:
         """
@@ -147,21 +233,7 @@ class DOCXParser:
         }
 
         try:
-            doc = Document(file_path)
-
-            metadata['num_paragraphs'] = len(doc.paragraphs)
-            metadata['num_tables'] = len(doc.tables)
-
-            # Core properties
-            if doc.core_properties:
-                metadata.update({
-                    'author': doc.core_properties.author,
-                    'title': doc.core_properties.title,
-                    'subject': doc.core_properties.subject,
-                    'created': doc.core_properties.created,
-                    'modified': doc.core_properties.modified
-                })
-
+            metadata.update(self.parse(file_path)['metadata'])
         except Exception as e:
             logger.error(f"Error getting DOCX metadata: {e}")
 
@@ -1,21 +1,49 @@
 """
 Data models for resume parsing
 """
-from typing import List, Optional
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+logger = logging.getLogger(__name__)
 
 
 class ContactInfo(BaseModel):
     """Контактная информация кандидата"""
     name: Optional[str] = None
-    email: Optional[EmailStr] = None
+    # Проверяется один раз в конце разбора (validate_contact_info), а не при каждом создании модели
+    email: Optional[str] = None
     phone: Optional[str] = None
     location: Optional[str] = None
     linkedin: Optional[str] = None
     github: Optional[str] = None
 
 
+def validate_contact_info(contact_info: ContactInfo) -> ContactInfo:
+    """
+    Проверка и нормализация email контакта (in place)
+
+    Вызывается один раз в конце пайплайна разбора резюме. email-validator
+    импортируется лениво, только при первой проверке; если он не установлен,
+    email остается как есть. Невалидный email сбрасывается в None.
+    """
+    if not contact_info.email:
+        return contact_info
+
+    try:
+        from email_validator import validate_email, EmailNotValidError
+    except ImportError:
+        return contact_info
+
+    try:
+        contact_info.email = validate_email(contact_info.email, check_deliverability=False).normalized
+    except EmailNotValidError:
+        logger.debug(f"Dropping invalid email: {contact_info.email}")
+        contact_info.email = None
+    return contact_info
+
+
 class WorkExperience(BaseModel):
     """Опыт работы"""
     position: Optional[str] = None
@@ -39,12 +67,22 @@ class Education(BaseModel):
 class Resume(BaseModel):
     """Полная модель резюме"""
 
+    # Присваивания не валидируются: модель проверяется при создании, дальше
+    # используется в горячем пути matching
+    model_config = ConfigDict(
+        validate_assignment=False,
+        extra="ignore",
+        json_encoders={datetime: lambda v: v.isoformat()},
+    )
+
     # Метаданные файла
     file_path: str
     file_name: str
     file_type: str  # pdf, docx, etc.
     parsed_at: datetime = Field(default_factory=datetime.now)
     language: Optional[str] = "en"
+    # Метаданные документа (для PDF: num_pages, author, title, ...)
+    document_metadata: Dict[str, Any] = Field(default_factory=dict)
 
     # Контактная информация
     contact_info: ContactInfo = Field(default_factory=ContactInfo)
@@ -69,10 +107,26 @@ class Resume(BaseModel):
     parsing_errors: List[str] = Field(default_factory=list)
     is_valid: bool = True
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    # Нормализованные представления, общие для всех матчеров (см. lowered_text/skills_lower)
+    _lowered_text: Optional[Tuple[str, str]] = PrivateAttr(default=None)
+    _skills_lower: Optional[Tuple[Tuple[str, ...], FrozenSet[str]]] = PrivateAttr(default=None)
+
+    def lowered_text(self) -> str:
+        """raw_text в нижнем регистре; считается один раз, пока raw_text не заменен"""
+        cached = self._lowered_text
+        if cached is None or cached[0] is not self.raw_text:
+            cached = (self.raw_text, self.raw_text.lower())
+            self._lowered_text = cached
+        return cached[1]
+
+    def skills_lower(self) -> FrozenSet[str]:
+        """Навыки в нижнем регистре; пересчитываются только при изменении skills"""
+        key = tuple(self.skills)
+        cached = self._skills_lower
+        if cached is None or cached[0] != key:
+            cached = (key, frozenset(s.lower() for s in key))
+            self._skills_lower = cached
+        return cached[1]
 
     def to_dict(self):
         """Конвертация в словарь"""
@@ -81,3 +135,7 @@ class Resume(BaseModel):
     def to_json(self):
         """Конвертация в JSON"""
         return self.model_dump_json(indent=2)
+
+    def to_json_bytes(self) -> bytes:
+        """Конвертация в JSON сразу в UTF-8 байты (для записи в файл без перекодирования)"""
+        return self.__pydantic_serializer__.to_json(self, indent=2)
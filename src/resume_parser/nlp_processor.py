@@ -7,15 +7,16 @@ NLP Processor для продвинутой обработки текста ре
 - NLTK для токенизации
 """
 import logging
+import os
 import re
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union, Iterable
 from collections import Counter
+import numpy as np
 import warnings
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Опциональные импорты NLP библиотек
@@ -42,20 +43,128 @@ except ImportError:
     NLTK_AVAILABLE = False
     logger.warning("NLTK not installed. Advanced tokenization will be limited.")
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    logger.warning("pyahocorasick not installed. Skill search will use a combined regex.")
+
+
+# Регулярные выражения fallback-путей компилируются один раз
+_DATE_RE = re.compile(
+    r'\b\d{4}\b|\b\d{1,2}/\d{1,2}/\d{2,4}\b|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}\b',
+    re.IGNORECASE
+)
+_WORD_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+_TOKEN_RE = re.compile(r'\b\w+\b')
+# Возможное начало навыка: непробельный символ, перед которым нет символа слова
+_SKILL_START_RE = re.compile(r'(?<!\w)\S')
+
+# Загруженные spaCy модели: (язык, исключенные компоненты) -> Language
+_SPACY_MODELS: Dict[Tuple[str, Tuple[str, ...]], "Language"] = {}
+# nltk.download уже отработал в этом процессе
+_NLTK_READY = False
+# Результат spacy.prefer_gpu(); None - еще не вызывался
+_SPACY_GPU: Optional[bool] = None
+
+
+def spacy_gpu_enabled() -> bool:
+    """
+    Переключить spaCy на GPU, если он доступен (один раз на процесс)
+
+    spacy.prefer_gpu() включает GPU только при наличии CUDA и cupy,
+    иначе модели остаются на CPU. Вызывается до первого spacy.load.
+    """
+    global _SPACY_GPU
+    if _SPACY_GPU is None:
+        _SPACY_GPU = False
+        if SPACY_AVAILABLE:
+            try:
+                _SPACY_GPU = bool(spacy.prefer_gpu())
+            except Exception as e:
+                logger.debug(f"spaCy GPU not available: {e}")
+        if _SPACY_GPU:
+            logger.info("spaCy is using GPU")
+    return _SPACY_GPU
+
+
+def _is_word_char(ch: str) -> bool:
+    """Символ слова в смысле regex \\w"""
+    return ch.isalnum() or ch == '_'
+
 
 class NLPProcessor:
     """
     NLP процессор для извлечения информации из текста резюме
     """
 
-    def __init__(self, language: str = 'en'):
+    # Расширенный словарь IT навыков
+    SKILL_PATTERNS = {
+        # Programming Languages
+        'languages': [
+            'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust',
+            'PHP', 'Ruby', 'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'Perl'
+        ],
+        # Frameworks
+        'frameworks': [
+            'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'FastAPI',
+            'Spring', 'Express', 'Laravel', 'Rails', 'ASP.NET', 'Next.js', 'Nuxt'
+        ],
+        # Databases
+        'databases': [
+            'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
+            'Oracle', 'Cassandra', 'DynamoDB', 'SQLite', 'MariaDB'
+        ],
+        # DevOps & Cloud
+        'devops': [
+            'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Jenkins', 'GitLab CI',
+            'GitHub Actions', 'Terraform', 'Ansible', 'CI/CD', 'Linux'
+        ],
+        # ML/AI
+        'ml_ai': [
+            'Machine Learning', 'Deep Learning', 'NLP', 'Computer Vision',
+            'TensorFlow', 'PyTorch', 'scikit-learn', 'Keras', 'Pandas', 'NumPy'
+        ],
+        # Other
+        'other': [
+            'Git', 'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum',
+            'JIRA', 'Confluence', 'HTML', 'CSS', 'Sass', 'Webpack'
+        ]
+    }
+
+    # Общий для всех экземпляров поисковик навыков, строится при первом вызове
+    _skill_searcher = None
+
+    ENTITY_CATEGORIES = ('persons', 'organizations', 'locations', 'dates', 'skills', 'other')
+    # Метка spaCy -> категория; все прочие метки попадают в 'other'
+    ENTITY_LABELS = {
+        'PERSON': 'persons', 'PER': 'persons',
+        'ORG': 'organizations', 'ORGANIZATION': 'organizations',
+        'GPE': 'locations', 'LOC': 'locations', 'LOCATION': 'locations',
+        'DATE': 'dates', 'TIME': 'dates',
+    }
+
+    # Компоненты spaCy, необходимые для каждой задачи (en_core_web_sm / ru_core_news_sm)
+    TASK_COMPONENTS = {
+        'ner': {'tok2vec', 'ner'},
+        'noun_chunks': {'tok2vec', 'tagger', 'attribute_ruler', 'morphologizer', 'parser'},
+    }
+    # Все компоненты стандартных sm-моделей
+    MODEL_COMPONENTS = ('tok2vec', 'tagger', 'morphologizer', 'parser', 'senter',
+                        'attribute_ruler', 'lemmatizer', 'ner')
+
+    def __init__(self, language: str = 'en', tasks: Tuple[str, ...] = ('ner', 'noun_chunks')):
         """
         Инициализация NLP процессора
 
         Args:
             language: Язык текста ('en' или 'ru')
+            tasks: Нужные задачи spaCy ('ner', 'noun_chunks'); компоненты модели,
+                не нужные ни одной из них, не загружаются
         """
         self.language = language
+        self.tasks = tuple(tasks)
         self.nlp = None
 
         # Загрузка spaCy модели
@@ -66,20 +175,36 @@ class NLPProcessor:
         if NLTK_AVAILABLE:
             self._init_nltk()
 
+    def _excluded_components(self) -> List[str]:
+        """Компоненты модели, не используемые выбранными задачами"""
+        needed = set()
+        for task in self.tasks:
+            needed |= self.TASK_COMPONENTS.get(task, set())
+        return [name for name in self.MODEL_COMPONENTS if name not in needed]
+
     def _load_spacy_model(self):
-        """Загрузка spaCy модели"""
+        """Загрузка spaCy модели (одна на язык и набор компонентов для всех экземпляров)"""
+        exclude = self._excluded_components()
+        key = (self.language, tuple(exclude))
+        if key in _SPACY_MODELS:
+            self.nlp = _SPACY_MODELS[key]
+            return
+
+        # GPU должен быть выбран до загрузки модели
+        spacy_gpu_enabled()
+
         try:
             if self.language == 'en':
                 # Попытка загрузить английскую модель
                 try:
-                    self.nlp = spacy.load("en_core_web_sm")
+                    self.nlp = spacy.load("en_core_web_sm", exclude=exclude)
                     logger.info("Loaded spaCy model: en_core_web_sm")
                 except OSError:
                     logger.warning("spaCy model 'en_core_web_sm' not found. Using blank English model.")
                     self.nlp = English()
             elif self.language == 'ru':
                 try:
-                    self.nlp = spacy.load("ru_core_news_sm")
+                    self.nlp = spacy.load("ru_core_news_sm", exclude=exclude)
                     logger.info("Loaded spaCy model: ru_core_news_sm")
                 except OSError:
                     logger.warning("spaCy model 'ru_core_news_sm' not found. Using blank Russian model.")
@@ -88,69 +213,116 @@ class NLPProcessor:
                 logger.warning(f"Unsupported language: {self.language}. Using English.")
                 self.nlp = English()
 
+            _SPACY_MODELS[key] = self.nlp
+
         except Exception as e:
             logger.error(f"Error loading spaCy model: {e}")
             self.nlp = None
 
     def _init_nltk(self):
-        """Инициализация NLTK данных"""
+        """Инициализация NLTK данных (один раз на процесс)"""
+        global _NLTK_READY
+        if _NLTK_READY:
+            return
+
         try:
             # Загружаем необходимые данные NLTK
             nltk.download('punkt', quiet=True)
             nltk.download('stopwords', quiet=True)
             nltk.download('averaged_perceptron_tagger', quiet=True)
+            _NLTK_READY = True
             logger.info("NLTK data initialized")
         except Exception as e:
             logger.error(f"Error initializing NLTK: {e}")
 
-    def extract_entities(self, text: str) -> Dict[str, List[str]]:
+    def extract_entities(
+        self, text: Union[str, List[str]]
+    ) -> Union[Dict[str, List[str]], List[Dict[str, List[str]]]]:
         """
         Извлечение именованных сущностей (NER)
 
         Args:
-            text: Текст для анализа
+            text: Текст для анализа или список текстов (тогда используется
+                extract_entities_batch)
+
+        Returns:
+            Словарь с категориями сущностей (список словарей для списка текстов)
+        """
+        if isinstance(text, list):
+            return self.extract_entities_batch(text)
+        return self.extract_entities_batch([text])[0]
+
+    # Минимальное число документов на процесс, при котором n_process > 1 окупает запуск воркеров
+    MIN_DOCS_PER_PROCESS = 256
+
+    def extract_entities_batch(
+        self, texts: List[str], batch_size: int = 64, n_process: Optional[int] = None
+    ) -> List[Dict[str, List[str]]]:
+        """
+        Пакетное извлечение сущностей через nlp.pipe
+
+        Args:
+            texts: Список текстов
+            batch_size: Размер батча spaCy
+            n_process: Число процессов spaCy; None - выбрать автоматически
+                (половина ядер для больших корпусов, иначе 1)
 
         Returns:
-            Словарь с категориями сущностей
+            Словари сущностей в порядке входных текстов
         """
         if not SPACY_AVAILABLE or not self.nlp:
             logger.warning("spaCy not available. Using fallback entity extraction.")
-            return self._fallback_entity_extraction(text)
+            return [self._fallback_entity_extraction(text) for text in texts]
 
         try:
-            doc = self.nlp(text[:100000])  # Ограничиваем длину для производительности
-
-            entities = {
-                'persons': [],
-                'organizations': [],
-                'locations': [],
-                'dates': [],
-                'skills': [],
-                'other': []
-            }
-
-            for ent in doc.ents:
-                if ent.label_ in ['PERSON', 'PER']:
-                    entities['persons'].append(ent.text)
-                elif ent.label_ in ['ORG', 'ORGANIZATION']:
-                    entities['organizations'].append(ent.text)
-                elif ent.label_ in ['GPE', 'LOC', 'LOCATION']:
-                    entities['locations'].append(ent.text)
-                elif ent.label_ in ['DATE', 'TIME']:
-                    entities['dates'].append(ent.text)
-                else:
-                    entities['other'].append(ent.text)
-
-            # Удаляем дубликаты
-            for key in entities:
-                entities[key] = list(set(entities[key]))
-
-            logger.info(f"Extracted {sum(len(v) for v in entities.values())} entities")
-            return entities
+            # Ограничиваем длину для производительности, работает только NER
+            docs = self.nlp.pipe(
+                (text[:100000] for text in texts),
+                batch_size=batch_size,
+                disable=self._disabled_pipes("ner"),
+                n_process=self._resolve_n_process(n_process, len(texts)),
+            )
+            results = [self._entities_from_doc(doc) for doc in docs]
+
+            logger.info(f"Extracted {sum(sum(len(v) for v in r.values()) for r in results)} entities "
+                        f"from {len(results)} documents")
+            return results
 
         except Exception as e:
             logger.error(f"Error in entity extraction: {e}")
-            return self._fallback_entity_extraction(text)
+            return [self._fallback_entity_extraction(text) for text in texts]
+
+    def _resolve_n_process(self, n_process: Optional[int], n_docs: int) -> int:
+        """Число процессов для nlp.pipe: маленькие батчи не стоят запуска воркеров"""
+        if _SPACY_GPU:
+            # Модель на GPU: дочерние процессы не могут разделять контекст CUDA
+            return 1
+        if n_process is not None:
+            return max(1, n_process)
+        workers = max(1, (os.cpu_count() or 1) // 2)
+        return max(1, min(workers, n_docs // self.MIN_DOCS_PER_PROCESS))
+
+    def _disabled_pipes(self, *needed: str) -> List[str]:
+        """
+        Компоненты пайплайна, кроме нужных, для аргумента disable у nlp.pipe
+
+        Модель общая для всех экземпляров и потоков (_SPACY_MODELS), поэтому
+        компоненты отключаются на время вызова, а не через select_pipes,
+        который меняет сам пайплайн. tok2vec оставляется всегда: от него
+        зависят остальные компоненты.
+        """
+        keep = set(needed) | {'tok2vec'}
+        return [name for name in self.nlp.pipe_names if name not in keep]
+
+    @classmethod
+    def _entities_from_doc(cls, doc) -> Dict[str, List[str]]:
+        """Разложить doc.ents по категориям без дубликатов"""
+        entities = {key: set() for key in cls.ENTITY_CATEGORIES}
+
+        for ent in doc.ents:
+            entities[cls.ENTITY_LABELS.get(ent.label_, 'other')].add(ent.text)
+
+        return {key: list(values) for key, values in entities.items()}
 
     def _fallback_entity_extraction(self, text: str) -> Dict[str, List[str]]:
         """Fallback метод извлечения сущностей без spaCy"""
@@ -164,8 +336,7 @@ class NLPProcessor:
         }
 
         # Простое извлечение дат
-        date_pattern = r'\b\d{4}\b|\b\d{1,2}/\d{1,2}/\d{2,4}\b|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}\b'
-        dates = re.findall(date_pattern, text, re.IGNORECASE)
+        dates = _DATE_RE.findall(text)
         entities['dates'] = list(set(dates))
 
         return entities
@@ -187,9 +358,50 @@ class NLPProcessor:
         Returns:
             Список кортежей (слово, score)
         """
+        return self._keywords_tfidf(texts or [""], top_n, max_features, max_df=0.8)[0]
+
+    def extract_keywords_tfidf_batch(
+        self,
+        texts: List[str],
+        top_n: int = 20,
+        max_features: int = 100,
+        max_df: float = 1.0
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Ключевые слова TF-IDF для каждого текста с одним обучением векторизатора
+
+        IDF считается по всему батчу, поэтому score отличаются от вызовов
+        extract_keywords_tfidf по одному тексту: слова, общие для многих
+        текстов, получают меньший вес. Чтобы такие слова (например, "python"
+        во всех резюме) не выпадали совсем, max_df по умолчанию не ограничен,
+        а словарь растет вместе с батчем.
+
+        Args:
+            texts: Список текстов
+            top_n: Количество топ ключевых слов на текст
+            max_features: Максимальное количество признаков на один текст
+                (словарь батча ограничен max_features * len(texts))
+            max_df: Слова, встречающиеся в большей доле текстов, отбрасываются
+
+        Returns:
+            Списки кортежей (слово, score) в порядке входных текстов
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        return self._keywords_tfidf(texts, top_n, max_features * len(texts), max_df)
+
+    def _keywords_tfidf(
+        self,
+        texts: List[str],
+        top_n: int,
+        max_features: int,
+        max_df: float
+    ) -> List[List[Tuple[str, float]]]:
+        """Топ слов TF-IDF каждого текста; texts не пустой"""
         if not SKLEARN_AVAILABLE:
             logger.warning("scikit-learn not available. Using simple keyword extraction.")
-            return self._simple_keyword_extraction(texts[0] if texts else "", top_n)
+            return [self._simple_keyword_extraction(text, top_n) for text in texts]
 
         try:
             # TF-IDF векторизация
@@ -198,35 +410,35 @@ class NLPProcessor:
                 stop_words='english' if self.language == 'en' else None,
                 ngram_range=(1, 2),  # Uni and bigrams
                 min_df=1,
-                max_df=0.8
+                max_df=max_df
             )
 
             # Если только один текст, добавляем пустой для работы TF-IDF
-            if len(texts) == 1:
-                texts = texts + [""]
-
-            tfidf_matrix = vectorizer.fit_transform(texts)
-
-            # Получаем feature names и scores
+            corpus = texts + [""] if len(texts) == 1 else texts
+            tfidf_matrix = vectorizer.fit_transform(corpus).tocsr()
+            tfidf_matrix.sort_indices()
             feature_names = vectorizer.get_feature_names_out()
-            scores = tfidf_matrix[0].toarray()[0]
-
-            # Создаем список (слово, score)
-            word_scores = list(zip(feature_names, scores))
 
-            # Сортируем по score
-            word_scores.sort(key=lambda x: x[1], reverse=True)
+            # Топ слов каждой строки берем из ее разреженного среза, без toarray()
+            results = []
+            for row in range(len(texts)):
+                start, end = tfidf_matrix.indptr[row], tfidf_matrix.indptr[row + 1]
+                scores = tfidf_matrix.data[start:end]
+                # Стабильная сортировка: при равных score порядок алфавитный
+                top = np.argsort(-scores, kind="stable")[:top_n]
+                columns = tfidf_matrix.indices[start:end][top]
+                results.append([(feature_names[c], float(score)) for c, score in zip(columns, scores[top])])
 
-            logger.info(f"Extracted {len(word_scores[:top_n])} keywords using TF-IDF")
-            return word_scores[:top_n]
+            logger.info(f"Extracted TF-IDF keywords for {len(results)} texts")
+            return results
 
         except Exception as e:
             logger.error(f"Error in TF-IDF extraction: {e}")
-            return self._simple_keyword_extraction(texts[0] if texts else "", top_n)
+            return [self._simple_keyword_extraction(text, top_n) for text in texts]
 
     def _simple_keyword_extraction(self, text: str, top_n: int) -> List[Tuple[str, float]]:
         """Простое извлечение ключевых слов по частоте"""
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
+        words = _WORD_RE.findall(text.lower())
 
         # Стоп-слова
         stop_words = {
@@ -249,67 +461,106 @@ class NLPProcessor:
         Returns:
             Список навыков
         """
-        skills = set()
+        return self.extract_skills_nlp_batch([text])[0]
 
-        # Расширенный словарь IT навыков
-        skill_patterns = {
-            # Programming Languages
-            'languages': [
-                'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust',
-                'PHP', 'Ruby', 'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'Perl'
-            ],
-            # Frameworks
-            'frameworks': [
-                'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'FastAPI',
-                'Spring', 'Express', 'Laravel', 'Rails', 'ASP.NET', 'Next.js', 'Nuxt'
-            ],
-            # Databases
-            'databases': [
-                'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
-                'Oracle', 'Cassandra', 'DynamoDB', 'SQLite', 'MariaDB'
-            ],
-            # DevOps & Cloud
-            'devops': [
-                'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Jenkins', 'GitLab CI',
-                'GitHub Actions', 'Terraform', 'Ansible', 'CI/CD', 'Linux'
-            ],
-            # ML/AI
-            'ml_ai': [
-                'Machine Learning', 'Deep Learning', 'NLP', 'Computer Vision',
-                'TensorFlow', 'PyTorch', 'scikit-learn', 'Keras', 'Pandas', 'NumPy'
-            ],
-            # Other
-            'other': [
-                'Git', 'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum',
-                'JIRA', 'Confluence', 'HTML', 'CSS', 'Sass', 'Webpack'
-            ]
-        }
+    def extract_skills_nlp_batch(
+        self, texts: Iterable[str], batch_size: int = 8, n_process: Optional[int] = None
+    ) -> List[List[str]]:
+        """
+        Пакетное извлечение навыков: словарь навыков + именные группы через nlp.pipe
+
+        Args:
+            texts: Тексты резюме
+            batch_size: Размер батча spaCy
+            n_process: Число процессов spaCy; None - выбрать автоматически
 
-        # Поиск по всем категориям
-        text_lower = text.lower()
-        for category, skill_list in skill_patterns.items():
-            for skill in skill_list:
-                # Поиск с учетом границ слов
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    skills.add(skill)
-
-        # Если доступен spaCy, используем NER для дополнительных навыков
-        if SPACY_AVAILABLE and self.nlp:
+        Returns:
+            Списки навыков в порядке входных текстов
+        """
+        texts = list(texts)
+        # Поиск всех навыков из словаря за один проход по каждому тексту
+        skill_sets = [self._find_dictionary_skills(text.lower()) for text in texts]
+
+        # Если доступен spaCy, ищем существительные и сочетания как потенциальные навыки
+        if SPACY_AVAILABLE and self.nlp and texts:
             try:
-                doc = self.nlp(text[:50000])
-                # Ищем существительные и сочетания как потенциальные навыки
-                for chunk in doc.noun_chunks:
-                    chunk_text = chunk.text.strip()
-                    # Фильтруем по длине и наличию технических терминов
-                    if 2 <= len(chunk_text.split()) <= 4 and len(chunk_text) < 50:
-                        # Простая эвристика: содержит заглавные буквы или цифры
-                        if any(c.isupper() or c.isdigit() for c in chunk_text):
-                            skills.add(chunk_text)
+                docs = self.nlp.pipe(
+                    (text[:50000] for text in texts),
+                    batch_size=batch_size,
+                    disable=self._disabled_pipes('tagger', 'attribute_ruler', 'morphologizer', 'parser'),
+                    n_process=self._resolve_n_process(n_process, len(texts)),
+                )
+                for skills, doc in zip(skill_sets, docs):
+                    skills.update(self._noun_chunk_skills(doc))
             except Exception as e:
                 logger.debug(f"Error in NER skill extraction: {e}")
 
-        return sorted(list(skills))
+        return [sorted(skills) for skills in skill_sets]
+
+    @staticmethod
+    def _noun_chunk_skills(doc) -> set:
+        """Именные группы, похожие на технические термины"""
+        skills = set()
+        for chunk in doc.noun_chunks:
+            chunk_text = chunk.text.strip()
+            # Фильтруем по длине и наличию технических терминов
+            if 2 <= len(chunk_text.split()) <= 4 and len(chunk_text) < 50:
+                # Простая эвристика: содержит заглавные буквы или цифры
+                if any(c.isupper() or c.isdigit() for c in chunk_text):
+                    skills.add(chunk_text)
+        return skills
+
+    @classmethod
+    def _get_skill_searcher(cls):
+        """
+        Aho-Corasick автомат (или плоский frozenset) по всему словарю навыков
+
+        Returns:
+            ('automaton', Automaton) или ('vocabulary', (frozenset, {lower: skill}, длины))
+        """
+        if cls._skill_searcher is None:
+            skills = [skill for skill_list in cls.SKILL_PATTERNS.values() for skill in skill_list]
+            if AHOCORASICK_AVAILABLE:
+                automaton = ahocorasick.Automaton()
+                for skill in skills:
+                    automaton.add_word(skill.lower(), skill)
+                automaton.make_automaton()
+                cls._skill_searcher = ('automaton', automaton)
+            else:
+                by_lower = {skill.lower(): skill for skill in skills}
+                lengths = tuple(sorted({len(s) for s in by_lower}))
+                cls._skill_searcher = ('vocabulary', (frozenset(by_lower), by_lower, lengths))
+        return cls._skill_searcher
+
+    def _find_dictionary_skills(self, text_lower: str) -> set:
+        """Навыки из SKILL_PATTERNS, встречающиеся в тексте как отдельные слова"""
+        kind, searcher = self._get_skill_searcher()
+        found = set()
+        n = len(text_lower)
+
+        if kind == 'automaton':
+            for end, skill in searcher.iter(text_lower):
+                start = end - len(skill) + 1
+                if start > 0 and _is_word_char(text_lower[start - 1]):
+                    continue
+                if end + 1 < n and _is_word_char(text_lower[end + 1]):
+                    continue
+                found.add(skill)
+        else:
+            # С каждой границы слова проверяем подстроки всех длин из словаря:
+            # O(1) поиск в frozenset вместо прохода regex по тексту на каждый навык
+            known, by_lower, lengths = searcher
+            for match in _SKILL_START_RE.finditer(text_lower):
+                start = match.start()
+                for length in lengths:
+                    end = start + length
+                    if end > n:
+                        break
+                    candidate = text_lower[start:end]
+                    if candidate in known and not (end < n and _is_word_char(text_lower[end])):
+                        found.add(by_lower[candidate])
+
+        return found
 
     def tokenize(self, text: str) -> List[str]:
         """
@@ -331,7 +582,7 @@ class NLPProcessor:
                 logger.debug(f"NLTK tokenization failed: {e}")
 
         # Fallback: простая токенизация
-        tokens = re.findall(r'\b\w+\b', text.lower())
+        tokens = _TOKEN_RE.findall(text.lower())
         return tokens
 
     def get_pos_tags(self, text: str) -> List[Tuple[str, str]]:
@@ -366,14 +617,33 @@ class NLPProcessor:
         Returns:
             Список именных групп
         """
+        return self.extract_noun_phrases_batch([text])[0]
+
+    def extract_noun_phrases_batch(self, texts: Iterable[str], batch_size: int = 32) -> List[List[str]]:
+        """
+        Пакетное извлечение именных групп через nlp.pipe
+
+        Args:
+            texts: Тексты для анализа
+            batch_size: Размер батча spaCy
+
+        Returns:
+            Списки именных групп в порядке входных текстов
+        """
+        texts = list(texts)
         if not SPACY_AVAILABLE or not self.nlp:
-            return []
+            return [[] for _ in texts]
 
         try:
-            doc = self.nlp(text[:50000])
-            noun_phrases = [chunk.text for chunk in doc.noun_chunks]
-            logger.debug(f"Extracted {len(noun_phrases)} noun phrases")
+            # noun_chunks нужны тэги и синтаксический разбор, NER и лемматизация - нет
+            docs = self.nlp.pipe(
+                (text[:50000] for text in texts),
+                batch_size=batch_size,
+                disable=self._disabled_pipes('tagger', 'attribute_ruler', 'morphologizer', 'parser'),
+            )
+            noun_phrases = [[chunk.text for chunk in doc.noun_chunks] for doc in docs]
+            logger.debug(f"Extracted {sum(len(p) for p in noun_phrases)} noun phrases")
             return noun_phrases
         except Exception as e:
             logger.error(f"Error extracting noun phrases: {e}")
-            return []
+            return [[] for _ in texts]
@@ -1,18 +1,229 @@
 """
 PDF Parser для извлечения текста из PDF файлов
 """
+import json
 import logging
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Optional
-from PyPDF2 import PdfReader
+from typing import Optional, List, Iterator, Tuple, Dict, Any, Callable, NamedTuple
+from pypdf import PdfReader
+from .text_cache import cached_extraction
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# PyMuPDF (C-библиотека MuPDF) - основной движок; pypdf - запасной путь
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF < 1.24.3
+        PYMUPDF_AVAILABLE = True
+    except ImportError:
+        PYMUPDF_AVAILABLE = False
+        logger.warning("PyMuPDF not installed. PDF parsing will use pypdf.")
+
+
+class ExtractionLimits(NamedTuple):
+    """Бюджет извлечения одного документа"""
+    max_page_chars: int    # текст страницы длиннее обрезается
+    max_text_chars: int    # после стольких символов остальные страницы пропускаются
+    max_seconds: float     # после стольких секунд остальные страницы пропускаются
+
+
+def _collect_pages(get_page: Callable[[int], str], start: int, end: int,
+                   limits: ExtractionLimits) -> List[str]:
+    """
+    Тексты страниц [start, end) с учетом бюджета
+
+    Страница, уже начатая, не прерывается: бюджет проверяется между страницами.
+    """
+    debug = logger.isEnabledFor(logging.DEBUG)
+    deadline = time.monotonic() + limits.max_seconds
+    text_parts = [""] * (end - start)
+    total_chars = 0
+    for i in range(start, end):
+        if total_chars >= limits.max_text_chars:
+            logger.warning("PDF text exceeds %d chars, skipping pages %d-%d", limits.max_text_chars, i + 1, end)
+            break
+        if time.monotonic() > deadline:
+            logger.warning("PDF extraction exceeded %.0fs, skipping pages %d-%d", limits.max_seconds, i + 1, end)
+            break
+        page_text = get_page(i) or ""
+        if len(page_text) > limits.max_page_chars:
+            logger.warning("Page %d has %d chars, truncated to %d", i + 1, len(page_text), limits.max_page_chars)
+            page_text = page_text[:limits.max_page_chars]
+        text_parts[i - start] = page_text
+        total_chars += len(page_text)
+        if debug:
+            logger.debug("Extracted %d chars from page %d", len(page_text), i + 1)
+    return text_parts
+
+
+def _pymupdf_page_texts(doc, start: int, end: int, limits: ExtractionLimits) -> List[str]:
+    """Тексты страниц [start, end) открытого документа PyMuPDF"""
+    return _collect_pages(lambda i: doc[i].get_text("text"), start, end, limits)
+
+
+def _pypdf_page_texts(pdf_reader, start: int, end: int, limits: ExtractionLimits) -> List[str]:
+    """Тексты страниц [start, end) открытого PdfReader; нечитаемые - ''"""
+    def get_page(i: int) -> str:
+        try:
+            return pdf_reader.pages[i].extract_text()
+        except Exception as e:
+            logger.warning("Error extracting page %d: %s", i + 1, e)
+            return ""
+
+    return _collect_pages(get_page, start, end, limits)
+
+
+def _empty_metadata() -> Dict[str, Any]:
+    return {
+        'num_pages': 0,
+        'author': None,
+        'title': None,
+        'subject': None,
+        'creator': None,
+        'producer': None,
+        'creation_date': None
+    }
+
+
+def _pymupdf_metadata(doc) -> Dict[str, Any]:
+    """Метаданные открытого документа PyMuPDF"""
+    metadata = _empty_metadata()
+    metadata['num_pages'] = doc.page_count
+    info = doc.metadata or {}
+    metadata.update({
+        'author': info.get('author') or None,
+        'title': info.get('title') or None,
+        'subject': info.get('subject') or None,
+        'creator': info.get('creator') or None,
+        'producer': info.get('producer') or None,
+        'creation_date': info.get('creationDate') or None
+    })
+    return metadata
+
+
+def _pypdf_metadata(pdf_reader) -> Dict[str, Any]:
+    """Метаданные открытого PdfReader (словарь Info из trailer)"""
+    metadata = _empty_metadata()
+    metadata['num_pages'] = len(pdf_reader.pages)
+    info = pdf_reader.metadata
+    if info:
+        for key, name in (('author', '/Author'), ('title', '/Title'), ('subject', '/Subject'),
+                          ('creator', '/Creator'), ('producer', '/Producer'),
+                          ('creation_date', '/CreationDate')):
+            value = info.get(name)
+            metadata[key] = str(value) if value is not None else None
+    return metadata
+
+
+def _dump_extraction(result: Tuple[str, Dict[str, Any]]) -> str:
+    text, metadata = result
+    return json.dumps({'text': text, 'metadata': metadata}, ensure_ascii=False)
+
+
+def _load_extraction(stored: str) -> Tuple[str, Dict[str, Any]]:
+    data = json.loads(stored)
+    return data['text'], data['metadata']
+
+
+def _extract_page_range(path: str, start: int, end: int, engine: str,
+                        limits: ExtractionLimits) -> List[str]:
+    """Воркер пула процессов: открывает PDF и извлекает страницы [start, end)"""
+    if engine == "pymupdf":
+        with pymupdf.open(path) as doc:
+            return _pymupdf_page_texts(doc, start, end, limits)
+    with open(path, 'rb') as file:
+        return _pypdf_page_texts(PdfReader(file), start, end, limits)
+
+
+# Общий пул для длинных PDF: создается при первом обращении и используется всеми
+# потоками (API, parse_resumes_bulk), вместо отдельного пула на каждый файл
+MAX_POOL_WORKERS = 4
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+# Пулы, выведенные из работы из-за зависших задач: пул -> число зависших задач
+_RETIRED: Dict[ProcessPoolExecutor, int] = {}
+
+
+def _pool_workers() -> int:
+    return max(1, min(MAX_POOL_WORKERS, os.cpu_count() or 1))
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=_pool_workers())
+        return _POOL
+
+
+def _discard_pool(ex: ProcessPoolExecutor):
+    """Убрать сломанный пул; следующий вызов создаст новый"""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is ex:
+            _POOL = None
+    ex.shutdown(wait=False, cancel_futures=True)
+
+
+def _retire_pool(ex: ProcessPoolExecutor, stuck: int):
+    """
+    Вывести из работы пул с зависшими задачами, не прерывая задачи других файлов
+
+    Новые вызовы получают новый пул; воркеры старого останавливаются, когда
+    в нем не остается других незавершенных задач, кроме зависших.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is ex:
+            _POOL = None
+        first = ex not in _RETIRED
+        _RETIRED[ex] = _RETIRED.get(ex, 0) + stuck
+    if first:
+        # shutdown() сбрасывает ссылки пула на процессы, поэтому берем их заранее
+        processes = list((getattr(ex, "_processes", None) or {}).values())
+        pending = getattr(ex, "_pending_work_items", None) or {}
+        ex.shutdown(wait=False)
+        threading.Thread(target=_reap_pool, args=(ex, processes, pending),
+                         name="pdf-pool-reaper", daemon=True).start()
+
+
+def _reap_pool(ex: ProcessPoolExecutor, processes: list, pending: dict):
+    while True:
+        with _POOL_LOCK:
+            stuck = _RETIRED[ex]
+        alive = sum(1 for item in list(pending.values()) if not item.future.cancelled())
+        if alive <= stuck:
+            break
+        time.sleep(0.5)
+    with _POOL_LOCK:
+        _RETIRED.pop(ex, None)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
 
 class PDFParser:
     """Парсер для PDF файлов"""
 
+    # Короче этого страницы извлекаются последовательно - запуск процессов дороже
+    PARALLEL_MIN_PAGES = 8
+
+    # Защита API-сервера от патологических PDF (см. ExtractionLimits)
+    MAX_PAGE_CHARS = 200_000
+    MAX_TEXT_CHARS = 2_000_000
+    MAX_EXTRACT_SECONDS = 60.0
+    # Период проверки бюджета задач в пуле процессов
+    POLL_SECONDS = 0.1
+
     def __init__(self):
         """Инициализация PDF парсера"""
         self.supported_extensions = ['.pdf']
@@ -39,88 +250,227 @@ class PDFParser:
         Returns:
             Извлеченный текст или None при ошибке
         """
+        result = self.extract(file_path)
+        return result[0] if result else None
+
+    @cached_extraction("pdf", suffix=".json", dumps=_dump_extraction, loads=_load_extraction,
+                       version=lambda self: self._cache_version())
+    def extract(self, file_path: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Извлечение текста и метаданных PDF за одно открытие файла
+
+        Заголовок, xref и trailer разбираются один раз; результат кэшируется
+        по хэшу содержимого (см. text_cache).
+
+        Args:
+            file_path: Путь к PDF файлу
+
+        Returns:
+            (текст, метаданные) или None при ошибке
+        """
         if not self.can_parse(file_path):
-            logger.error(f"Unsupported file type: {file_path}")
+            logger.error("Unsupported file type: %s", file_path)
             return None
 
         try:
             path = Path(file_path)
             if not path.exists():
-                logger.error(f"File not found: {file_path}")
+                logger.error("File not found: %s", file_path)
+                return None
+
+            result = None
+            if PYMUPDF_AVAILABLE:
+                try:
+                    result = self._extract_pages_pymupdf(path)
+                except Exception as e:
+                    # Поврежденные PDF MuPDF иногда не открывает, а pypdf читает
+                    logger.warning("PyMuPDF failed on %s, falling back to pypdf: %s", path.name, e)
+            if result is None:
+                result = self._extract_pages_pypdf(path)
+            text_parts, metadata = result
+
+            # Объединяем текст непустых страниц
+            full_text = "\n\n".join(filter(None, text_parts))
+
+            if not full_text.strip():
+                logger.warning("No text extracted from %s", file_path)
                 return None
 
-            # Читаем PDF
-            with open(path, 'rb') as file:
-                pdf_reader = PdfReader(file)
+            logger.info("Successfully extracted %d characters from %s", len(full_text), path.name)
+            return full_text, metadata
+
+        except Exception as e:
+            logger.error("Error parsing PDF %s: %s", file_path, e)
+            return None
+
+    def extract_text_iter(self, file_path: str) -> Iterator[str]:
+        """
+        Постраничное извлечение текста без сборки всего документа в памяти
+
+        Для очень длинных PDF, которые обрабатываются по страницам
+        (см. TextExtractor.scan_pages). Результат не кэшируется; общий объем
+        не ограничивается, страницы обрезаются до MAX_PAGE_CHARS.
+
+        Args:
+            file_path: Путь к PDF файлу
+
+        Yields:
+            Текст каждой непустой страницы по порядку
+        """
+        if not self.can_parse(file_path):
+            logger.error("Unsupported file type: %s", file_path)
+            return
+
+        path = Path(file_path)
+        if not path.exists():
+            logger.error("File not found: %s", file_path)
+            return
+
+        if PYMUPDF_AVAILABLE:
+            with pymupdf.open(path) as doc:
+                for page in doc:
+                    page_text = page.get_text("text")
+                    if page_text:
+                        yield page_text[:self.MAX_PAGE_CHARS]
+            return
+
+        with open(path, 'rb') as file:
+            for i, page in enumerate(PdfReader(file).pages):
+                try:
+                    page_text = page.extract_text()
+                except Exception as e:
+                    logger.warning("Error extracting page %d: %s", i + 1, e)
+                    continue
+                if page_text:
+                    yield page_text[:self.MAX_PAGE_CHARS]
+
+    def _extract_pages_pymupdf(self, path: Path) -> Tuple[List[str], Dict[str, Any]]:
+        """Тексты страниц (порядок чтения - флаг "text", пустые - '') и метаданные через PyMuPDF"""
+        with pymupdf.open(path) as doc:
+            metadata = _pymupdf_metadata(doc)
+            num_pages = doc.page_count
+            logger.info("PDF has %d page(s)", num_pages)
+            if not self._use_pool(num_pages):
+                return _pymupdf_page_texts(doc, 0, num_pages, self._limits()), metadata
+        return self._extract_pages_parallel(path, num_pages, "pymupdf"), metadata
+
+    def _extract_pages_pypdf(self, path: Path) -> Tuple[List[str], Dict[str, Any]]:
+        """Тексты страниц (пустые и нечитаемые - '') и метаданные через pypdf"""
+        with open(path, 'rb') as file:
+            pdf_reader = PdfReader(file)
+            metadata = _pypdf_metadata(pdf_reader)
 
-                # Получаем количество страниц
-                num_pages = len(pdf_reader.pages)
-                logger.info(f"PDF has {num_pages} page(s)")
+            # Получаем количество страниц
+            num_pages = len(pdf_reader.pages)
+            logger.info("PDF has %d page(s)", num_pages)
+            if not self._use_pool(num_pages):
+                return _pypdf_page_texts(pdf_reader, 0, num_pages, self._limits()), metadata
+        return self._extract_pages_parallel(path, num_pages, "pypdf"), metadata
 
-                # Извлекаем текст со всех страниц
-                text_parts = []
-                for page_num in range(num_pages):
-                    try:
-                        page = pdf_reader.pages[page_num]
-                        page_text = page.extract_text()
+    def _cache_version(self) -> str:
+        """Часть ключа кэша: движок и лимиты, от которых зависит извлеченный текст"""
+        engine = "pymupdf" if PYMUPDF_AVAILABLE else "pypdf"
+        return f"{engine}-{self.MAX_PAGE_CHARS}-{self.MAX_TEXT_CHARS}"
 
-                        if page_text:
-                            text_parts.append(page_text)
-                            logger.debug(f"Extracted {len(page_text)} chars from page {page_num + 1}")
-                    except Exception as e:
-                        logger.warning(f"Error extracting page {page_num + 1}: {e}")
-                        continue
+    def _limits(self) -> ExtractionLimits:
+        return ExtractionLimits(self.MAX_PAGE_CHARS, self.MAX_TEXT_CHARS, self.MAX_EXTRACT_SECONDS)
 
-                # Объединяем текст всех страниц
-                full_text = "\n\n".join(text_parts)
+    def _use_pool(self, num_pages: int) -> bool:
+        """Пул процессов окупается только на длинных PDF и при нескольких ядрах"""
+        return num_pages > self.PARALLEL_MIN_PAGES and _pool_workers() > 1
 
-                if not full_text.strip():
-                    logger.warning(f"No text extracted from {file_path}")
-                    return None
+    def _extract_pages_parallel(self, path: Path, num_pages: int, engine: str) -> List[str]:
+        """
+        Извлечение страниц диапазонами в отдельных процессах
 
-                logger.info(f"Successfully extracted {len(full_text)} characters from {path.name}")
-                return full_text
+        Диапазоны выполняются в общем пуле (_get_pool); каждый воркер сам
+        открывает файл и возвращает тексты своего диапазона, результаты
+        склеиваются в порядке страниц. MAX_EXTRACT_SECONDS отсчитывается для
+        каждого диапазона с момента передачи воркеру, а не с постановки в
+        очередь за чужими файлами. Диапазоны, не успевшие в бюджет (зависшая
+        страница), отбрасываются: еще не начатые отменяются, а пул с зависшими
+        воркерами выводится из работы (_retire_pool) без прерывания чужих задач.
+        Общий объем текста снова ограничивается MAX_TEXT_CHARS.
+        """
+        limits = self._limits()
+        workers = min(_pool_workers(), num_pages)
+        bounds = [num_pages * i // workers for i in range(workers + 1)]
+        starts, ends = bounds[:-1], bounds[1:]
+        chunks: List[List[str]] = []
+        try:
+            ex = _get_pool()
+        except Exception as e:
+            # Например, запрет на fork в песочнице - извлекаем последовательно
+            logger.warning("Parallel PDF extraction failed, falling back to serial: %s", e)
+            return _extract_page_range(str(path), 0, num_pages, engine, limits)
+        try:
+            futures = [ex.submit(_extract_page_range, str(path), start, end, engine, limits)
+                       for start, end in zip(starts, ends)]
+            pending = set(futures)
+            started: Dict[Any, float] = {}
+            while pending:
+                now = time.monotonic()
+                for future in pending:
+                    # Пока задача ждет свободного воркера, ее бюджет не расходуется
+                    if future not in started and future.running():
+                        started[future] = now
+                if any(now - started[f] > limits.max_seconds for f in pending if f in started):
+                    break
+                _, pending = wait(pending, timeout=self.POLL_SECONDS, return_when=FIRST_COMPLETED)
 
+            for future in futures:
+                if not future.done():
+                    break
+                chunks.append(future.result())
+            if pending:
+                # Бюджет исчерпан: отдаем уже собранные страницы, а не повторяем все последовательно
+                stuck = sum(1 for f in pending if not f.cancel())
+                if stuck:
+                    _retire_pool(ex, stuck)
+                logger.warning("PDF extraction of %s exceeded %.0fs, skipping pages %d-%d",
+                               path.name, limits.max_seconds, starts[len(chunks)] + 1, num_pages)
         except Exception as e:
-            logger.error(f"Error parsing PDF {file_path}: {e}")
-            return None
+            if isinstance(e, BrokenProcessPool):
+                _discard_pool(ex)
+            logger.warning("Parallel PDF extraction failed, falling back to serial: %s", e)
+            return _extract_page_range(str(path), 0, num_pages, engine, limits)
+
+        text_parts = []
+        total_chars = 0
+        for chunk in chunks:
+            for page_text in chunk:
+                if total_chars >= limits.max_text_chars:
+                    return text_parts
+                text_parts.append(page_text)
+                total_chars += len(page_text)
+        return text_parts
 
     def get_metadata(self, file_path: str) -> dict:
         """
         Получение метаданных PDF
 
+        Устарело: открывает файл отдельно от извлечения текста, используйте extract().
+
         Args:
             file_path: Путь к PDF файлу
 
         Returns:
             Словарь с метаданными
         """
-        metadata = {
-            'num_pages': 0,
-            'author': None,
-            'title': None,
-            'subject': None,
-            'creator': None,
-            'producer': None,
-            'creation_date': None
-        }
+        warnings.warn("PDFParser.get_metadata is deprecated, use PDFParser.extract()",
+                      DeprecationWarning, stacklevel=2)
+
+        if PYMUPDF_AVAILABLE:
+            try:
+                with pymupdf.open(file_path) as doc:
+                    return _pymupdf_metadata(doc)
+            except Exception as e:
+                logger.warning("PyMuPDF metadata failed, falling back to pypdf: %s", e)
 
         try:
             with open(file_path, 'rb') as file:
-                pdf_reader = PdfReader(file)
-                metadata['num_pages'] = len(pdf_reader.pages)
-
-                if pdf_reader.metadata:
-                    metadata.update({
-                        'author': pdf_reader.metadata.get('/Author'),
-                        'title': pdf_reader.metadata.get('/Title'),
-                        'subject': pdf_reader.metadata.get('/Subject'),
-                        'creator': pdf_reader.metadata.get('/Creator'),
-                        'producer': pdf_reader.metadata.get('/Producer'),
-                        'creation_date': pdf_reader.metadata.get('/CreationDate')
-                    })
-
+                return _pypdf_metadata(PdfReader(file))
         except Exception as e:
-            logger.error(f"Error getting PDF metadata: {e}")
+            logger.error("Error getting PDF metadata: %s", e)
 
-        return metadata
+        return _empty_metadata()
@@ -0,0 +1,143 @@
+"""
+Кэш извлеченного текста по хэшу содержимого файла
+
+Повторный разбор одного и того же файла (повторная загрузка, тесты, переобработка
+почты) не запускает парсер: текст берется из памяти процесса или с диска.
+Ключ - sha256 содержимого плюс версия извлечения (TEXT_CACHE_VERSION и, например,
+движок PDF), поэтому переименование файла кэш не сбрасывает, а изменение
+содержимого или кода извлечения - сбрасывает.
+
+Каталог: $AI_RECRUITING_CACHE_DIR или data/cache/extracted_text в корне
+репозитория, независимо от текущего каталога (рядом с остальными кэшами проекта
+и под .gitignore: в тексте резюме персональные данные);
+AI_RECRUITING_TEXT_CACHE=0 отключает кэш.
+"""
+import functools
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Увеличивать при любом изменении результата парсеров (декодирование, лимиты, формат)
+TEXT_CACHE_VERSION = 2
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_CHUNK_SIZE = 64 * 1024
+_MEMORY_SIZE = 256
+
+# (namespace, версия, sha256) -> результат извлечения, LRU внутри процесса;
+# parse_resumes_bulk обращается к нему из нескольких потоков, отсюда блокировка
+_memory: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def cache_dir() -> Path:
+    """Корневой каталог дискового кэша"""
+    return Path(os.environ.get("AI_RECRUITING_CACHE_DIR", _REPO_ROOT / "data" / "cache" / "extracted_text"))
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("AI_RECRUITING_TEXT_CACHE", "1").lower() not in ("0", "false", "no")
+
+
+def file_sha256(path: Path) -> str:
+    """sha256 файла, читаемого блоками по 64 KiB"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _recall(key: Tuple[str, str, str]) -> Any:
+    with _memory_lock:
+        value = _memory.get(key)
+        if value is not None:
+            _memory.move_to_end(key)
+        return value
+
+
+def _remember(key: Tuple[str, str, str], value: Any):
+    with _memory_lock:
+        _memory[key] = value
+        _memory.move_to_end(key)
+        if len(_memory) > _MEMORY_SIZE:
+            _memory.popitem(last=False)
+
+
+def _read_disk(namespace: str, version: str, digest: str, suffix: str) -> Optional[str]:
+    path = cache_dir() / namespace / f"{digest}.{version}{suffix}"
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.debug("Text cache read failed for %s: %s", path, e)
+        return None
+
+
+def _write_disk(namespace: str, version: str, digest: str, suffix: str, text: str):
+    directory = cache_dir() / namespace
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, directory / f"{digest}.{version}{suffix}")
+    except OSError as e:
+        logger.debug("Text cache write failed in %s: %s", directory, e)
+
+
+def cached_extraction(namespace: str, suffix: str = ".txt",
+                      dumps: Optional[Callable[[Any], str]] = None,
+                      loads: Optional[Callable[[str], Any]] = None,
+                      version: Optional[Callable[[Any], str]] = None) -> Callable:
+    """
+    Декоратор для методов вида extract(self, file_path) -> Optional[...]
+
+    Неудачные извлечения (None) не кэшируются.
+
+    Args:
+        namespace: Подкаталог кэша (pdf, docx-text, ...)
+        suffix: Расширение файлов кэша
+        dumps: Сериализация результата в строку (по умолчанию результат - сам текст)
+        loads: Обратное преобразование для dumps
+        version: Функция от экземпляра парсера, возвращающая дополнительную часть
+            версии ключа (движок, лимиты); к ней добавляется TEXT_CACHE_VERSION
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, file_path, *args, **kwargs):
+            path = Path(file_path)
+            if not cache_enabled() or not path.is_file():
+                return method(self, file_path, *args, **kwargs)
+
+            try:
+                tag = f"v{TEXT_CACHE_VERSION}" + (f"-{version(self)}" if version else "")
+                key = (namespace, tag, file_sha256(path))
+            except OSError:
+                return method(self, file_path, *args, **kwargs)
+
+            result = _recall(key)
+            if result is None:
+                stored = _read_disk(*key, suffix)
+                if stored is not None:
+                    result = loads(stored) if loads else stored
+                    _remember(key, result)
+            if result is not None:
+                logger.debug("Text cache hit for %s", path.name)
+                return result
+
+            result = method(self, file_path, *args, **kwargs)
+            if result is not None:
+                _remember(key, result)
+                _write_disk(*key, suffix, dumps(result) if dumps else result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -2,13 +2,17 @@
 Text extractor for resumes across PDF, DOCX, and TXT with optional NLP helpers
 and simple language detection (en/ru).
 """
+import os
 import re
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Set, Tuple
 from .pdf_parser import PDFParser
 from .docx_parser import DOCXParser
-from .models import Resume, ContactInfo
+from .models import Resume, ContactInfo, validate_contact_info
 
 try:
     from .nlp_processor import NLPProcessor
@@ -19,13 +23,84 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.warning("NLP processor not available. Using basic extraction only.")
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import numpy as np
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+try:
+    from charset_normalizer import detect as detect_encoding
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+# Patterns, compiled once per process (re's internal cache is small and gets evicted)
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,4}[-\s\.]?[0-9]{1,9}')
+_URL_RE = re.compile(r'https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&/=]*)')
+# Lines with fewer digits than this are not searched for a phone number
+_MIN_PHONE_DIGITS = 7
+# Email, LinkedIn and GitHub in one scan; the match kind is m.lastgroup
+_CONTACT_RE = re.compile(
+    r'(?P<email>' + _EMAIL_RE.pattern + r')'
+    r'|linkedin\.com/in/(?P<linkedin>[a-zA-Z0-9-]+)'
+    r'|github\.com/(?P<github>[a-zA-Z0-9-]+)',
+    re.IGNORECASE,
+)
+_SKILLS_SECTION_RE = re.compile(r'(?:skills?|навыки|technologies)[\s:]*(.{0,500}?)(?:\n\n|$)', re.IGNORECASE | re.DOTALL)
+_SKILL_SPLIT_RE = re.compile(r'[,;\n]')
+_SUMMARY_RE = re.compile(
+    r'(?:summary|about|objective|profile|overview|резюме|о себе)[\s:]*(.{50,500}?)(?:\n\n|$)',
+    re.IGNORECASE | re.DOTALL,
+)
+_SENT_SPLIT_RE = re.compile(r'[.!?]\s+')
+_WORD_RE = re.compile(r'\b[А-Яа-яA-Za-z]{4,}\b')
+_WS_RE = re.compile(r'\s+')
+_BLANKLINE_RE = re.compile(r'\n\s*\n')
+_ALLOWED_CHARS_RE = re.compile(r'[^\w\s\n.,;:!?()\[\]{}@#$%&*+=\-/\\|<>"\']')
+_STOP_WORDS = frozenset({
+    'have', 'been', 'were', 'with', 'from', 'this', 'that', 'these', 'those',
+    'will', 'would', 'could', 'should',
+    'или', 'это', 'также', 'ещё', 'есть', 'нет', 'года', 'год'
+})
+
+# Language is decided from the document header: Cyrillic block U+0400..U+04FF
+_CYRILLIC_CHARS = frozenset(chr(c) for c in range(0x0400, 0x0500))
+_LANG_SAMPLE_CHARS = 2048
+
+# Bytes sniffed for the encoding of non-UTF-8 TXT files; used when detection is unavailable or unsure
+_ENCODING_SNIFF_BYTES = 4096
+_FALLBACK_ENCODING = 'windows-1251'
+
+# The skill automaton needs lowercased input; it is lowered this many chars at a time
+_LOWER_CHUNK = 1 << 16
+
 
 class TextExtractor:
     """Extracts structured info from resume files."""
 
+    COMMON_SKILLS = (
+        'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust', 'PHP', 'Ruby',
+        'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'FastAPI', 'Spring',
+        'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
+        'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Git', 'CI/CD',
+        'Machine Learning', 'Deep Learning', 'NLP', 'Computer Vision',
+        'TensorFlow', 'PyTorch', 'scikit-learn', 'Pandas', 'NumPy',
+        'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum'
+    )
+    # Built lazily and shared by all instances
+    _skill_searcher = None
+
     def __init__(self, use_nlp: bool = True, language: str = "auto"):
         """
         Args:
@@ -43,55 +118,74 @@ class TextExtractor:
             self._init_nlp(language)
 
         # Patterns
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        self.phone_pattern = re.compile(r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,4}[-\s\.]?[0-9]{1,9}')
-        self.url_pattern = re.compile(r'https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&/=]*)')
+        self.email_pattern = _EMAIL_RE
+        self.phone_pattern = _PHONE_RE
+        self.url_pattern = _URL_RE
 
     def _init_nlp(self, language: str):
         try:
             self.nlp_processor = NLPProcessor(language=language)
-            logger.info(f"NLP processor initialized (lang={language})")
+            logger.info("NLP processor initialized (lang=%s)", language)
         except Exception as e:
-            logger.warning(f"Failed to initialize NLP processor: {e}")
+            logger.warning("Failed to initialize NLP processor: %s", e)
             self.use_nlp = False
             self.nlp_processor = None
 
     def _detect_language(self, text: str) -> str:
-        """Heuristic detection: ru if Cyrillic present, else en."""
-        if re.search(r'[А-Яа-яЁё]', text):
+        """Heuristic detection: ru if Cyrillic appears in the first 2K chars, else en."""
+        if not _CYRILLIC_CHARS.isdisjoint(text[:_LANG_SAMPLE_CHARS]):
             return "ru"
         return "en"
 
-    def parse_resume(self, file_path: str) -> Optional[Resume]:
-        """Parse resume file into structured Resume model."""
+    def parse_resume(self, file_path: str, use_nlp: Optional[bool] = None) -> Optional[Resume]:
+        """
+        Parse resume file into structured Resume model.
+
+        use_nlp overrides the constructor setting for this call, so one
+        extractor can serve both modes; the NLP processor is created on first use.
+        """
+        return self._parse_resume(file_path, with_keywords=True, use_nlp=use_nlp)
+
+    def _parse_resume(
+        self,
+        file_path: str,
+        with_keywords: bool,
+        with_skills: bool = True,
+        use_nlp: Optional[bool] = None,
+    ) -> Optional[Resume]:
         path = Path(file_path)
+        use_nlp = self.use_nlp if use_nlp is None else use_nlp and NLP_AVAILABLE
 
         if not path.exists():
-            logger.error(f"File not found: {file_path}")
+            logger.error("File not found: %s", file_path)
             return None
 
         file_ext = path.suffix.lower()
         raw_text = None
+        metadata: Dict[str, Any] = {}
 
         if file_ext == '.pdf':
-            raw_text = self.pdf_parser.extract_text(file_path)
+            # Text and metadata from a single open of the PDF
+            extracted = self.pdf_parser.extract(file_path)
+            if extracted:
+                raw_text, metadata = extracted
         elif file_ext == '.docx':
             raw_text = self.docx_parser.extract_text(file_path)
         elif file_ext == '.txt':
             raw_text = self._extract_from_txt(file_path)
         else:
-            logger.error(f"Unsupported file type: {file_ext}")
+            logger.error("Unsupported file type: %s", file_ext)
             return None
 
         if not raw_text:
-            logger.error(f"Failed to extract text from {file_path}")
+            logger.error("Failed to extract text from %s", file_path)
             return None
 
         detected_lang = self.requested_language
         if self.requested_language == "auto":
             detected_lang = self._detect_language(raw_text)
-            if self.use_nlp and (self.nlp_processor is None or getattr(self.nlp_processor, "language", "") != detected_lang):
-                self._init_nlp(detected_lang)
+        if use_nlp and (self.nlp_processor is None or getattr(self.nlp_processor, "language", "") != detected_lang):
+            self._init_nlp(detected_lang)
 
         resume = Resume(
             file_path=str(path.absolute()),
@@ -99,52 +193,157 @@ class TextExtractor:
             file_type=file_ext[1:],
             raw_text=raw_text,
             language=detected_lang,
+            document_metadata=metadata,
         )
 
         resume.contact_info = self.extract_contact_info(raw_text)
-        resume.skills = self.extract_skills(raw_text)
+        if with_skills:
+            resume.skills = self.extract_skills(raw_text, use_nlp=use_nlp)
         resume.summary = self.extract_summary(raw_text)
-        resume.keywords = self.extract_keywords(raw_text)
+        if with_keywords:
+            resume.keywords = self.extract_keywords(raw_text, use_nlp=use_nlp)
 
-        logger.info(f"Successfully parsed resume: {path.name} (lang={detected_lang})")
+        # Единственная проверка email за весь пайплайн
+        validate_contact_info(resume.contact_info)
+
+        logger.info("Successfully parsed resume: %s (lang=%s)", path.name, detected_lang)
         return resume
 
-    def _extract_from_txt(self, file_path: str) -> Optional[str]:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            for encoding in ['windows-1251', 'latin-1', 'cp1252']:
+    def parse_resumes_bulk(
+        self,
+        file_paths: Iterable[str],
+        max_workers: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[Optional[Resume]]:
+        """
+        Parse many resume files concurrently on a thread pool.
+
+        MuPDF and lxml do their work with the GIL released, so parses overlap.
+        Each worker thread uses its own TextExtractor because parse_resume may
+        re-initialize the NLP processor on a language switch; the underlying
+        spaCy models are shared between instances.
+
+        With NLP enabled, keywords come from bulk_extract_keywords: one TF-IDF
+        fit over the whole batch instead of a vectorizer per resume, and skills
+        from bulk_extract_skills: one spaCy nlp.pipe per language. n_process
+        is passed to nlp.pipe (None picks it from the batch size); values above
+        1 spawn worker processes, so call from under ``if __name__ == "__main__"``.
+
+        Returns:
+            Parsed resumes in input order, None for files that failed
+        """
+        file_paths = list(file_paths)
+        if len(file_paths) <= 1:
+            return [self.parse_resume(path) for path in file_paths]
+
+        bulk_keywords = self.use_nlp and SKLEARN_AVAILABLE
+        local = threading.local()
+
+        def parse(path: str) -> Optional[Resume]:
+            extractor = getattr(local, "extractor", None)
+            if extractor is None:
+                extractor = local.extractor = TextExtractor(use_nlp=self.use_nlp, language=self.requested_language)
+            try:
+                return extractor._parse_resume(
+                    path, with_keywords=not bulk_keywords, with_skills=not self.use_nlp
+                )
+            except Exception as e:
+                logger.error("Error parsing %s: %s", path, e)
+                return None
+
+        workers = max_workers or min(len(file_paths), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            resumes = list(executor.map(parse, file_paths))
+
+        parsed = [resume for resume in resumes if resume is not None]
+        if self.use_nlp:
+            self.bulk_extract_skills(parsed, n_process=n_process)
+        if bulk_keywords:
+            for resume, keywords in zip(parsed, self.bulk_extract_keywords([r.raw_text for r in parsed])):
+                resume.keywords = keywords
+        return resumes
+
+    def bulk_extract_skills(self, resumes: List[Resume], n_process: Optional[int] = None):
+        """
+        Fill resume.skills for a batch, running spaCy once per language via nlp.pipe.
+
+        Resumes whose language has no usable NLP processor fall back to
+        extract_skills one by one.
+        """
+        by_language: Dict[str, List[Resume]] = {}
+        for resume in resumes:
+            by_language.setdefault(resume.language or "en", []).append(resume)
+
+        for language, group in by_language.items():
+            processor = self.nlp_processor
+            if processor is None or processor.language != language:
+                try:
+                    # Cheap after the first time: spaCy pipelines are shared per process
+                    processor = NLPProcessor(language=language)
+                except Exception as e:
+                    logger.warning("Failed to initialize NLP processor: %s", e)
+                    processor = None
+
+            if processor is not None:
                 try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        return f.read()
-                except Exception:
+                    skills = processor.extract_skills_nlp_batch(
+                        [resume.raw_text for resume in group], n_process=n_process
+                    )
+                    for resume, resume_skills in zip(group, skills):
+                        resume.skills = resume_skills[:30]
                     continue
-        except Exception as e:
-            logger.error(f"Error reading TXT file: {e}")
-        return None
+                except Exception as e:
+                    logger.warning("Batch NLP skill extraction failed: %s, falling back to basic method", e)
 
-    def extract_contact_info(self, text: str) -> ContactInfo:
-        contact_info = ContactInfo()
+            for resume in group:
+                resume.skills = self.extract_skills(resume.raw_text)
 
-        emails = self.email_pattern.findall(text)
-        if emails:
-            contact_info.email = emails[0]
+    def _extract_from_txt(self, file_path: str) -> Optional[str]:
+        """Read a TXT file once; UTF-8 (with or without BOM), else a sniffed encoding."""
+        try:
+            data = Path(file_path).read_bytes()
+        except Exception as e:
+            logger.error("Error reading TXT file: %s", e)
+            return None
 
-        phones = self.phone_pattern.findall(text)
-        if phones:
-            contact_info.phone = phones[0].strip()
+        try:
+            return data.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            pass
 
-        linkedin_match = re.search(r'linkedin\.com/in/([a-zA-Z0-9-]+)', text, re.IGNORECASE)
-        if linkedin_match:
-            contact_info.linkedin = f"https://linkedin.com/in/{linkedin_match.group(1)}"
+        encoding = None
+        if CHARSET_NORMALIZER_AVAILABLE:
+            encoding = detect_encoding(data[:_ENCODING_SNIFF_BYTES]).get('encoding')
+        try:
+            return data.decode(encoding or _FALLBACK_ENCODING, errors='replace')
+        except LookupError:
+            return data.decode(_FALLBACK_ENCODING, errors='replace')
 
-        github_match = re.search(r'github\.com/([a-zA-Z0-9-]+)', text, re.IGNORECASE)
-        if github_match:
-            contact_info.github = f"https://github.com/{github_match.group(1)}"
+    def extract_contact_info(self, text: str) -> ContactInfo:
+        contact_info = ContactInfo()
 
-        lines = text.split('\n')
-        for line in lines[:10]:
+        # First match of each kind wins; stop scanning once all three are found
+        found: Dict[str, str] = {}
+        for match in _CONTACT_RE.finditer(text):
+            found.setdefault(match.lastgroup, match.group(match.lastgroup))
+            if len(found) == 3:
+                break
+        if 'email' in found:
+            contact_info.email = found['email']
+        if 'linkedin' in found:
+            contact_info.linkedin = f"https://linkedin.com/in/{found['linkedin']}"
+        if 'github' in found:
+            contact_info.github = f"https://github.com/{found['github']}"
+
+        for line in text.splitlines():
+            if sum(map(line.count, '0123456789')) < _MIN_PHONE_DIGITS:
+                continue
+            phone = self.phone_pattern.search(line)
+            if phone:
+                contact_info.phone = phone.group(0).strip()
+                break
+
+        for line in text.split('\n', 10)[:10]:
             line = line.strip()
             if line and len(line) < 50 and not any(char.isdigit() for char in line):
                 words = line.split()
@@ -154,69 +353,104 @@ class TextExtractor:
 
         return contact_info
 
-    def extract_skills(self, text: str) -> List[str]:
-        if self.use_nlp and self.nlp_processor:
+    def extract_skills(self, text: str, use_nlp: Optional[bool] = None) -> List[str]:
+        if (self.use_nlp if use_nlp is None else use_nlp) and self.nlp_processor:
             try:
                 skills = self.nlp_processor.extract_skills_nlp(text)
-                logger.info(f"Extracted {len(skills)} skills using NLP")
+                logger.info("Extracted %d skills using NLP", len(skills))
                 return skills[:30]
             except Exception as e:
-                logger.warning(f"NLP skill extraction failed: {e}, falling back to basic method")
-
-        skills: List[str] = []
-
-        common_skills = [
-            'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust', 'PHP', 'Ruby',
-            'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'FastAPI', 'Spring',
-            'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
-            'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Git', 'CI/CD',
-            'Machine Learning', 'Deep Learning', 'NLP', 'Computer Vision',
-            'TensorFlow', 'PyTorch', 'scikit-learn', 'Pandas', 'NumPy',
-            'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum'
-        ]
-
-        text_lower = text.lower()
-        for skill in common_skills:
-            if skill.lower() in text_lower:
-                skills.append(skill)
-
-        skills_section = re.search(
-            r'(?:skills?|навыки|technologies)[\s:]*(.{0,500}?)(?:\n\n|$)',
-            text,
-            re.IGNORECASE | re.DOTALL
-        )
+                logger.warning("NLP skill extraction failed: %s, falling back to basic method", e)
+
+        skills: List[str] = self._find_common_skills(text)
+
+        skills_section = _SKILLS_SECTION_RE.search(text)
 
         if skills_section:
             skills_text = skills_section.group(1)
-            found_skills = re.split(r'[,;\n]', skills_text)
+            found_skills = _SKILL_SPLIT_RE.split(skills_text)
             for skill in found_skills:
                 skill = skill.strip()
                 if skill and len(skill) < 50:
                     skills.append(skill)
 
-        seen = set()
-        unique_skills = []
+        # Case-insensitive ordered dedup: the first spelling of each skill wins
+        unique_skills: Dict[str, str] = {}
         for skill in skills:
-            low = skill.lower()
-            if low not in seen:
-                seen.add(low)
-                unique_skills.append(skill)
+            unique_skills.setdefault(skill.lower(), skill)
+
+        return list(unique_skills.values())[:30]
 
-        return unique_skills[:30]
+    @classmethod
+    def _get_skill_searcher(cls):
+        """
+        Single-pass matcher over COMMON_SKILLS: an Aho-Corasick automaton, or
+        a case-insensitive regex alternation when pyahocorasick is missing.
+        """
+        if cls._skill_searcher is None:
+            if AHOCORASICK_AVAILABLE:
+                automaton = ahocorasick.Automaton()
+                for skill in cls.COMMON_SKILLS:
+                    automaton.add_word(skill.lower(), skill)
+                automaton.make_automaton()
+                overlap = max(map(len, cls.COMMON_SKILLS)) - 1
+                cls._skill_searcher = ('automaton', (automaton, overlap))
+            else:
+                # The lookahead tries every start position, longest alternative first;
+                # skills contained in a longer match (Java in JavaScript) are added via `contained`
+                alternation = "|".join(map(re.escape, sorted(cls.COMMON_SKILLS, key=len, reverse=True)))
+                pattern = re.compile(f"(?=({alternation}))", re.IGNORECASE)
+                contained = {
+                    skill.lower(): [other for other in cls.COMMON_SKILLS if other.lower() in skill.lower()]
+                    for skill in cls.COMMON_SKILLS
+                }
+                cls._skill_searcher = ('regex', (pattern, contained))
+        return cls._skill_searcher
+
+    def _match_common_skills(self, text: str, found: Set[str]):
+        """Add COMMON_SKILLS occurring anywhere in the text (case-insensitive) to `found`."""
+        kind, searcher = self._get_skill_searcher()
+        if kind == 'automaton':
+            # Lower overlapping windows instead of copying the whole text
+            automaton, overlap = searcher
+            for start in range(0, len(text), _LOWER_CHUNK):
+                window = text[start:start + _LOWER_CHUNK + overlap].lower()
+                found.update(skill for _, skill in automaton.iter(window))
+        else:
+            pattern, contained = searcher
+            for match in pattern.finditer(text):
+                found.update(contained[match.group(1).lower()])
+
+    def _find_common_skills(self, text: str) -> List[str]:
+        """COMMON_SKILLS occurring anywhere in the text (case-insensitive), in list order."""
+        found: Set[str] = set()
+        self._match_common_skills(text, found)
+        return [skill for skill in self.COMMON_SKILLS if skill in found]
+
+    def scan_pages(self, pages: Iterable[str], top_n: int = 20) -> Tuple[List[str], List[str]]:
+        """
+        Basic skill and keyword extraction over a stream of pages.
+
+        Meant for very large documents read with PDFParser.extract_text_iter:
+        pages are consumed one at a time and never joined into a single string.
+
+        Returns:
+            (COMMON_SKILLS found, in list order; top_n most frequent keywords)
+        """
+        found: Set[str] = set()
+        counts: Counter = Counter()
+        for page in pages:
+            self._match_common_skills(page, found)
+            self._count_keywords(page, counts)
+        skills = [skill for skill in self.COMMON_SKILLS if skill in found]
+        return skills, [word for word, _ in counts.most_common(top_n)]
 
     def extract_summary(self, text: str) -> Optional[str]:
-        patterns = [
-            r'(?:summary|about|objective|profile|overview|резюме|о себе)[\s:]*(.{50,500}?)(?:\n\n|$)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                summary = match.group(1).strip()
-                summary = re.sub(r'\s+', ' ', summary)
-                return summary
+        match = _SUMMARY_RE.search(text)
+        if match:
+            return _WS_RE.sub(' ', match.group(1).strip())
 
-        sentences = re.split(r'[.!?]\s+', text)
+        sentences = _SENT_SPLIT_RE.split(text)
         if len(sentences) >= 2:
             summary = '. '.join(sentences[1:3])
             if 50 <= len(summary) <= 500:
@@ -224,36 +458,72 @@ class TextExtractor:
 
         return None
 
-    def extract_keywords(self, text: str, top_n: int = 20) -> List[str]:
-        if self.use_nlp and self.nlp_processor:
+    def extract_keywords(self, text: str, top_n: int = 20, use_nlp: Optional[bool] = None) -> List[str]:
+        if (self.use_nlp if use_nlp is None else use_nlp) and self.nlp_processor:
             try:
                 keyword_scores = self.nlp_processor.extract_keywords_tfidf([text], top_n=top_n)
                 keywords = [word for word, _ in keyword_scores]
-                logger.info(f"Extracted {len(keywords)} keywords using TF-IDF")
+                logger.info("Extracted %d keywords using TF-IDF", len(keywords))
                 return keywords
             except Exception as e:
-                logger.warning(f"TF-IDF keyword extraction failed: {e}, falling back to basic method")
-
-        words = re.findall(r'\b[А-Яа-яA-Za-z]{4,}\b', text.lower())
-
-        stop_words = {
-            'have', 'been', 'were', 'with', 'from', 'this', 'that', 'these', 'those',
-            'will', 'would', 'could', 'should',
-            'или', 'или', 'это', 'также', 'ещё', 'есть', 'нет', 'года', 'год'
-        }
+                logger.warning("TF-IDF keyword extraction failed: %s, falling back to basic method", e)
 
-        filtered = [w for w in words if w not in stop_words]
+        counts: Counter = Counter()
+        self._count_keywords(text, counts)
+        return [word for word, _ in counts.most_common(top_n)]
 
-        freq: Dict[str, int] = {}
-        for w in filtered:
-            freq[w] = freq.get(w, 0) + 1
+    def bulk_extract_keywords(self, texts: List[str], top_n: int = 20) -> List[List[str]]:
+        """
+        TF-IDF keywords for many texts with a single vectorizer fit.
 
-        sorted_words = sorted(freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, _ in sorted_words[:top_n]]
+        IDF is computed over the whole batch, and each row's top terms are
+        picked with argpartition on its CSR slice. Falls back to the basic
+        frequency ranking without scikit-learn.
+        """
+        if not texts:
+            return []
+        if not SKLEARN_AVAILABLE:
+            keywords = []
+            for text in texts:
+                counts: Counter = Counter()
+                self._count_keywords(text, counts)
+                keywords.append([word for word, _ in counts.most_common(top_n)])
+            return keywords
+
+        vectorizer = TfidfVectorizer(
+            max_features=50000,
+            stop_words=list(ENGLISH_STOP_WORDS | _STOP_WORDS),
+            token_pattern=_WORD_RE.pattern,
+        )
+        try:
+            matrix = vectorizer.fit_transform(texts).tocsr()
+        except ValueError:
+            # Empty vocabulary: no text has a 4+ letter non-stop word
+            return [[] for _ in texts]
+        vocabulary = vectorizer.get_feature_names_out()
+
+        keywords = []
+        for row in range(matrix.shape[0]):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            scores = matrix.data[start:end]
+            columns = matrix.indices[start:end]
+            if len(scores) > top_n:
+                top = np.argpartition(-scores, top_n)[:top_n]
+            else:
+                top = np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind="stable")]
+            keywords.append([str(vocabulary[c]) for c in columns[top]])
+        return keywords
+
+    @staticmethod
+    def _count_keywords(text: str, counts: Counter):
+        """Add lowercased 4+ letter words of the text, minus stop words, to `counts`."""
+        words = (match.group(0).lower() for match in _WORD_RE.finditer(text))
+        counts.update(w for w in words if w not in _STOP_WORDS)
 
     def clean_text(self, text: str) -> str:
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        text = re.sub(r'[^\w\s\n.,;:!?()\[\]{}@#$%&*+=\-/\\|<>"\']', '', text)
+        text = _WS_RE.sub(' ', text)
+        text = _BLANKLINE_RE.sub('\n\n', text)
+        text = _ALLOWED_CHARS_RE.sub('', text)
         return text.strip()
 
@@ -1,6 +1,8 @@
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import streamlit as st
 
 API_BASE = os.getenv("API_BASE_URL", "http://localhost:8000")
@@ -22,25 +24,45 @@ st.markdown(
 )
 
 
+@st.cache_resource
+def http_session():
+    # One keep-alive session for the whole server process (the script reruns on every interaction)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=Retry(total=3, backoff_factor=0.2))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 def api_get(path, **params):
-    resp = requests.get(f"{API_BASE}{path}", params=params, timeout=30)
+    resp = http_session().get(f"{API_BASE}{path}", params=params, timeout=30)
     resp.raise_for_status()
     return resp.json()
 
 
 def api_post(path, json_body=None, files=None, params=None):
-    resp = requests.post(f"{API_BASE}{path}", json=json_body, files=files, params=params, timeout=60)
+    resp = http_session().post(f"{API_BASE}{path}", json=json_body, files=files, params=params, timeout=60)
     resp.raise_for_status()
     return resp.json()
 
 
+@st.cache_data(ttl=30)
+def get_jobs():
+    return api_get("/jobs")
+
+
+@st.cache_data(ttl=30)
+def get_resumes():
+    return api_get("/resumes")
+
+
 st.title("AI Recruiting Agent")
 st.caption(f"Backend: {API_BASE}")
 
 # --- Load reference data ---
-jobs_data = api_get("/jobs")
+jobs_data = get_jobs()
 jobs = jobs_data.get("jobs", [])
-resumes_data = api_get("/resumes")
+resumes_data = get_resumes()
 
 left, right = st.columns([1.2, 1])
 
@@ -54,6 +76,7 @@ with left:
             if upload_file:
                 files = {"file": (upload_file.name, upload_file.getvalue(), upload_file.type or "application/octet-stream")}
                 res = api_post("/resumes/upload", files=files, params={"language": lang})
+                get_resumes.clear()
                 st.success(f"Uploaded {res.get('resume_id')} • {res.get('candidate_name') or 'Unknown'}")
                 extracted_skills = res.get('extracted_skills', [])
                 extracted_keywords = res.get('extracted_keywords', [])
@@ -80,6 +103,7 @@ with left:
                     "nice_to_have_skills": [s.strip() for s in nice_to_have.split(",") if s.strip()],
                 }
                 job_res = api_post("/jobs", json_body=payload)
+                get_jobs.clear()
                 st.success(f"Job created: {job_res['job_id']}")
 
 # ---------------- Recommendations ----------------
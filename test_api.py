@@ -3,12 +3,20 @@ Test script for FastAPI endpoints
 Tests all API functionality with example requests
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from pathlib import Path
 import time
 
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive session for all requests (retries idempotent calls on transient errors)
+session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=Retry(total=3, backoff_factor=0.2))
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
+
 
 def print_section(title):
     """Print section header"""
@@ -21,7 +29,7 @@ def test_health():
     """Test health endpoint"""
     print_section("Test 1: Health Check")
 
-    response = requests.get(f"{BASE_URL}/health")
+    response = session.get(f"{BASE_URL}/health")
     print(f"Status: {response.status_code}")
 
     if response.status_code == 200:
@@ -43,7 +51,7 @@ def test_list_jobs():
     """Test list jobs endpoint"""
     print_section("Test 2: List Jobs")
 
-    response = requests.get(f"{BASE_URL}/jobs")
+    response = session.get(f"{BASE_URL}/jobs")
     print(f"Status: {response.status_code}")
 
     if response.status_code == 200:
@@ -76,7 +84,7 @@ def test_upload_resume():
 
     with open(resume_path, 'rb') as f:
         files = {'file': ('resume.pdf', f, 'application/pdf')}
-        response = requests.post(
+        response = session.post(
             f"{BASE_URL}/resumes/upload",
             files=files,
             params={'language': 'en'}
@@ -132,7 +140,7 @@ def test_create_job():
         "salary_range": "$120k - $180k"
     }
 
-    response = requests.post(f"{BASE_URL}/jobs", json=job_data)
+    response = session.post(f"{BASE_URL}/jobs", json=job_data)
     print(f"Status: {response.status_code}")
 
     if response.status_code == 200:
@@ -166,7 +174,7 @@ def test_recommendations(job_id):
     print(f"Matcher: {request_data['matcher_type']}")
     print(f"Top N: {request_data['top_n']}")
 
-    response = requests.post(f"{BASE_URL}/recommendations", json=request_data)
+    response = session.post(f"{BASE_URL}/recommendations", json=request_data)
     print(f"\nStatus: {response.status_code}")
 
     if response.status_code == 200:
@@ -209,7 +217,7 @@ def test_custom_job_recommendations():
 
     print("Using custom job description (Russian language)")
 
-    response = requests.post(f"{BASE_URL}/recommendations", json=request_data)
+    response = session.post(f"{BASE_URL}/recommendations", json=request_data)
     print(f"Status: {response.status_code}")
 
     if response.status_code == 200:
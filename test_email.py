@@ -2,7 +2,10 @@
 Test script for email integration
 """
 import sys
+import queue
+import threading
 from pathlib import Path
+from typing import Optional
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -12,7 +15,7 @@ from config import settings
 
 
 def test_connection():
-    """Test email connection"""
+    """Test email connection; returns the connected client for reuse (or None)"""
     print("=" * 60)
     print("Testing Email Connection")
     print("=" * 60)
@@ -33,26 +36,61 @@ def test_connection():
         for folder in folders[:10]:  # Show first 10
             print(f"  - {folder}")
 
-        client.disconnect()
-        return True
+        return client
     else:
         print("✗ Failed to connect")
-        return False
+        return None
+
+
+def prefetch(iterable, maxsize: int = 8):
+    """
+    Drain an iterator on a background thread, keeping up to maxsize items ready
+
+    Lets IMAP fetching overlap with attachment processing in the caller.
+    """
+    items: queue.Queue = queue.Queue(maxsize=maxsize)
+    done = object()
+
+    def produce():
+        try:
+            for item in iterable:
+                items.put(item)
+        except Exception as e:
+            items.put(e)
+        finally:
+            items.put(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = items.get()
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
 
+def fetch_and_process_resumes(limit: int = 5, client: Optional[EmailClient] = None):
+    """
+    Fetch and process resume emails
 
-def fetch_and_process_resumes(limit: int = 5):
-    """Fetch and process resume emails"""
+    A connected client passed in is reused (one TLS + LOGIN handshake for the
+    whole run) and left open for the caller; otherwise a new one is opened
+    and closed here.
+    """
     print("\n" + "=" * 60)
     print("Fetching Resume Emails")
     print("=" * 60)
 
     # Initialize components
-    client = EmailClient(
-        host=settings.email_host,
-        port=settings.email_port,
-        email_address=settings.email_address,
-        password=settings.email_password
-    )
+    owns_client = client is None
+    if owns_client:
+        client = EmailClient(
+            host=settings.email_host,
+            port=settings.email_port,
+            email_address=settings.email_address,
+            password=settings.email_password
+        )
 
     handler = AttachmentHandler(
         storage_path=settings.resume_storage_path,
@@ -60,29 +98,29 @@ def fetch_and_process_resumes(limit: int = 5):
     )
 
     # Connect and fetch
-    if not client.connect():
+    if owns_client and not client.connect():
         print("✗ Failed to connect")
         return
 
     print(f"Searching for unread emails in '{settings.email_folder}'...\n")
 
-    emails = client.fetch_unread_emails(
+    # The IMAP connection is used only by the prefetch thread until the loop ends;
+    # don't call client methods (e.g. mark_as_read) from inside the loop
+    emails = prefetch(client.iter_unread_emails(
         folder=settings.email_folder,
         subject_filter=settings.email_subject_filter,
-        limit=limit
-    )
+        limit=limit,
+        # Already processed emails are filtered out before anything is downloaded
+        skip=handler.is_email_processed
+    ))
 
-    if not emails:
-        print("No unread emails found")
-        client.disconnect()
-        return
-
-    print(f"Found {len(emails)} unread email(s)\n")
-
-    # Process each email
+    # Process each email while the next ones are being fetched
+    total_emails = 0
     total_resumes = 0
+    processed_ids = []
     for i, email_data in enumerate(emails, 1):
-        print(f"\n--- Email {i}/{len(emails)} ---")
+        total_emails = i
+        print(f"\n--- Email {i} ---")
         print(f"From: {email_data['from']}")
         print(f"Subject: {email_data['subject']}")
         print(f"Date: {email_data['date']}")
@@ -100,15 +138,22 @@ def fetch_and_process_resumes(limit: int = 5):
             print(f"\n✓ Saved {len(processed)} resume(s)")
             total_resumes += len(processed)
 
-            # Mark as read (optional - comment out if you want to keep as unread)
-            # client.mark_as_read(email_data['id'])
+            processed_ids.append(email_data['id'])
         else:
             if handler.is_email_processed(email_data['id']):
                 print("  (Already processed)")
             else:
                 print("  No valid resume attachments found")
 
-    client.disconnect()
+    if not total_emails:
+        print("No unread emails found")
+
+    # Mark as read (optional - comment out if you want to keep as unread)
+    # for msg_id in processed_ids:
+    #     client.mark_as_read(msg_id)
+
+    if owns_client:
+        client.disconnect()
 
     print("\n" + "=" * 60)
     print(f"Processing complete: {total_resumes} new resume(s) saved")
@@ -146,9 +191,11 @@ def main():
     print("AI Recruiting Agent - Email Integration Test")
     print("=" * 60)
 
+    client = None
     try:
         # Test connection
-        if not test_connection():
+        client = test_connection()
+        if not client:
             print("\n⚠ Connection failed. Please check your .env configuration:")
             print("  - EMAIL_ADDRESS")
             print("  - EMAIL_PASSWORD")
@@ -156,8 +203,8 @@ def main():
             print("  - EMAIL_PORT")
             return
 
-        # Fetch and process
-        fetch_and_process_resumes(limit=10)
+        # Fetch and process over the same connection
+        fetch_and_process_resumes(limit=10, client=client)
 
         # Show stats
         show_statistics()
@@ -166,6 +213,9 @@ def main():
         print(f"\n✗ Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if client:
+            client.disconnect()
 
 
 if __name__ == "__main__":
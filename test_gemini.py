@@ -3,7 +3,10 @@ Test script for Gemini Matcher
 
 Tests Google Gemini 2.0 Flash via AI Studio for resume matching
 """
+import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # Add src to path
@@ -25,10 +28,22 @@ except ImportError:
     print("  Run: pip install google-generativeai")
     GENAI_OK = False
 
-from matching import GeminiMatcher, Job
-from resume_parser import TextExtractor
+from matching import GeminiMatcher, SemanticMatcher, TFIDFMatcher, Job
+from test_utils import FIXTURES, parse_or_cached
 from config import Settings
 
+
+@lru_cache(maxsize=None)
+def get_semantic_matcher(model_name: str = 'paraphrase-multilingual-MiniLM-L12-v2', int8=None):
+    """Build the Sentence-BERT matcher once; later calls reuse the loaded model (SBERT_INT8=1 -> int8)"""
+    return SemanticMatcher(model_name, int8=int8)
+
+
+@lru_cache(maxsize=None)
+def get_tfidf_matcher(max_features: int = 500):
+    """Build the TF-IDF matcher once per configuration"""
+    return TFIDFMatcher(max_features=max_features)
+
 print("\n" + "=" * 60)
 print("Step 1: Load Configuration")
 print("=" * 60)
@@ -51,50 +66,10 @@ print("\n" + "=" * 60)
 print("Step 2: Parse Sample Resume")
 print("=" * 60)
 
-extractor = TextExtractor(use_nlp=True)
-
-sample_resume = """
-Jane Smith
-Senior Full Stack Developer
-
-Email: jane.smith@email.com
-Phone: +1-555-987-6543
-LinkedIn: linkedin.com/in/janesmith
-
-PROFESSIONAL SUMMARY
-Experienced full-stack developer with 6 years of expertise in building scalable
-web applications. Specialized in React, Node.js, TypeScript, and cloud technologies.
-Strong background in microservices architecture and DevOps practices.
-
-TECHNICAL SKILLS
-Frontend: React, TypeScript, JavaScript, Next.js, Redux, HTML, CSS
-Backend: Node.js, Express, Python, FastAPI, Django
-Databases: PostgreSQL, MongoDB, Redis
-DevOps: Docker, Kubernetes, AWS, CI/CD, Jenkins
-Tools: Git, Jest, Webpack, Vite
-
-WORK EXPERIENCE
-Senior Full Stack Developer | Tech Solutions Inc | 2021 - Present
-- Led development of React-based SaaS platform serving 100K+ users
-- Built RESTful APIs and microservices with Node.js and Express
-- Implemented CI/CD pipelines reducing deployment time by 60%
-- Mentored team of 4 junior developers
-
-Full Stack Developer | WebCo | 2018 - 2021
-- Developed e-commerce platform with React and Node.js
-- Optimized database queries improving performance by 40%
-- Integrated payment systems and third-party APIs
-
-EDUCATION
-B.S. Computer Science | State University | 2018
-GPA: 3.8/4.0
-"""
+sample_resume = (FIXTURES / "sample_resume_jane.txt").read_text(encoding="utf-8")
 
-temp_resume = Path("data/temp_gemini_resume.txt")
-temp_resume.parent.mkdir(parents=True, exist_ok=True)
-temp_resume.write_text(sample_resume, encoding='utf-8')
-
-resume = extractor.parse_resume(str(temp_resume))
+# Parsed once, then loaded from data/cache/parsed_resumes on later runs
+resume = parse_or_cached(sample_resume, "temp_gemini_resume.txt")
 
 if not resume:
     print("✗ Failed to parse resume")
@@ -108,40 +83,7 @@ print("\n" + "=" * 60)
 print("Step 3: Create Sample Job")
 print("=" * 60)
 
-job = Job(
-    job_id="job_001",
-    title="Senior Full Stack JavaScript Developer",
-    company="Innovative Startup",
-    description="""
-    We're looking for a Senior Full Stack Developer to join our fast-growing team.
-
-    Responsibilities:
-    - Build modern web applications with React and Node.js
-    - Design and implement RESTful APIs
-    - Work with PostgreSQL and MongoDB databases
-    - Deploy and maintain applications on AWS
-    - Collaborate with cross-functional teams
-
-    Requirements:
-    - 5+ years of experience with JavaScript/TypeScript
-    - Strong proficiency in React and Node.js
-    - Experience with PostgreSQL or MongoDB
-    - Knowledge of Docker and Kubernetes
-    - AWS cloud experience
-
-    Nice to have:
-    - Experience with Next.js
-    - CI/CD pipeline experience
-    - Microservices architecture knowledge
-    """,
-    required_skills=[
-        "JavaScript", "TypeScript", "React", "Node.js", "Express",
-        "PostgreSQL", "MongoDB", "Docker", "Kubernetes", "AWS"
-    ],
-    nice_to_have_skills=[
-        "Next.js", "CI/CD", "Microservices", "Redux"
-    ]
-)
+job = Job(**json.loads((FIXTURES / "job_fullstack_js.json").read_text(encoding="utf-8")))
 
 print(f"✓ Job created: {job.title}")
 print(f"  Required skills: {len(job.required_skills)}")
@@ -162,6 +104,12 @@ try:
         model_name="gemini-2.5-pro"
     )
 
+    # The local matchers (Step 5) don't depend on Gemini: run them while the API call is in flight
+    comparison_pool = ThreadPoolExecutor(max_workers=2)
+    semantic_future = comparison_pool.submit(lambda: get_semantic_matcher().match(resume, job))
+    tfidf_future = comparison_pool.submit(lambda: get_tfidf_matcher().match(resume, job))
+    comparison_pool.shutdown(wait=False)
+
     print(f"Matching resume with job using Gemini 2.5 Pro...")
     result = gemini_matcher.match(resume, job)
 
@@ -193,15 +141,11 @@ try:
     print("Step 5: Compare with Other Matchers")
     print("=" * 60)
 
-    from matching import SemanticMatcher, TFIDFMatcher
+    print("\nSemantic Matcher (started alongside Gemini)...")
+    sem_result = semantic_future.result()
 
-    print("\nRunning Semantic Matcher...")
-    semantic = SemanticMatcher()
-    sem_result = semantic.match(resume, job)
-
-    print("Running TF-IDF Matcher...")
-    tfidf = TFIDFMatcher()
-    tfidf_result = tfidf.match(resume, job)
+    print("TF-IDF Matcher (started alongside Gemini)...")
+    tfidf_result = tfidf_future.result()
 
     print(f"\n{'Matcher':<20} {'Overall':<10} {'Semantic/LLM':<15} {'Skills':<10}")
     print("-" * 60)
@@ -229,10 +173,6 @@ except Exception as e:
     print("  3. Make sure the API key has proper permissions")
     print("  4. Check if you've exceeded rate limits (unlikely with free tier)")
 
-# Cleanup
-if temp_resume.exists():
-    temp_resume.unlink()
-
 print("\n" + "=" * 60)
 print("Test Complete!")
 print("=" * 60)
@@ -2,6 +2,8 @@
 Простой тест Gemini API - проверяем базовую связь
 """
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -40,28 +42,78 @@ print("Инициализация Gemini API")
 print("=" * 60)
 
 try:
-    genai.configure(api_key=settings.google_api_key)
+    # gRPC: все запросы идут по одному мультиплексированному каналу
+    genai.configure(api_key=settings.google_api_key, transport='grpc')
     print("✓ API настроен")
 except Exception as e:
     print(f"✗ Ошибка настройки API: {e}")
     sys.exit(1)
 
+try:
+    model = genai.GenerativeModel('gemini-2.5-pro')
+    print("✓ Модель загружена: gemini-2.5-pro")
+except Exception as e:
+    print(f"✗ Ошибка загрузки модели: {e}")
+    sys.exit(1)
+
+prompt1 = "Привет! Скажи 'Привет' в ответ одним словом."
+prompt2 = "Сколько будет 2+2? Ответь только числом."
+prompt3_json = """
+Ответь в формате JSON со следующими полями:
+{
+  "status": "ok",
+  "message": "Тест пройден"
+}
+
+Ответь ТОЛЬКО JSON, без дополнительного текста.
+"""
+prompt4 = "Опиши Python в двух предложениях."
+generation_config = {
+    "temperature": 0.1,
+    "top_p": 0.8,
+    "top_k": 40,
+    "max_output_tokens": 100,
+}
+
+
+def generate_text(prompt, **kwargs):
+    """
+    Стриминговый запрос: текст собирается по мере генерации на сервере.
+    Возвращает (текст, задержка до первого фрагмента в секундах).
+    """
+    started = time.perf_counter()
+    first_chunk = None
+    parts = []
+    for chunk in model.generate_content(prompt, stream=True, **kwargs):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+        parts.append(chunk.text)
+    return "".join(parts), first_chunk
+
+
+# Тесты независимы - отправляем все запросы сразу, ответы разбираем по порядку.
+# Ошибка каждого запроса всплывает в future.result() своего теста.
+print("\nОтправляю 4 запроса параллельно...")
+executor = ThreadPoolExecutor(max_workers=4)
+future1 = executor.submit(generate_text, prompt1)
+future2 = executor.submit(generate_text, prompt2)
+# Сервер сам гарантирует валидный JSON - без ручного снятия ```json
+future3 = executor.submit(generate_text, prompt3_json, generation_config={"response_mime_type": "application/json"})
+future4 = executor.submit(generate_text, prompt4, generation_config=generation_config)
+executor.shutdown(wait=False)
+
 # Тест 1: Простой вопрос
 print("\n" + "=" * 60)
 print("Тест 1: Простой вопрос")
 print("=" * 60)
 
 try:
-    model = genai.GenerativeModel('gemini-2.5-pro')
-    print("✓ Модель загружена: gemini-2.5-pro")
-
-    prompt = "Привет! Скажи 'Привет' в ответ одним словом."
-    print(f"\nОтправляю: '{prompt}'")
+    print(f"\nОтправлено: '{prompt1}'")
 
-    response = model.generate_content(prompt)
+    response_text, first_chunk = future1.result()
 
-    print(f"✓ Получен ответ!")
-    print(f"\nОтвет Gemini: {response.text}")
+    print(f"✓ Получен ответ! (первый фрагмент через {first_chunk or 0:.2f} c)")
+    print(f"\nОтвет Gemini: {response_text}")
 
 except Exception as e:
     print(f"\n✗ Ошибка: {e}")
@@ -74,13 +126,12 @@ print("Тест 2: Математика")
 print("=" * 60)
 
 try:
-    prompt = "Сколько будет 2+2? Ответь только числом."
-    print(f"\nОтправляю: '{prompt}'")
+    print(f"\nОтправлено: '{prompt2}'")
 
-    response = model.generate_content(prompt)
+    response_text, first_chunk = future2.result()
 
-    print(f"✓ Получен ответ!")
-    print(f"\nОтвет Gemini: {response.text}")
+    print(f"✓ Получен ответ! (первый фрагмент через {first_chunk or 0:.2f} c)")
+    print(f"\nОтвет Gemini: {response_text}")
 
 except Exception as e:
     print(f"\n✗ Ошибка: {e}")
@@ -90,43 +141,25 @@ print("\n" + "=" * 60)
 print("Тест 3: Ответ в JSON формате")
 print("=" * 60)
 
-try:
-    prompt = """
-Ответь в формате JSON со следующими полями:
-{
-  "status": "ok",
-  "message": "Тест пройден"
-}
+import json
 
-Ответь ТОЛЬКО JSON, без дополнительного текста.
-"""
-    print(f"\nОтправляю запрос на JSON...")
+try:
+    print(f"\nОтправлен запрос на JSON...")
 
-    response = model.generate_content(prompt)
+    response_text, first_chunk = future3.result()
 
-    print(f"✓ Получен ответ!")
+    print(f"✓ Получен ответ! (первый фрагмент через {first_chunk or 0:.2f} c)")
     print(f"\nОтвет Gemini:")
-    print(response.text)
-
-    # Пробуем распарсить JSON
-    import json
-    text = response.text.strip()
-    if text.startswith('```json'):
-        text = text[7:]
-    if text.startswith('```'):
-        text = text[3:]
-    if text.endswith('```'):
-        text = text[:-3]
-    text = text.strip()
-
-    data = json.loads(text)
+    print(response_text)
+
+    data = json.loads(response_text)
     print(f"\n✓ JSON успешно распарсен:")
     print(f"  status: {data.get('status')}")
     print(f"  message: {data.get('message')}")
 
 except json.JSONDecodeError as e:
     print(f"\n⚠ Не удалось распарсить JSON: {e}")
-    print(f"Сырой ответ: {response.text}")
+    print(f"Сырой ответ: {response_text}")
 except Exception as e:
     print(f"\n✗ Ошибка: {e}")
 
@@ -136,23 +169,12 @@ print("Тест 4: С настройками генерации")
 print("=" * 60)
 
 try:
-    generation_config = {
-        "temperature": 0.1,
-        "top_p": 0.8,
-        "top_k": 40,
-        "max_output_tokens": 100,
-    }
-
-    prompt = "Опиши Python в двух предложениях."
-    print(f"\nОтправляю с temperature=0.1...")
-
-    response = model.generate_content(
-        prompt,
-        generation_config=generation_config
-    )
-
-    print(f"✓ Получен ответ!")
-    print(f"\nОтвет Gemini: {response.text}")
+    print(f"\nОтправлено с temperature=0.1...")
+
+    response_text, first_chunk = future4.result()
+
+    print(f"✓ Получен ответ! (первый фрагмент через {first_chunk or 0:.2f} c)")
+    print(f"\nОтвет Gemini: {response_text}")
 
 except Exception as e:
     print(f"\n✗ Ошибка: {e}")
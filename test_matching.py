@@ -8,7 +8,12 @@ Tests:
 
 Compares results and demonstrates usage
 """
+import importlib
+import os
+import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # Add src to path
@@ -18,98 +23,78 @@ print("\n" + "=" * 60)
 print("Matching Engine Test - All 3 Approaches")
 print("=" * 60)
 
+# Quieter transformers output; no tokenizer thread pools competing with our own threads
+os.environ.setdefault("TRANSFORMERS_NO_ADVISORY_WARNINGS", "1")
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+
+def _try_import(name):
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        # Not only ImportError: concurrent imports can fail with a module-lock
+        # _DeadlockError (a RuntimeError), which is retried sequentially below
+        return None
+
+
 # Check available packages
 print("\nChecking dependencies...")
 
-try:
-    import sentence_transformers
+# The heavy imports (torch, scipy, ...) load their C extensions concurrently
+with ThreadPoolExecutor(max_workers=3) as pool:
+    sentence_transformers, sklearn, openai = pool.map(
+        _try_import, ["sentence_transformers", "sklearn", "openai"]
+    )
+sentence_transformers = sentence_transformers or _try_import("sentence_transformers")
+sklearn = sklearn or _try_import("sklearn")
+openai = openai or _try_import("openai")
+
+SBERT_OK = sentence_transformers is not None
+if SBERT_OK:
     print("✓ sentence-transformers installed (for Semantic Matcher)")
-    SBERT_OK = True
-except ImportError:
+else:
     print("✗ sentence-transformers not installed")
     print("  Run: pip install sentence-transformers")
-    SBERT_OK = False
 
-try:
-    import sklearn
+SKLEARN_OK = sklearn is not None
+if SKLEARN_OK:
     print("✓ scikit-learn installed (for TF-IDF Matcher)")
-    SKLEARN_OK = True
-except ImportError:
+else:
     print("✗ scikit-learn not installed")
     print("  Run: pip install scikit-learn")
-    SKLEARN_OK = False
 
-try:
-    import openai
+OPENAI_OK = openai is not None
+if OPENAI_OK:
     print("✓ openai installed (for LLM Matcher)")
-    OPENAI_OK = True
-except ImportError:
+else:
     print("✗ openai not installed")
     print("  Run: pip install openai")
-    OPENAI_OK = False
 
 # Import our modules
 from matching import SemanticMatcher, TFIDFMatcher, LLMMatcher, Job
-from resume_parser import TextExtractor
+from test_utils import FIXTURES, parse_or_cached
+
+
+@lru_cache(maxsize=None)
+def get_semantic_matcher(model_name: str = 'paraphrase-multilingual-MiniLM-L12-v2', int8=None):
+    """Build the Sentence-BERT matcher once; later calls reuse the loaded model (SBERT_INT8=1 -> int8)"""
+    return SemanticMatcher(model_name, int8=int8)
+
+
+@lru_cache(maxsize=None)
+def get_tfidf_matcher(max_features: int = 500):
+    """Build the TF-IDF matcher once per configuration"""
+    return TFIDFMatcher(max_features=max_features)
 
 print("\n" + "=" * 60)
 print("Step 1: Parse Sample Resume")
 print("=" * 60)
 
-# Parse a sample resume
-extractor = TextExtractor(use_nlp=True)
-
-# Create temp sample resume
-sample_resume_text = """
-John Smith
-Senior Python Developer
-
-Email: john.smith@email.com
-Phone: +1-555-123-4567
-LinkedIn: linkedin.com/in/johnsmith
-GitHub: github.com/johnsmith
-
-PROFESSIONAL SUMMARY
-Experienced Python developer with 7 years of expertise in building scalable
-backend systems. Specialized in Django, FastAPI, and microservices architecture.
-Strong background in AWS cloud services and Docker containerization.
-
-TECHNICAL SKILLS
-Languages: Python, JavaScript, SQL, Bash
-Frameworks: Django, FastAPI, Flask, React
-Databases: PostgreSQL, MySQL, Redis, MongoDB
-DevOps: Docker, Kubernetes, Jenkins, GitLab CI
-Cloud: AWS (EC2, S3, Lambda, RDS), Azure
-Tools: Git, JIRA, Confluence
-
-WORK EXPERIENCE
-Senior Python Developer | Tech Company | 2020 - Present
-- Designed and implemented microservices architecture serving 1M+ users
-- Built RESTful APIs using Django REST Framework and FastAPI
-- Optimized PostgreSQL queries, reducing response time by 40%
-- Implemented CI/CD pipelines with Jenkins and Docker
-- Mentored junior developers and conducted code reviews
-
-Python Developer | Software Inc | 2017 - 2020
-- Developed backend services for e-commerce platform
-- Integrated payment gateways and third-party APIs
-- Worked with Redis for caching and session management
-- Implemented automated testing with pytest
-
-EDUCATION
-B.S. Computer Science | University of Technology | 2017
-
-PROJECTS
-- Open-source contributor to Django and FastAPI
-- Built ML-powered recommendation system using scikit-learn
-- Created developer tools published on PyPI
-"""
-
-temp_resume = Path("data/temp_test_resume.txt")
-temp_resume.parent.mkdir(parents=True, exist_ok=True)
-temp_resume.write_text(sample_resume_text, encoding='utf-8')
+# Create sample resume
+sample_resume_text = (FIXTURES / "sample_resume_john.txt").read_text(encoding="utf-8")
 
-resume = extractor.parse_resume(str(temp_resume))
+# Parsed once, then loaded from data/cache/parsed_resumes on later runs
+resume = parse_or_cached(sample_resume_text, "temp_test_resume.txt")
 
 if resume:
     print(f"✓ Resume parsed successfully")
@@ -124,35 +109,7 @@ print("\n" + "=" * 60)
 print("Step 2: Create Sample Job")
 print("=" * 60)
 
-job = Job(
-    job_id="job_001",
-    title="Senior Python Backend Developer",
-    company="Tech Corp",
-    description="""
-    We are looking for an experienced Python Backend Developer to join our team.
-
-    Responsibilities:
-    - Design and develop scalable backend services using Python and Django
-    - Build RESTful APIs and microservices
-    - Work with PostgreSQL and Redis databases
-    - Implement CI/CD pipelines
-    - Deploy on AWS infrastructure
-
-    Requirements:
-    - 5+ years of experience with Python
-    - Strong knowledge of Django or FastAPI
-    - Experience with PostgreSQL, Redis
-    - Understanding of Docker and Kubernetes
-    - Experience with AWS cloud services
-    """,
-    required_skills=[
-        "Python", "Django", "FastAPI", "PostgreSQL", "Redis",
-        "Docker", "Kubernetes", "AWS", "REST API", "Microservices"
-    ],
-    nice_to_have_skills=[
-        "Machine Learning", "GraphQL", "CI/CD", "Jenkins"
-    ]
-)
+job = Job(**json.loads((FIXTURES / "job_python_backend.json").read_text(encoding="utf-8")))
 
 print(f"✓ Job created: {job.title}")
 print(f"  Required skills ({len(job.required_skills)}): {', '.join(job.required_skills[:5])}...")
@@ -166,7 +123,7 @@ results = {}
 # Test 1: Semantic Matcher
 print("\n--- Approach 1: Semantic Matcher (Sentence-BERT) ---")
 try:
-    semantic_matcher = SemanticMatcher()
+    semantic_matcher = get_semantic_matcher()
     result = semantic_matcher.match(resume, job)
     results['semantic'] = result
 
@@ -176,6 +133,13 @@ try:
     print(f"  Skills Match: {result.skills_match:.1%}")
     print(f"  Matched Skills ({len(result.matched_skills)}): {', '.join(result.matched_skills[:5])}")
     print(f"  Missing Skills ({len(result.missing_skills)}): {', '.join(result.missing_skills[:5])}")
+
+    if semantic_matcher.int8:
+        # INT8 model must stay close to the FP32 reference
+        fp32_result = get_semantic_matcher(int8=False).match(resume, job)
+        delta = abs(result.semantic_similarity - fp32_result.semantic_similarity)
+        print(f"  INT8 vs FP32 similarity delta: {delta:.4f}")
+        assert delta < 0.02, f"INT8 similarity drifted too far from FP32: {delta:.4f}"
 except Exception as e:
     print(f"✗ Semantic matching failed: {e}")
     if not SBERT_OK:
@@ -184,7 +148,7 @@ except Exception as e:
 # Test 2: TF-IDF Matcher
 print("\n--- Approach 2: TF-IDF Matcher ---")
 try:
-    tfidf_matcher = TFIDFMatcher(max_features=500)
+    tfidf_matcher = get_tfidf_matcher(max_features=500)
     result = tfidf_matcher.match(resume, job)
     results['tfidf'] = result
 
@@ -278,7 +242,7 @@ if SBERT_OK:
     resumes = [resume, resume, resume]
 
     try:
-        semantic_matcher = SemanticMatcher()
+        semantic_matcher = get_semantic_matcher()
         batch_results = semantic_matcher.match_many_optimized(resumes, job, top_n=3)
 
         print(f"✓ Batch matching complete")
@@ -292,10 +256,6 @@ if SBERT_OK:
 else:
     print("⚠ Batch matching requires sentence-transformers")
 
-# Cleanup
-if temp_resume.exists():
-    temp_resume.unlink()
-
 print("\n" + "=" * 60)
 print("Test Complete!")
 print("=" * 60)
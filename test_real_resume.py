@@ -2,6 +2,7 @@
 Test BERT (Sentence-BERT) matcher on real resume
 """
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -12,6 +13,7 @@ print("=" * 60)
 
 # Import modules
 from resume_parser import TextExtractor
+from resume_parser.nlp_processor import spacy_gpu_enabled
 from matching import SemanticMatcher, Job
 from data.jobs.sample_jobs import SAMPLE_JOBS
 
@@ -33,6 +35,7 @@ try:
         sys.exit(1)
 
     print(f"✓ Резюме успешно распарсено")
+    print(f"  spaCy: {'GPU' if spacy_gpu_enabled() else 'CPU'}")
     print(f"\nИнформация о кандидате:")
     print(f"  Имя: {resume.contact_info.name or 'Не указано'}")
     print(f"  Email: {resume.contact_info.email or 'Не указан'}")
@@ -80,6 +83,8 @@ try:
     print(f"✓ {matcher.name} инициализирован")
     print(f"  Модель: all-MiniLM-L6-v2")
     print(f"  Точность на тестах: 94%")
+    # SentenceTransformer сам выбирает CUDA, если она доступна
+    print(f"  Устройство: {matcher.model.device if matcher.model else 'нет модели'}")
 except Exception as e:
     print(f"✗ Ошибка инициализации: {e}")
     sys.exit(1)
@@ -89,30 +94,38 @@ print("\n" + "=" * 60)
 print("Шаг 4: Сопоставление с вакансиями")
 print("=" * 60)
 
-results = []
-
-for i, job in enumerate(jobs, 1):
-    print(f"\n[{i}/{len(jobs)}] Анализ: {job.title}")
+# Resume + all job descriptions go through Sentence-BERT in one batch;
+# without the model, the per-job fallback runs on up to 8 threads
+started = time.perf_counter()
+try:
+    job_results = matcher.match_jobs(resume, jobs, max_workers=8)
+except Exception as e:
+    print(f"  ✗ Ошибка: {e}")
+    job_results = []
+elapsed = time.perf_counter() - started
 
-    try:
-        result = matcher.match(resume, job)
-        results.append((job, result))
+results = list(zip(jobs, job_results))
 
-        print(f"  ✓ Overall Score: {result.overall_score:.1%}")
-        print(f"    - Semantic: {result.semantic_similarity:.1%}")
-        print(f"    - Skills: {result.skills_match:.1%}")
-        print(f"    - Matched: {len(result.matched_skills)} навыков")
-        print(f"    - Missing: {len(result.missing_skills)} навыков")
+for i, (job, result) in enumerate(results, 1):
+    print(f"\n[{i}/{len(jobs)}] Анализ: {job.title}")
+    print(f"  ✓ Overall Score: {result.overall_score:.1%}")
+    print(f"    - Semantic: {result.semantic_similarity:.1%}")
+    print(f"    - Skills: {result.skills_match:.1%}")
+    print(f"    - Matched: {len(result.matched_skills)} навыков")
+    print(f"    - Missing: {len(result.missing_skills)} навыков")
 
-    except Exception as e:
-        print(f"  ✗ Ошибка: {e}")
+print(f"\n⏱ Сопоставление {len(results)} вакансий: {elapsed:.2f} c ({elapsed / max(len(results), 1) * 1000:.0f} мс на вакансию)")
 
 # Step 5: Show top matches
 print("\n" + "=" * 60)
 print("Результаты сопоставления")
 print("=" * 60)
 
-# Sort by overall score
+if not results:
+    print("\n✗ Нет результатов сопоставления")
+    sys.exit(1)
+
+# The table shows every job in order, so one full sort also yields best ([0]) and worst ([-1])
 results.sort(key=lambda x: x[1].overall_score, reverse=True)
 
 print(f"\n{'Позиция':<40} {'Overall':<10} {'Semantic':<10} {'Skills':<10}")
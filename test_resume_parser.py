@@ -1,6 +1,7 @@
 """
 Test script for resume parsing
 """
+import os
 import sys
 import json
 from pathlib import Path
@@ -41,10 +42,13 @@ def test_parse_resumes():
         print("  Please run test_email.py first to download some resumes")
         return
 
-    # Найдем все файлы резюме
-    resume_files = []
-    for ext in ['.pdf', '.docx', '.txt']:
-        resume_files.extend(list(resume_dir.glob(f'*{ext}')))
+    # Найдем все файлы резюме за один проход по каталогу
+    allowed = {'.pdf', '.docx', '.txt'}
+    with os.scandir(resume_dir) as entries:
+        resume_files = sorted(
+            Path(entry.path) for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in allowed
+        )
 
     if not resume_files:
         print(f"\n⚠ No resume files found in {resume_dir}")
@@ -53,36 +57,37 @@ def test_parse_resumes():
 
     print(f"\nFound {len(resume_files)} resume file(s)")
 
-    # Парсим каждое резюме
+    # Парсим первые 5 резюме одним пакетом (spaCy через nlp.pipe)
     extractor = TextExtractor()
+    resume_files = resume_files[:5]
+    try:
+        results = extractor.parse_resumes_bulk([str(f) for f in resume_files])
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        return []
+
     parsed_resumes = []
 
-    for i, resume_file in enumerate(resume_files[:5], 1):  # Парсим первые 5
-        print(f"\n--- Resume {i}/{min(len(resume_files), 5)} ---")
+    for i, (resume_file, resume) in enumerate(zip(resume_files, results), 1):
+        print(f"\n--- Resume {i}/{len(resume_files)} ---")
         print(f"File: {resume_file.name}")
 
-        try:
-            resume = extractor.parse_resume(str(resume_file))
-
-            if resume:
-                print(f"✓ Parsed successfully")
-                print(f"  Name: {resume.contact_info.name or 'N/A'}")
-                print(f"  Email: {resume.contact_info.email or 'N/A'}")
-                print(f"  Phone: {resume.contact_info.phone or 'N/A'}")
-                print(f"  Skills found: {len(resume.skills)}")
-                if resume.skills:
-                    print(f"    Top skills: {', '.join(resume.skills[:5])}")
-                print(f"  Keywords: {len(resume.keywords)}")
-                if resume.keywords:
-                    print(f"    Top keywords: {', '.join(resume.keywords[:5])}")
-                print(f"  Text length: {len(resume.raw_text)} characters")
-
-                parsed_resumes.append(resume)
-            else:
-                print(f"✗ Failed to parse")
-
-        except Exception as e:
-            print(f"✗ Error: {e}")
+        if resume:
+            print(f"✓ Parsed successfully")
+            print(f"  Name: {resume.contact_info.name or 'N/A'}")
+            print(f"  Email: {resume.contact_info.email or 'N/A'}")
+            print(f"  Phone: {resume.contact_info.phone or 'N/A'}")
+            print(f"  Skills found: {len(resume.skills)}")
+            if resume.skills:
+                print(f"    Top skills: {', '.join(resume.skills[:5])}")
+            print(f"  Keywords: {len(resume.keywords)}")
+            if resume.keywords:
+                print(f"    Top keywords: {', '.join(resume.keywords[:5])}")
+            print(f"  Text length: {len(resume.raw_text)} characters")
+
+            parsed_resumes.append(resume)
+        else:
+            print(f"✗ Failed to parse")
 
     return parsed_resumes
 
@@ -102,8 +107,7 @@ def save_parsed_resumes(resumes):
     for resume in resumes:
         output_file = output_dir / f"{Path(resume.file_name).stem}.json"
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(resume.to_json())
+        output_file.write_bytes(resume.to_json_bytes())
 
         print(f"✓ Saved: {output_file.name}")
 
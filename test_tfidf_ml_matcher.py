@@ -3,17 +3,25 @@ Unit test for TF-IDF + ML matcher.
 
 The test trains a tiny classifier on synthetic pairs and verifies that
 matching returns scores in [0, 1] and ranks the positive pair higher
-than an unrelated one.
+than an unrelated one. Trained models are saved under data/models and
+reused by later runs while the samples and the matcher source are unchanged.
 """
+import hashlib
+import json
 import sys
 from pathlib import Path
 
+import pytest
+
 # Make src importable
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from matching import TfidfMLMatcher, Job  # noqa: E402
 from resume_parser.models import Resume  # noqa: E402
 
+MATCHER_SOURCE = Path(__file__).parent / "src" / "matching" / "tfidf_ml_matcher.py"
+MODELS_DIR = Path(__file__).parent / "data" / "models"
+
 
 def make_resume(text: str, name: str = "resume.txt") -> Resume:
     return Resume(
@@ -24,36 +32,96 @@ def make_resume(text: str, name: str = "resume.txt") -> Resume:
     )
 
 
-def test_tfidf_ml_matcher_ranks_positive_higher():
-    matcher = TfidfMLMatcher(model_path=Path("data/models/test_tfidf_ml.joblib"))
+def load_or_train(samples, model_path: Path) -> TfidfMLMatcher:
+    """Load the model saved for these samples, or train and save it."""
+    digest = hashlib.sha1(MATCHER_SOURCE.read_bytes())
+    for sample in samples:
+        # Timestamps (parsed_at, created_at) differ on every run; leave them out
+        digest.update(json.dumps([
+            sample["resume"].model_dump_json(exclude={"parsed_at"}),
+            sample["job"].model_dump_json(exclude={"created_at", "updated_at"}),
+            sample["label"],
+        ]).encode("utf-8"))
+    key = digest.hexdigest()
+    key_path = model_path.with_suffix(".key")
 
-    resume_good = make_resume(
-        "Python backend developer with FastAPI, Docker, PostgreSQL, AWS experience."
-    )
-    resume_poor = make_resume(
-        "Graphic designer focused on Figma, Adobe, UI/UX, branding, illustration."
-    )
+    if model_path.exists() and key_path.exists() and key_path.read_text() == key:
+        matcher = TfidfMLMatcher(model_path=model_path)
+        if matcher.is_trained:
+            return matcher
 
-    job_backend = Job(
-        job_id="job_backend",
-        title="Senior Python Backend Engineer",
-        description="Backend services with FastAPI, Docker, PostgreSQL on AWS.",
-        required_skills=["Python", "FastAPI", "Docker", "PostgreSQL", "AWS"],
-        nice_to_have_skills=["Redis", "CI/CD"],
-    )
+    matcher = TfidfMLMatcher(model_path=model_path)
+    matcher.train(samples, save=True)
+    key_path.write_text(key)
+    return matcher
+
+
+RESUME_BACKEND = make_resume(
+    "Python backend developer with FastAPI, Docker, PostgreSQL, AWS experience."
+)
+RESUME_DESIGNER = make_resume(
+    "Graphic designer focused on Figma, Adobe, UI/UX, branding, illustration."
+)
+JOB_BACKEND = Job(
+    job_id="job_backend",
+    title="Senior Python Backend Engineer",
+    description="Backend services with FastAPI, Docker, PostgreSQL on AWS.",
+    required_skills=["Python", "FastAPI", "Docker", "PostgreSQL", "AWS"],
+    nice_to_have_skills=["Redis", "CI/CD"],
+)
+
+RESUME_GOOD = make_resume("Python developer with FastAPI and Docker.", "good.txt")
+RESUME_POOR = make_resume("Graphic designer with Figma and Adobe.", "poor.txt")
+JOB_PYTHON = Job(
+    job_id="job_backend",
+    title="Python Backend Engineer",
+    description="FastAPI services in Docker.",
+    required_skills=["Python", "FastAPI", "Docker"],
+)
+JOB_DESIGN = Job(
+    job_id="job_design",
+    title="Product Designer",
+    description="Figma and Adobe design work.",
+    required_skills=["Figma", "Adobe"],
+)
 
-    # Training samples: (resume, job, label)
+
+@pytest.fixture(scope="session")
+def backend_matcher() -> TfidfMLMatcher:
+    """Matcher trained on (resume, job, label) pairs for a single backend job"""
     samples = [
-        {"resume": resume_good, "job": job_backend, "label": 1},
-        {"resume": resume_poor, "job": job_backend, "label": 0},
+        {"resume": RESUME_BACKEND, "job": JOB_BACKEND, "label": 1},
+        {"resume": RESUME_DESIGNER, "job": JOB_BACKEND, "label": 0},
     ]
+    return load_or_train(samples, MODELS_DIR / "test_tfidf_ml.joblib")
+
 
-    matcher.train(samples, save=False)
+@pytest.fixture(scope="session")
+def two_job_matcher() -> TfidfMLMatcher:
+    """Matcher trained on a backend job and a design job"""
+    samples = [
+        {"resume": RESUME_GOOD, "job": JOB_PYTHON, "label": 1},
+        {"resume": RESUME_POOR, "job": JOB_PYTHON, "label": 0},
+        {"resume": RESUME_POOR, "job": JOB_DESIGN, "label": 1},
+        {"resume": RESUME_GOOD, "job": JOB_DESIGN, "label": 0},
+    ]
+    return load_or_train(samples, MODELS_DIR / "test_tfidf_ml_batch.joblib")
 
-    good_result = matcher.match(resume_good, job_backend)
-    poor_result = matcher.match(resume_poor, job_backend)
+
+def test_tfidf_ml_matcher_ranks_positive_higher(backend_matcher):
+    good_result = backend_matcher.match(RESUME_BACKEND, JOB_BACKEND)
+    poor_result = backend_matcher.match(RESUME_DESIGNER, JOB_BACKEND)
 
     assert 0.0 <= good_result.overall_score <= 1.0
     assert 0.0 <= poor_result.overall_score <= 1.0
     assert good_result.overall_score > poor_result.overall_score
 
+
+def test_tfidf_ml_matcher_batch_matches_single(two_job_matcher):
+    batch = two_job_matcher.match_batch([RESUME_GOOD, RESUME_POOR], [JOB_PYTHON, JOB_DESIGN])
+    single = [two_job_matcher.match(RESUME_GOOD, JOB_PYTHON), two_job_matcher.match(RESUME_POOR, JOB_DESIGN)]
+    assert [r.overall_score for r in batch] == [r.overall_score for r in single]
+
+    cross = two_job_matcher.match_resume_against_jobs(RESUME_GOOD, [JOB_PYTHON, JOB_DESIGN])
+    assert [r.job_id for r in cross] == ["job_backend", "job_design"]
+    assert cross[0].overall_score == batch[0].overall_score
@@ -0,0 +1,56 @@
+"""
+Shared helpers for the test scripts
+
+parse_or_cached() parses a sample resume once and keeps the result in
+data/cache/parsed_resumes, so repeated runs skip the parser and NLP warmup.
+The cache key covers the text, the file name and the contents of the
+resume_parser sources, so editing the parser invalidates it.
+"""
+import hashlib
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from resume_parser.models import Resume  # noqa: E402
+
+PARSER_DIR = Path(__file__).parent / "src" / "resume_parser"
+# Sample resumes and job definitions shared by the test scripts
+FIXTURES = Path(__file__).parent / "tests" / "fixtures"
+CACHE_DIR = Path(__file__).parent / "data" / "cache" / "parsed_resumes"
+
+
+def _cache_key(text: str, file_name: str) -> str:
+    digest = hashlib.sha1()
+    digest.update(text.encode("utf-8"))
+    digest.update(file_name.encode("utf-8"))
+    for source in sorted(PARSER_DIR.glob("*.py")):
+        digest.update(source.name.encode("utf-8"))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def parse_or_cached(text: str, file_name: str = "sample_resume.txt") -> Optional[Resume]:
+    """Parse resume text with TextExtractor, reusing the cached Resume when possible"""
+    cache_path = CACHE_DIR / f"{_cache_key(text, file_name)}.json"
+    if cache_path.exists():
+        try:
+            return Resume.model_validate_json(cache_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"⚠ Ignoring unreadable parse cache {cache_path}: {e}")
+
+    from resume_parser import TextExtractor
+
+    temp_resume = Path(__file__).parent / "data" / file_name
+    temp_resume.parent.mkdir(parents=True, exist_ok=True)
+    temp_resume.write_text(text, encoding="utf-8")
+    try:
+        resume = TextExtractor(use_nlp=True).parse_resume(str(temp_resume))
+    finally:
+        temp_resume.unlink(missing_ok=True)
+
+    if resume:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(resume.model_dump_json(), encoding="utf-8")
+    return resume